@@ -0,0 +1,6 @@
+"""MacroMaker - gravação e reprodução de macros de teclado e mouse
+
+O pacote contém as partes que não dependem da interface Tk (compilação,
+agendamento, execução e armazenamento), usadas tanto pelo editor quanto
+pela execução pela linha de comando.
+"""
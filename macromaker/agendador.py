@@ -0,0 +1,105 @@
+"""Agendamento das operações em prazos absolutos"""
+
+import sys
+import time
+
+# No Windows, a espera em Event.wait() tem resolução de ~15 ms; a parte final
+# do intervalo é feita com time.sleep(), que é preciso (ao custo de não ser
+# interrompível nesses últimos milissegundos)
+MARGEM_EVENTO = 0.02 if sys.platform == "win32" else 0.0
+
+
+class Agendador:
+    """Agenda as operações em prazos absolutos medidos com time.perf_counter()
+
+    Cada prazo é calculado a partir do início da execução (e não do fim da
+    operação anterior), então o tempo gasto nas ações e a imprecisão do
+    sleep não se acumulam. A espera dorme a maior parte do intervalo e faz
+    espera ativa apenas nos últimos `margem_spin` segundos; com um evento de
+    interrupção, ela termina assim que o evento é sinalizado. `relogio`
+    substitui time.perf_counter (ex.: um relógio simulado nos testes).
+    """
+
+    def __init__(self, margem_spin=0.002, relogio=time.perf_counter):
+        self.margem_spin = margem_spin
+        self.relogio = relogio
+        self.inicio = 0.0
+        self.prazo = 0.0
+        self._zerar()
+
+    def _zerar(self):
+        # Só os totais dos atrasos: a memória não cresce com o número de operações
+        self.operacoes = 0
+        self.soma_atrasos = 0.0
+        self.atraso_maximo = 0.0
+        self.indice_mais_atrasado = None
+        self.ultimo_atraso = 0.0
+
+    def iniciar(self):
+        """Define o instante atual como prazo da primeira operação"""
+        self.inicio = self.prazo = self.relogio()
+        self._zerar()
+
+    def avancar(self, intervalo):
+        """Avança o prazo da próxima operação"""
+        self.prazo += intervalo
+
+    def deslocar(self, intervalo):
+        """Adia o início e o prazo atual (tempo em pausa não conta como atraso)"""
+        self.inicio += intervalo
+        self.prazo += intervalo
+
+    def aguardar(self, prazo=None, interrupcao=None):
+        """Bloqueia até o prazo informado (ou o prazo atual)
+
+        Retorna False se `interrupcao` (threading.Event) for sinalizado antes.
+        """
+        if prazo is None:
+            prazo = self.prazo
+        relogio = self.relogio
+        restante = prazo - relogio()
+        if interrupcao is None:
+            if restante > self.margem_spin:
+                time.sleep(restante - self.margem_spin)
+            while relogio() < prazo:
+                pass
+            return True
+
+        margem = self.margem_spin + MARGEM_EVENTO
+        if restante > margem and interrupcao.wait(restante - margem):
+            return False
+        restante = prazo - relogio()
+        if restante > self.margem_spin:
+            time.sleep(restante - self.margem_spin)
+        while relogio() < prazo:
+            if interrupcao.is_set():
+                return False
+        return not interrupcao.is_set()
+
+    def marcar(self, indice):
+        """Registra o atraso da operação que está começando agora"""
+        atraso = self.relogio() - self.prazo
+        self.operacoes += 1
+        self.soma_atrasos += atraso
+        if atraso > self.atraso_maximo or self.operacoes == 1:
+            self.atraso_maximo = atraso
+            self.indice_mais_atrasado = indice
+        self.ultimo_atraso = atraso
+
+    def resumo(self):
+        """Retorna estatísticas de atraso da execução (em segundos)"""
+        if not self.operacoes:
+            return {"operacoes": 0, "atraso_medio": 0.0, "atraso_maximo": 0.0,
+                    "etapa_mais_atrasada": None, "desvio_final": 0.0,
+                    "duracao": 0.0, "acoes_por_segundo": 0.0}
+        agora = self.relogio()
+        duracao = agora - self.inicio
+        return {
+            "operacoes": self.operacoes,
+            "duracao": duracao,
+            "acoes_por_segundo": self.operacoes / duracao if duracao > 0 else 0.0,
+            "atraso_medio": self.soma_atrasos / self.operacoes,
+            "atraso_maximo": self.atraso_maximo,
+            "etapa_mais_atrasada": self.indice_mais_atrasado + 1,
+            "desvio_final": max(0.0, agora - self.prazo),
+        }
@@ -0,0 +1,82 @@
+"""Leitura e gravação da biblioteca de macros (macros.db, macros.json ou .mmb)
+
+O formato é escolhido pela extensão do arquivo: ".db" usa a biblioteca
+SQLite (ver biblioteca.py), ".mmb" o formato binário colunar (ver
+binario.py), qualquer outra JSON.
+"""
+
+import json
+import os
+
+from .binario import carregar_binario, e_binario, salvar_binario
+from .plano import macros_chamados
+
+ARQUIVO_MACROS = "macros.json"
+EXTENSOES_SQLITE = (".db", ".sqlite", ".sqlite3")
+
+
+def e_sqlite(caminho):
+    return str(caminho).lower().endswith(EXTENSOES_SQLITE)
+
+
+def arquivo_padrao():
+    """macros.db se existir (o editor grava nele), senão o macros.json antigo"""
+    from .biblioteca import ARQUIVO_BIBLIOTECA
+    if os.path.exists(ARQUIVO_BIBLIOTECA) or not os.path.exists(ARQUIVO_MACROS):
+        return ARQUIVO_BIBLIOTECA
+    return ARQUIVO_MACROS
+
+
+def carregar_macros(caminho=ARQUIVO_MACROS, nomes=None):
+    """Carrega o dicionário de macros do arquivo (vazio se não existir)
+
+    Com `nomes`, uma biblioteca SQLite lê apenas esses macros e os que
+    eles chamam (etapas "call").
+    """
+    if not os.path.exists(caminho):
+        return {}
+    if e_sqlite(caminho):
+        from .biblioteca import BibliotecaMacros
+        biblioteca = BibliotecaMacros(caminho)
+        try:
+            if nomes is None:
+                nomes = biblioteca.nomes()
+            macros = {}
+            pendentes = list(nomes)
+            while pendentes:
+                nome = pendentes.pop()
+                if nome in macros:
+                    continue
+                macro = biblioteca.carregar(nome)
+                if macro is not None:
+                    macros[nome] = macro
+                    pendentes.extend(macros_chamados(macro))
+            return macros
+        finally:
+            biblioteca.fechar()
+    if e_binario(caminho):
+        return carregar_binario(caminho)
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def salvar_macros(macros, caminho=ARQUIVO_MACROS):
+    """Salva o dicionário de macros no arquivo
+
+    Em uma biblioteca SQLite os macros são gravados (ou substituídos) em
+    uma única transação; os que não estão no dicionário são mantidos.
+    """
+    if e_sqlite(caminho):
+        from .biblioteca import BibliotecaMacros
+        biblioteca = BibliotecaMacros(caminho)
+        try:
+            biblioteca.salvar_todos(macros)
+        finally:
+            biblioteca.fechar()
+        return
+    if e_binario(caminho):
+        salvar_binario(macros, caminho)
+        return
+    with open(caminho, "w", encoding="utf-8") as f:
+        # Etapas lidas de um arquivo binário são sequências, não listas
+        json.dump(macros, f, indent=2, ensure_ascii=False, default=list)
@@ -0,0 +1,240 @@
+"""Motor de execução asyncio: muitas execuções em um único loop
+
+Alternativa ao Executor (uma thread por execução): cada execução é uma
+corrotina, e todas as esperas são timers do loop que terminam no prazo ou
+quando a execução é parada ou pausada, o que acontecer primeiro. Centenas
+de execuções agendadas ocupam uma única thread, que dorme entre os prazos.
+
+As chamadas a backends bloqueantes (keyboard/pyautogui) vão para um pool
+pequeno de threads; backends que apenas acumulam eventos (memória, XTest)
+são chamados direto no loop. A precisão dos prazos é a dos timers do loop
+(cerca de 1 ms); para atrasos abaixo disso, use o Executor.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .eventos import CONCLUSAO
+from .execucao import CHAMAR, RESERVAR, SEGURAR, ExecucaoPlano
+from .latencia import INICIO
+
+TRABALHADORES_ENTRADA = 4   # threads para as chamadas bloqueantes aos backends
+
+
+def _resolver(futuro, resultado):
+    if not futuro.done():
+        futuro.set_result(resultado)
+
+
+class ArbitroAssincrono:
+    """Versão asyncio do ArbitroEntrada: uma operação de cada vez, maior prioridade primeiro"""
+
+    def __init__(self):
+        self.ocupado = False
+        self.fila = []
+        self.contador = itertools.count()
+
+    def pedir(self, prioridade, loop):
+        """Retorna um futuro resolvido com True quando a entrada for concedida"""
+        futuro = loop.create_future()
+        if not self.ocupado and not self.fila:
+            self.ocupado = True
+            futuro.set_result(True)
+        else:
+            heapq.heappush(self.fila, (-prioridade, next(self.contador), futuro))
+        return futuro
+
+    def desistir(self, futuro):
+        """Retira um pedido ainda não atendido (ou libera a entrada, se já foi concedida)"""
+        if futuro.done() and futuro.result() is True:
+            self.liberar()
+            return
+        self.fila = [pedido for pedido in self.fila if pedido[2] is not futuro]
+        heapq.heapify(self.fila)
+
+    def liberar(self):
+        # A entrada passa direto ao próximo pedido ainda pendente
+        while self.fila:
+            futuro = heapq.heappop(self.fila)[2]
+            if not futuro.done():
+                futuro.set_result(True)
+                return
+        self.ocupado = False
+
+
+class ExecutorAssincrono(ExecucaoPlano):
+    """Executa um PlanoExecucao como corrotina (mesmas opções e resumo do Executor)
+
+    parar(), pausar() e retomar() podem ser chamados de qualquer thread.
+    `trabalhadores` é o concurrent.futures.Executor das chamadas
+    bloqueantes ao backend (None usa o padrão do loop). `medicao`
+    (MedicaoLatencia) recebe o início e a primeira ação, e `linha_tempo`
+    (LinhaTempo) cada operação.
+    """
+
+    def __init__(self, plano, trabalhadores=None, **opcoes):
+        super().__init__(plano, **opcoes)
+        self.trabalhadores = trabalhadores
+        self.bloqueante = getattr(self.backend, "bloqueante", True)
+        self.loop = None
+        self.espera = None      # futuro da espera em curso (prazo, retomada ou vez na entrada)
+
+    def _no_loop(self, funcao):
+        """Executa `funcao` na thread do loop (ou já, se a execução não começou)"""
+        loop = self.loop
+        if loop is None:
+            return
+        try:
+            em_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            em_loop = False
+        if em_loop:
+            funcao()
+        else:
+            try:
+                loop.call_soon_threadsafe(funcao)
+            except RuntimeError:
+                pass    # loop já encerrado
+
+    def _interromper(self):
+        if self.espera is not None:
+            _resolver(self.espera, False)
+
+    def parar(self):
+        """Pede a parada (atendida no próximo passo do loop, mesmo em pausa)"""
+        self.executando = False
+        self._no_loop(self._interromper)
+
+    def pausar(self):
+        if self.executando and not self.pausado:
+            self.pausado = True
+            self._no_loop(self._interromper)
+
+    def retomar(self):
+        if self.pausado:
+            self.pausado = False
+            self._no_loop(self._interromper)
+
+    async def _esperar(self, futuro, prazo=None):
+        """Aguarda o futuro, resolvido com True no prazo ou False por interrupção"""
+        self.espera = futuro
+        temporizador = None
+        if prazo is not None:
+            atraso = prazo - time.perf_counter()
+            if atraso <= 0:
+                _resolver(futuro, True)
+            else:
+                temporizador = self.loop.call_later(atraso, _resolver, futuro, True)
+        try:
+            return await futuro
+        finally:
+            self.espera = None
+            if temporizador is not None:
+                temporizador.cancel()
+
+    async def aguardar(self):
+        """Aguarda o prazo atual, atendendo pausas; retorna False se a execução foi parada"""
+        while True:
+            if not self.executando:
+                return False
+            if self.pausado:
+                inicio_pausa = self._inicio_pausa()
+                while self.pausado and self.executando:
+                    await self._esperar(self.loop.create_future())
+                self._fim_pausa(inicio_pausa)
+                continue
+            if await self._esperar(self.loop.create_future(), self.agendador.prazo):
+                return True
+
+    async def reservar_entrada(self):
+        """Aguarda o prazo atual e a vez desta execução na entrada (False se parada)"""
+        while True:
+            if not await self.aguardar():
+                return False
+            if self.arbitro is None:
+                return True
+            pedido = self.arbitro.pedir(self.prioridade, self.loop)
+            if await self._esperar(pedido):
+                return True
+            self.arbitro.desistir(pedido)
+
+    async def executar(self):
+        """Executa o plano; retorna o resumo de tempos (como Executor.executar)"""
+        self.loop = asyncio.get_running_loop()
+        if self.medicao is not None:
+            self.medicao.marcar(INICIO)
+        resumo = None
+        try:
+            resumo = await self.executar_plano()
+            return resumo
+        finally:
+            if self.canal is not None:
+                self.canal.publicar(CONCLUSAO, (self, resumo))
+
+    async def executar_plano(self):
+        """Conduz passos() atendendo cada pedido no loop"""
+        passos = self.passos()
+        enviar = passos.send
+        resposta = erro = None
+        while True:
+            try:
+                if erro is None:
+                    pedido, valor = enviar(resposta)
+                else:
+                    pedido, valor = passos.throw(erro)
+                    erro = None
+            except StopIteration as fim:
+                return fim.value
+            try:
+                if pedido is CHAMAR:
+                    # Backend bloqueante: em uma thread do pool, sem deixar teclas
+                    # presas nem se a corrotina for cancelada
+                    if self.bloqueante:
+                        resposta = await asyncio.shield(self.loop.run_in_executor(self.trabalhadores, valor))
+                    else:
+                        resposta = valor()
+                elif pedido is RESERVAR:
+                    resposta = await self.reservar_entrada()
+                elif pedido is SEGURAR:
+                    resposta = await self._esperar(self.loop.create_future(), valor)
+                else:
+                    resposta = await self.aguardar()
+            except BaseException as e:
+                erro = e
+
+
+class MotorAssincrono:
+    """Cria e executa ExecutorAssincrono que compartilham o pool de threads e o árbitro"""
+
+    def __init__(self, trabalhadores=TRABALHADORES_ENTRADA, arbitrar=True):
+        self.pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="macromaker-entrada")
+        self.arbitro = ArbitroAssincrono() if arbitrar else None
+        self.executores = []
+        self.trava = threading.Lock()
+
+    def criar(self, plano, prioridade=0, **opcoes):
+        """Cria uma execução; as opções são as do ExecutorAssincrono (backend, canal...)"""
+        executor = ExecutorAssincrono(plano, arbitro=self.arbitro, prioridade=prioridade,
+                                      trabalhadores=self.pool, **opcoes)
+        with self.trava:
+            self.executores.append(executor)
+        return executor
+
+    async def executar_todos(self, executores):
+        """Executa as execuções ao mesmo tempo; retorna os resumos (ou a exceção de cada uma)"""
+        return await asyncio.gather(*(executor.executar() for executor in executores),
+                                    return_exceptions=True)
+
+    def parar_todos(self):
+        """Para todas as execuções criadas (de qualquer thread)"""
+        with self.trava:
+            executores = list(self.executores)
+        for executor in executores:
+            executor.parar()
+
+    def fechar(self):
+        self.pool.shutdown(wait=False)
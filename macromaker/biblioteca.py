@@ -0,0 +1,160 @@
+"""Biblioteca de macros em SQLite (macros.db)
+
+Cada macro é uma linha: salvar ou excluir um macro é uma transação
+própria, então uma falha no meio da gravação não afeta os demais. Os
+nomes podem ser listados e buscados sem ler as etapas, que só são
+carregadas quando o macro é aberto. A busca por prefixo usa o índice do
+nome; a busca por trecho usa um índice FTS5 de trigramas, quando o SQLite
+disponível tem suporte.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+ARQUIVO_BIBLIOTECA = "macros.db"
+LIMITE_BUSCA = 50
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS macros (
+    nome TEXT PRIMARY KEY,
+    configuracoes TEXT NOT NULL,
+    etapas TEXT NOT NULL,
+    quantidade_etapas INTEGER NOT NULL,
+    alterado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS macros_nome_nocase ON macros (nome COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+"""
+
+_ESQUEMA_BUSCA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS macros_busca USING fts5(nome, tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS macros_busca_inserir AFTER INSERT ON macros BEGIN
+    INSERT INTO macros_busca (rowid, nome) VALUES (new.rowid, new.nome);
+END;
+CREATE TRIGGER IF NOT EXISTS macros_busca_excluir AFTER DELETE ON macros BEGIN
+    DELETE FROM macros_busca WHERE rowid = old.rowid;
+END;
+"""
+
+
+def _escapar_like(texto):
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class BibliotecaMacros:
+    """Acesso à biblioteca SQLite; use na thread que a criou"""
+
+    def __init__(self, caminho=ARQUIVO_BIBLIOTECA):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        # WAL: gravações atômicas sem reescrever o arquivo inteiro
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        with self.conexao:
+            self.conexao.executescript(_ESQUEMA)
+        try:
+            with self.conexao:
+                self.conexao.executescript(_ESQUEMA_BUSCA)
+            self.busca_indexada = True
+        except sqlite3.OperationalError:
+            # SQLite sem FTS5 ou sem o tokenizador trigram (anterior à 3.34)
+            self.busca_indexada = False
+
+    def fechar(self):
+        self.conexao.close()
+
+    def __len__(self):
+        return self.conexao.execute("SELECT COUNT(*) FROM macros").fetchone()[0]
+
+    def __contains__(self, nome):
+        return self.conexao.execute("SELECT 1 FROM macros WHERE nome = ?", (nome,)).fetchone() is not None
+
+    def nomes(self, limite=None):
+        """Nomes dos macros em ordem alfabética (sem ler as etapas)"""
+        sql = "SELECT nome FROM macros ORDER BY nome COLLATE NOCASE"
+        if limite is not None:
+            return [linha[0] for linha in self.conexao.execute(sql + " LIMIT ?", (limite,))]
+        return [linha[0] for linha in self.conexao.execute(sql)]
+
+    def buscar(self, texto, limite=LIMITE_BUSCA):
+        """Nomes que começam com `texto` e, em seguida, os que o contêm"""
+        texto = texto.strip()
+        if not texto:
+            return self.nomes(limite)
+        encontrados = [linha[0] for linha in self.conexao.execute(
+            "SELECT nome FROM macros WHERE nome LIKE ? ESCAPE '\\' ORDER BY nome COLLATE NOCASE LIMIT ?",
+            (_escapar_like(texto) + "%", limite))]
+        if len(encontrados) >= limite:
+            return encontrados
+        if self.busca_indexada and len(texto) >= 3:
+            # Trigramas precisam de pelo menos 3 caracteres
+            consulta = '"' + texto.replace('"', '""') + '"'
+            linhas = self.conexao.execute(
+                "SELECT nome FROM macros_busca WHERE macros_busca MATCH ? ORDER BY nome COLLATE NOCASE LIMIT ?",
+                (consulta, limite + len(encontrados)))
+        else:
+            linhas = self.conexao.execute(
+                "SELECT nome FROM macros WHERE nome LIKE ? ESCAPE '\\' ORDER BY nome COLLATE NOCASE LIMIT ?",
+                ("%" + _escapar_like(texto) + "%", limite + len(encontrados)))
+        vistos = set(encontrados)
+        for nome, in linhas:
+            if nome not in vistos:
+                encontrados.append(nome)
+                if len(encontrados) >= limite:
+                    break
+        return encontrados
+
+    def carregar(self, nome):
+        """Retorna o macro completo (com as etapas), ou None se não existir"""
+        linha = self.conexao.execute(
+            "SELECT configuracoes, etapas FROM macros WHERE nome = ?", (nome,)).fetchone()
+        if linha is None:
+            return None
+        macro = json.loads(linha[0])
+        macro["etapas"] = json.loads(linha[1])
+        return macro
+
+    def _gravar(self, nome, macro):
+        configuracoes = {chave: valor for chave, valor in macro.items() if chave != "etapas"}
+        etapas = list(macro.get("etapas", []))
+        self.conexao.execute(
+            "INSERT INTO macros (nome, configuracoes, etapas, quantidade_etapas, alterado) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (nome) DO UPDATE SET configuracoes = excluded.configuracoes, "
+            "etapas = excluded.etapas, quantidade_etapas = excluded.quantidade_etapas, alterado = excluded.alterado",
+            (nome, json.dumps(configuracoes, ensure_ascii=False),
+             json.dumps(etapas, ensure_ascii=False, separators=(",", ":")), len(etapas), time.time()))
+
+    def salvar(self, nome, macro):
+        """Grava (ou substitui) um único macro, em uma transação"""
+        with self.conexao:
+            self._gravar(nome, macro)
+
+    def salvar_todos(self, macros):
+        """Grava vários macros em uma única transação"""
+        with self.conexao:
+            for nome, macro in macros.items():
+                self._gravar(nome, macro)
+
+    def excluir(self, nome):
+        with self.conexao:
+            self.conexao.execute("DELETE FROM macros WHERE nome = ?", (nome,))
+
+    def importar_json(self, caminho):
+        """Importa um macros.json uma única vez; retorna quantos macros foram importados"""
+        with self.conexao:
+            if self.conexao.execute("SELECT 1 FROM meta WHERE chave = 'importado_json'").fetchone():
+                return 0
+            importados = 0
+            if os.path.exists(caminho):
+                with open(caminho, "r", encoding="utf-8") as f:
+                    macros = json.load(f)
+                for nome, macro in macros.items():
+                    # Macros já existentes no banco têm prioridade
+                    if nome not in self:
+                        self._gravar(nome, macro)
+                        importados += 1
+            self.conexao.execute("INSERT INTO meta (chave, valor) VALUES ('importado_json', ?)",
+                                 (os.path.abspath(caminho),))
+        return importados
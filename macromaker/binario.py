@@ -0,0 +1,284 @@
+"""Formato binário colunar da biblioteca de macros (.mmb)
+
+Cada campo das etapas é gravado como um vetor de largura fixa (tipo, ação,
+x, y, repetições, tempos), com os textos de tipo e ação em uma tabela de
+strings compartilhada. A leitura mapeia o arquivo com mmap e expõe as
+colunas como memoryviews: nenhuma etapa é interpretada até ser acessada.
+
+A conversão com o JSON é sem perdas: o formato original dos tempos
+("0.3", "0.300", 0.3, 1) é guardado em uma coluna de códigos, e qualquer
+campo que não caiba nas colunas (chaves novas, tipos inesperados) vai para
+um dicionário de extras da etapa.
+
+Layout (little-endian):
+    cabeçalho   MAGICO, versão (u16), reservado (u16), posição da tabela de
+                strings (u64), posição do diretório (u64)
+    colunas     para cada macro, um vetor por coluna, alinhado a 8 bytes
+    strings     quantidade (u32) e, para cada uma, tamanho (u32) + UTF-8
+    diretório   JSON: para cada macro, as configurações (sem as etapas), o
+                número de etapas, a posição das colunas e os extras
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+MAGICO = b"MMKB"
+VERSAO = 1
+EXTENSAO_BINARIA = ".mmb"
+
+_CABECALHO = struct.Struct("<4sHHQQ")
+
+# (nome, código do array) — as de 8 bytes primeiro, para manter o alinhamento
+COLUNAS = (
+    ("tempo", "d"), ("pressionar", "d"), ("movimento", "d"),
+    ("tipo", "I"), ("acao", "I"), ("x", "i"), ("y", "i"), ("repeticoes", "I"),
+    ("presenca", "B"), ("fmt_tempo", "B"), ("fmt_pressionar", "B"), ("fmt_movimento", "B"),
+)
+
+# Bits da coluna "presenca": campos inteiros e textos presentes na etapa
+PRESENTE = {"tipo": 1, "acao": 2, "x": 4, "y": 8, "repeticoes": 16}
+
+# Campos de tempo: chave na etapa -> coluna de valor e de formato
+CAMPOS_TEMPO = {
+    "tempo": ("tempo", "fmt_tempo"),
+    "tempo_pressionar": ("pressionar", "fmt_pressionar"),
+    "tempo_movimento": ("movimento", "fmt_movimento"),
+}
+
+# Formatos originais de um tempo, para reconstruir o mesmo valor JSON
+FMT_AUSENTE = 0
+FMT_NUMERO = 1          # 0.3
+FMT_INTEIRO = 2         # 1
+FMT_TEXTO = 3           # "0.3"   (repr do float)
+FMT_TEXTO_3_CASAS = 4   # "0.300" (gravação)
+FMT_TEXTO_INTEIRO = 5   # "1"
+
+_LIMITES = {"i": (-2 ** 31, 2 ** 31 - 1), "I": (0, 2 ** 32 - 1)}
+
+
+def e_binario(caminho):
+    return str(caminho).lower().endswith(EXTENSAO_BINARIA)
+
+
+def _codificar_tempo(valor):
+    """Retorna (float, formato) ou None se o valor não puder ser reconstruído"""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, float):
+        return valor, FMT_NUMERO
+    if isinstance(valor, int):
+        return (float(valor), FMT_INTEIRO) if abs(valor) < 2 ** 53 else None
+    if isinstance(valor, str):
+        try:
+            numero = float(valor)
+        except ValueError:
+            return None
+        for formato in (FMT_TEXTO, FMT_TEXTO_3_CASAS, FMT_TEXTO_INTEIRO):
+            if _decodificar_tempo(numero, formato) == valor:
+                return numero, formato
+    return None
+
+
+def _decodificar_tempo(numero, formato):
+    if formato == FMT_NUMERO:
+        return numero
+    if formato == FMT_INTEIRO:
+        return int(numero)
+    if formato == FMT_TEXTO:
+        return repr(numero)
+    if formato == FMT_TEXTO_3_CASAS:
+        return f"{numero:.3f}"
+    if formato == FMT_TEXTO_INTEIRO:
+        return str(int(numero)) if numero.is_integer() else None
+    return None
+
+
+class EtapasColunares(Sequence):
+    """Etapas de um macro lidas direto das colunas mapeadas
+
+    Cada acesso monta o dicionário da etapa no formato do JSON. Para editar,
+    converta com list().
+    """
+
+    def __init__(self, colunas, strings, quantidade, extras):
+        self.colunas = colunas
+        self.strings = strings
+        self.quantidade = quantidade
+        self.extras = extras
+
+    def __len__(self):
+        return self.quantidade
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self.quantidade))]
+        if indice < 0:
+            indice += self.quantidade
+        if not 0 <= indice < self.quantidade:
+            raise IndexError("step index out of range")
+        c = self.colunas
+        strings = self.strings
+        presenca = c["presenca"][indice]
+        etapa = {}
+        if presenca & 1:
+            etapa["tipo"] = strings[c["tipo"][indice]]
+        if presenca & 2:
+            etapa["acao"] = strings[c["acao"][indice]]
+        for chave, (coluna, coluna_formato) in CAMPOS_TEMPO.items():
+            formato = c[coluna_formato][indice]
+            if formato:
+                etapa[chave] = _decodificar_tempo(c[coluna][indice], formato)
+        if presenca & 16:
+            etapa["repeticoes"] = c["repeticoes"][indice]
+        if presenca & 4:
+            etapa["x"] = c["x"][indice]
+        if presenca & 8:
+            etapa["y"] = c["y"][indice]
+        extras = self.extras.get(indice)
+        if extras:
+            etapa.update(extras)
+        return etapa
+
+    def __iter__(self):
+        for indice in range(self.quantidade):
+            yield self[indice]
+
+
+def _codificar_etapas(etapas, strings, indices_strings):
+    """Preenche as colunas de um macro; retorna (colunas, extras)"""
+    colunas = {nome: array(codigo) for nome, codigo in COLUNAS}
+    extras = {}
+
+    def interno(texto):
+        indice = indices_strings.get(texto)
+        if indice is None:
+            indice = indices_strings[texto] = len(strings)
+            strings.append(texto)
+        return indice
+
+    for indice, etapa in enumerate(etapas):
+        presenca = 0
+        sobra = {}
+        for chave, valor in etapa.items():
+            if chave in ("tipo", "acao"):
+                if isinstance(valor, str):
+                    colunas[chave].append(interno(valor))
+                    presenca |= PRESENTE[chave]
+                    continue
+            elif chave in ("x", "y", "repeticoes"):
+                codigo = "I" if chave == "repeticoes" else "i"
+                minimo, maximo = _LIMITES[codigo]
+                if type(valor) is int and minimo <= valor <= maximo:
+                    colunas[chave].append(valor)
+                    presenca |= PRESENTE[chave]
+                    continue
+            elif chave in CAMPOS_TEMPO:
+                codificado = _codificar_tempo(valor)
+                if codificado is not None:
+                    coluna, coluna_formato = CAMPOS_TEMPO[chave]
+                    colunas[coluna].append(codificado[0])
+                    colunas[coluna_formato].append(codificado[1])
+                    continue
+            sobra[chave] = valor
+        # Completar as colunas dos campos ausentes
+        for chave in ("tipo", "acao", "x", "y", "repeticoes"):
+            if not presenca & PRESENTE[chave]:
+                colunas[chave].append(0)
+        for coluna, coluna_formato in CAMPOS_TEMPO.values():
+            if len(colunas[coluna_formato]) == indice:
+                colunas[coluna].append(0.0)
+                colunas[coluna_formato].append(FMT_AUSENTE)
+        colunas["presenca"].append(presenca)
+        if sobra:
+            extras[str(indice)] = sobra
+    return colunas, extras
+
+
+def salvar_binario(macros, caminho):
+    """Grava a biblioteca no formato colunar (via arquivo temporário)"""
+    strings, indices_strings = [], {}
+    blocos, diretorio = [], []
+    posicao = _CABECALHO.size
+
+    for nome, macro in macros.items():
+        etapas = macro.get("etapas", [])
+        colunas, extras = _codificar_etapas(etapas, strings, indices_strings)
+        configuracoes = {chave: valor for chave, valor in macro.items() if chave != "etapas"}
+        diretorio.append({"nome": nome, "macro": configuracoes, "etapas": len(etapas),
+                          "posicao": posicao, "extras": extras, "tem_etapas": "etapas" in macro})
+        for nome_coluna, _ in COLUNAS:
+            coluna = colunas[nome_coluna]
+            if sys.byteorder != "little":
+                coluna.byteswap()
+            dados = coluna.tobytes()
+            dados += b"\0" * (-len(dados) % 8)
+            blocos.append(dados)
+            posicao += len(dados)
+
+    tabela = [struct.pack("<I", len(strings))]
+    for texto in strings:
+        codificado = texto.encode("utf-8")
+        tabela.append(struct.pack("<I", len(codificado)) + codificado)
+    tabela = b"".join(tabela)
+    posicao_strings = posicao
+    posicao_diretorio = posicao + len(tabela)
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(_CABECALHO.pack(MAGICO, VERSAO, 0, posicao_strings, posicao_diretorio))
+        for bloco in blocos:
+            f.write(bloco)
+        f.write(tabela)
+        f.write(json.dumps(diretorio, ensure_ascii=False).encode("utf-8"))
+    os.replace(temporario, caminho)
+
+
+def carregar_binario(caminho):
+    """Mapeia a biblioteca binária; as etapas de cada macro são EtapasColunares"""
+    with open(caminho, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magico, versao, _, posicao_strings, posicao_diretorio = _CABECALHO.unpack_from(mapa, 0)
+    if magico != MAGICO:
+        raise ValueError(f"{caminho} is not a MacroMaker binary library")
+    if versao != VERSAO:
+        raise ValueError(f"unsupported binary library version {versao}")
+
+    quantidade, = struct.unpack_from("<I", mapa, posicao_strings)
+    strings = []
+    posicao = posicao_strings + 4
+    for _ in range(quantidade):
+        tamanho, = struct.unpack_from("<I", mapa, posicao)
+        strings.append(mapa[posicao + 4:posicao + 4 + tamanho].decode("utf-8"))
+        posicao += 4 + tamanho
+    diretorio = json.loads(mapa[posicao_diretorio:].decode("utf-8"))
+
+    visao = memoryview(mapa)
+    macros = {}
+    for entrada in diretorio:
+        n = entrada["etapas"]
+        posicao = entrada["posicao"]
+        colunas = {}
+        for nome_coluna, codigo in COLUNAS:
+            tamanho = n * array(codigo).itemsize
+            bloco = visao[posicao:posicao + tamanho]
+            if sys.byteorder != "little":
+                # Raro: sem conversão possível no lugar, copia a coluna
+                coluna = array(codigo, bloco.tobytes())
+                coluna.byteswap()
+                colunas[nome_coluna] = coluna
+            else:
+                colunas[nome_coluna] = bloco.cast(codigo)
+            posicao += tamanho + (-tamanho % 8)
+        macro = dict(entrada["macro"])
+        if entrada.get("tem_etapas", True):
+            extras = {int(indice): valores for indice, valores in entrada["extras"].items()}
+            macro["etapas"] = EtapasColunares(colunas, strings, n, extras)
+        macros[entrada["nome"]] = macro
+    return macros
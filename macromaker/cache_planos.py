@@ -0,0 +1,160 @@
+"""Cache LRU de planos compilados, indexado pelo conteúdo do macro
+
+A chave é um hash das etapas, das configurações do macro e dos parâmetros
+de compilação: um macro alterado gera outra chave, e a versão anterior
+(do mesmo nome, compilada com os mesmos parâmetros) é descartada. Os
+planos são imutáveis, então o mesmo plano pode ser executado várias vezes
+(os tempos aleatórios são sorteados na execução, não na compilação).
+
+Um plano inclui os macros que ele chama, que não entram na chave: ao
+alterar um macro, invalidar(nome) descarta também os planos que o chamam.
+"""
+
+import hashlib
+import json
+import marshal
+import sys
+import threading
+from collections import OrderedDict
+
+from .plano import compilar_macro, operacoes_distintas
+
+ORCAMENTO_CACHE_MB = 64
+
+
+def chave_macro(macro, parametros):
+    """Hash do conteúdo do macro e dos parâmetros de compilação
+
+    Usa marshal na versão 2 (sem referências compartilhadas), que
+    serializa o mesmo conteúdo sempre nos mesmos bytes e é várias vezes
+    mais rápido que o JSON; valores que ele não aceita (como as etapas de
+    uma biblioteca .mmb) caem no JSON.
+    """
+    parametros = tuple(sorted(parametros.items()))
+    try:
+        conteudo = b"m" + marshal.dumps((macro, parametros), 2)
+    except ValueError:
+        conteudo = b"j" + json.dumps([macro, parametros], sort_keys=True, ensure_ascii=False,
+                                     default=list).encode("utf-8")
+    return hashlib.blake2b(conteudo, digest_size=16).digest()
+
+
+def estimar_tamanho(plano):
+    """Memória aproximada (bytes) ocupada por um plano"""
+    tamanho = sys.getsizeof(plano) + sys.getsizeof(plano.operacoes)
+    for operacao in operacoes_distintas(plano.operacoes):
+        tamanho += sys.getsizeof(operacao)
+        if operacao.mensagem is not None:
+            tamanho += sys.getsizeof(operacao.mensagem)
+    return tamanho
+
+
+class CachePlanos:
+    """Planos compilados mais recentes, até `orcamento` bytes"""
+
+    def __init__(self, orcamento=ORCAMENTO_CACHE_MB * 1024 * 1024):
+        self.orcamento = orcamento
+        self.entradas = OrderedDict()   # chave -> (plano, tamanho, nome, parâmetros)
+        self.por_nome = {}              # nome -> {parâmetros: chave da versão mais recente}
+        self.chamadores = {}            # nome de um macro chamado -> chaves dos planos que o chamam
+        self.ocupado = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.trava = threading.Lock()
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def obter(self, macro, carregar_macro=None, **parametros):
+        """Retorna o plano do macro, compilando apenas se ainda não estiver no cache
+
+        Os parâmetros são os de compilar_macro(); erros de validação
+        (ValueError) não são guardados.
+        """
+        chave = chave_macro(macro, parametros)
+        with self.trava:
+            entrada = self.entradas.get(chave)
+            if entrada is not None:
+                self.entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada[0]
+            self.falhas += 1
+
+        plano = compilar_macro(macro, carregar_macro=carregar_macro, **parametros)
+        self._guardar(chave, plano, macro.get("nome", ""), tuple(sorted(parametros.items())))
+        return plano
+
+    def _guardar(self, chave, plano, nome, parametros):
+        tamanho = estimar_tamanho(plano)
+        with self.trava:
+            if chave in self.entradas:
+                return
+            # Uma nova versão do macro invalida a anterior compilada com os mesmos
+            # parâmetros; a de outros parâmetros (ex.: a da hotkey) continua válida
+            anterior = self.por_nome.get(nome, {}).get(parametros)
+            if anterior is not None and anterior in self.entradas:
+                self._remover(anterior)
+            if tamanho > self.orcamento:
+                return
+            self.entradas[chave] = (plano, tamanho, nome, parametros)
+            self.por_nome.setdefault(nome, {})[parametros] = chave
+            for chamado in plano.chamados:
+                self.chamadores.setdefault(chamado, set()).add(chave)
+            self.ocupado += tamanho
+            while self.ocupado > self.orcamento:
+                self._remover(next(iter(self.entradas)))
+                self.descartes += 1
+
+    def _remover(self, chave):
+        plano, tamanho, nome, parametros = self.entradas.pop(chave)
+        self.ocupado -= tamanho
+        versoes = self.por_nome.get(nome)
+        if versoes is not None and versoes.get(parametros) == chave:
+            del versoes[parametros]
+            if not versoes:
+                del self.por_nome[nome]
+        for chamado in plano.chamados:
+            chaves = self.chamadores.get(chamado)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self.chamadores[chamado]
+
+    def invalidar(self, nome):
+        """Descarta os planos guardados de um macro e os dos macros que o chamam (ex.: ao alterá-lo)"""
+        with self.trava:
+            chaves = set(self.chamadores.get(nome, ()))
+            chaves.update(self.por_nome.get(nome, {}).values())
+            for chave in chaves:
+                if chave in self.entradas:
+                    self._remover(chave)
+
+    def limpar(self):
+        with self.trava:
+            self.entradas.clear()
+            self.por_nome.clear()
+            self.chamadores.clear()
+            self.ocupado = 0
+
+    def estatisticas(self):
+        """Dicionário com acertos, falhas, descartes, entradas e memória ocupada"""
+        with self.trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "entradas": len(self.entradas),
+                "ocupado": self.ocupado,
+                "orcamento": self.orcamento,
+            }
+
+
+def formatar_estatisticas(estatisticas):
+    """Linha de texto com as estatísticas do cache"""
+    return (f"Plan cache: {estatisticas['acertos']} hits, {estatisticas['falhas']} misses "
+            f"({estatisticas['taxa_acerto']:.0%}), {estatisticas['entradas']} plans, "
+            f"{estatisticas['ocupado'] / 1024 / 1024:.1f}/{estatisticas['orcamento'] / 1024 / 1024:.0f} MB, "
+            f"{estatisticas['descartes']} evicted")
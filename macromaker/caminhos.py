@@ -0,0 +1,165 @@
+"""Simplificação de caminhos do mouse gravados
+
+Uma gravação com "Record mouse moves" gera uma etapa "move" por evento do
+mouse (milhares em um único gesto). Aqui, cada sequência de movimentos é
+reduzida a poucos pontos de passagem com Ramer–Douglas–Peucker, mantendo
+o envelope de tempo: cada ponto mantido é alcançado no mesmo instante da
+gravação, e o tempo total da sequência não muda.
+
+Usa NumPy quando instalado (vetorizado); sem ele, a mesma simplificação
+é feita em Python puro.
+"""
+
+import math
+
+from .plano import TEMPO_MOVIMENTO
+
+TOLERANCIA_CAMINHO = 2.0    # distância máxima (px) entre o caminho original e o simplificado
+PAUSA_MANTIDA = 0.1         # s: um ponto onde o cursor parou por esse tempo é sempre mantido
+
+_numpy = None
+
+
+def obter_numpy():
+    """Retorna o módulo numpy, ou None se não estiver instalado"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _rdp_numpy(np, pontos, tolerancia):
+    pontos = np.asarray(pontos, dtype=float)
+    manter = np.zeros(len(pontos), dtype=bool)
+    manter[0] = manter[-1] = True
+    pilha = [(0, len(pontos) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        ax, ay = pontos[inicio]
+        dx, dy = pontos[fim] - pontos[inicio]
+        meio = pontos[inicio + 1:fim]
+        comprimento = math.hypot(dx, dy)
+        if comprimento == 0:
+            distancias = np.hypot(meio[:, 0] - ax, meio[:, 1] - ay)
+        else:
+            distancias = np.abs(dx * (meio[:, 1] - ay) - dy * (meio[:, 0] - ax)) / comprimento
+        maior = int(distancias.argmax())
+        if distancias[maior] > tolerancia:
+            maior += inicio + 1
+            manter[maior] = True
+            pilha.append((inicio, maior))
+            pilha.append((maior, fim))
+    return np.flatnonzero(manter).tolist()
+
+
+def _rdp_python(pontos, tolerancia):
+    manter = [False] * len(pontos)
+    manter[0] = manter[-1] = True
+    pilha = [(0, len(pontos) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        ax, ay = pontos[inicio]
+        dx, dy = pontos[fim][0] - ax, pontos[fim][1] - ay
+        comprimento = math.hypot(dx, dy)
+        maior, distancia_maior = inicio, -1.0
+        for i in range(inicio + 1, fim):
+            px, py = pontos[i]
+            if comprimento == 0:
+                distancia = math.hypot(px - ax, py - ay)
+            else:
+                distancia = abs(dx * (py - ay) - dy * (px - ax)) / comprimento
+            if distancia > distancia_maior:
+                maior, distancia_maior = i, distancia
+        if distancia_maior > tolerancia:
+            manter[maior] = True
+            pilha.append((inicio, maior))
+            pilha.append((maior, fim))
+    return [i for i, mantido in enumerate(manter) if mantido]
+
+
+def simplificar_caminho(pontos, tolerancia=TOLERANCIA_CAMINHO):
+    """Retorna os índices dos pontos (x, y) mantidos por Ramer–Douglas–Peucker
+
+    O primeiro e o último ponto são sempre mantidos.
+    """
+    if len(pontos) < 3:
+        return list(range(len(pontos)))
+    np = obter_numpy()
+    if np is not None:
+        return _rdp_numpy(np, pontos, tolerancia)
+    return _rdp_python(pontos, tolerancia)
+
+
+def _tempo(etapa, chave, padrao):
+    valor = etapa.get(chave)
+    if valor is None or valor == "":
+        return padrao
+    return float(valor)
+
+
+def _e_movimento(etapa):
+    return (etapa.get("tipo") == "mouse" and etapa.get("acao") == "move"
+            and int(etapa.get("repeticoes", 1)) == 1)
+
+
+def _simplificar_sequencia(sequencia, tolerancia, tempo_movimento):
+    """Reduz uma sequência de etapas "move" mantendo o instante de chegada de cada ponto mantido"""
+    # Instante em que cada etapa começa e em que o cursor chega ao ponto dela
+    inicios, chegadas = [], []
+    instante = 0.0
+    for etapa in sequencia:
+        duracao = _tempo(etapa, "tempo_movimento", tempo_movimento)
+        inicios.append(instante)
+        chegadas.append(instante + duracao)
+        instante += duracao + _tempo(etapa, "tempo", 0.0)
+    fim = instante
+
+    mantidos = simplificar_caminho([(int(e.get("x", 0)), int(e.get("y", 0))) for e in sequencia],
+                                   tolerancia)
+    resultado = []
+    partida = inicios[0]
+    for n, i in enumerate(mantidos):
+        etapa = dict(sequencia[i])
+        # Movimento contínuo desde o ponto mantido anterior, chegando no instante gravado
+        etapa["tempo_movimento"] = round(chegadas[i] - partida, 4)
+        espera = fim - chegadas[i] if n == len(mantidos) - 1 else 0.0
+        etapa["tempo"] = f"{espera:.3f}"
+        resultado.append(etapa)
+        partida = chegadas[i]
+    return resultado
+
+
+def simplificar_movimentos(etapas, tolerancia=TOLERANCIA_CAMINHO, tempo_movimento=TEMPO_MOVIMENTO):
+    """Retorna uma nova lista de etapas com as sequências de "move" simplificadas
+
+    Uma sequência termina em qualquer outra etapa ou em um ponto em que o
+    cursor ficou parado por PAUSA_MANTIDA segundos. As demais etapas não
+    são alteradas. `tempo_movimento` é o padrão do macro para etapas que
+    não definem o seu.
+    """
+    resultado = []
+    sequencia = []
+
+    def encerrar_sequencia():
+        if sequencia:
+            resultado.extend(_simplificar_sequencia(sequencia, tolerancia, tempo_movimento))
+            sequencia.clear()
+
+    for etapa in etapas:
+        if not _e_movimento(etapa):
+            encerrar_sequencia()
+            resultado.append(etapa)
+            continue
+        sequencia.append(etapa)
+        if _tempo(etapa, "tempo", 0.0) >= PAUSA_MANTIDA:
+            encerrar_sequencia()
+    encerrar_sequencia()
+    return resultado
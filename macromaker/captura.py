@@ -0,0 +1,331 @@
+"""Janela de captura da posição do mouse
+
+Carregada apenas quando o usuário abre a captura, pois o pyautogui (e a
+pilha de screenshot) é a dependência mais pesada do editor.
+"""
+
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import keyboard
+
+from .entrada import obter_pyautogui
+
+RAIO_AMOSTRA = 5            # região de (2*RAIO+1)² pixels ao redor do cursor
+ZOOM_AMOSTRA = 8            # ampliação da região na visualização
+INTERVALO_MINIMO = 30       # ms entre leituras com o cursor em movimento
+INTERVALO_MAXIMO = 250      # ms entre leituras com o cursor parado
+IDADE_MAXIMA_AMOSTRA = 1.0  # s: mesmo parado, a região é relida após esse tempo
+
+
+class AmostradorPixel:
+    """Lê apenas uma pequena região da tela ao redor do cursor
+
+    Usa python-xlib (X11) ou GDI via ctypes (Windows) para copiar só a
+    região pedida; sem eles, recorre ao screenshot de região do pyautogui.
+    A leitura é pulada se o cursor não se moveu e a amostra ainda é recente.
+    """
+
+    def __init__(self, pyautogui, raio=RAIO_AMOSTRA):
+        self.pyautogui = pyautogui
+        self.raio = raio
+        self.lado = 2 * raio + 1
+        self.posicao = None
+        self.instante = 0.0
+        self.pixels = None      # lista de linhas de cores "#rrggbb"
+        self.centro = (raio, raio)  # coluna/linha do cursor (muda nas bordas da tela)
+        self._display = None
+        self._gdi = None
+        if sys.platform == "win32":
+            self._capturar = self._capturar_windows
+        else:
+            try:
+                from Xlib import display
+                self._display = display.Display()
+                self._capturar = self._capturar_x11
+            except Exception:
+                self._capturar = self._capturar_pyautogui
+
+    def amostrar(self, x, y):
+        """Atualiza a amostra para a posição (x, y); retorna False se nada mudou"""
+        agora = time.perf_counter()
+        if (x, y) == self.posicao and agora - self.instante < IDADE_MAXIMA_AMOSTRA:
+            return False
+        self.posicao = (x, y)
+        self.instante = agora
+        self.pixels = self._capturar(x - self.raio, y - self.raio)
+        return True
+
+    def cor_central(self):
+        coluna, linha = self.centro
+        return self.pixels[linha][coluna]
+
+    def _linhas_bgrx(self, dados, largura, altura):
+        """Converte pixels BGRX (X11 e GDI) em linhas de cores hexadecimais"""
+        linhas = []
+        for linha in range(altura):
+            inicio = linha * largura * 4
+            linhas.append([f"#{dados[i + 2]:02x}{dados[i + 1]:02x}{dados[i]:02x}"
+                           for i in range(inicio, inicio + largura * 4, 4)])
+        return linhas
+
+    def _capturar_x11(self, x, y):
+        from Xlib import X
+        raiz = self._display.screen().root
+        geometria = raiz.get_geometry()
+        # A região precisa estar inteira dentro da tela
+        x_regiao = max(0, min(x, geometria.width - self.lado))
+        y_regiao = max(0, min(y, geometria.height - self.lado))
+        self.centro = (self.raio + x - x_regiao, self.raio + y - y_regiao)
+        x, y = x_regiao, y_regiao
+        imagem = raiz.get_image(x, y, self.lado, self.lado, X.ZPixmap, 0xffffffff)
+        return self._linhas_bgrx(imagem.data, self.lado, self.lado)
+
+    def _capturar_windows(self, x, y):
+        if self._gdi is None:
+            self._gdi = _RegiaoGDI(self.lado)
+        return self._linhas_bgrx(self._gdi.copiar(x, y), self.lado, self.lado)
+
+    def _capturar_pyautogui(self, x, y):
+        self.centro = (self.raio + min(x, 0), self.raio + min(y, 0))
+        imagem = self.pyautogui.screenshot(region=(max(0, x), max(0, y), self.lado, self.lado)).convert("RGB")
+        largura, altura = imagem.size
+        dados = imagem.tobytes()
+        return [[f"#{dados[i]:02x}{dados[i + 1]:02x}{dados[i + 2]:02x}"
+                 for i in range((linha * largura) * 3, (linha + 1) * largura * 3, 3)]
+                for linha in range(altura)]
+
+    def fechar(self):
+        if self._display is not None:
+            self._display.close()
+            self._display = None
+        if self._gdi is not None:
+            self._gdi.fechar()
+            self._gdi = None
+
+
+class _RegiaoGDI:
+    """Cópia de uma região fixa da tela pelo GDI (Windows), reaproveitando os objetos"""
+
+    def __init__(self, lado):
+        import ctypes
+        from ctypes import wintypes
+
+        class BITMAPINFOHEADER(ctypes.Structure):
+            _fields_ = [("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                        ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD),
+                        ("biCompression", wintypes.DWORD), ("biSizeImage", wintypes.DWORD),
+                        ("biXPelsPerMeter", wintypes.LONG), ("biYPelsPerMeter", wintypes.LONG),
+                        ("biClrUsed", wintypes.DWORD), ("biClrImportant", wintypes.DWORD)]
+
+        self.user32 = ctypes.windll.user32
+        self.gdi32 = ctypes.windll.gdi32
+        # Tipos explícitos: handles são ponteiros de 64 bits
+        self.user32.GetDC.restype = wintypes.HDC
+        self.user32.GetDC.argtypes = [wintypes.HWND]
+        self.user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        self.gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        self.gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        self.gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+        self.gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+        self.gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        self.gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        self.gdi32.BitBlt.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                      wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        self.gdi32.GetDIBits.argtypes = [wintypes.HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT,
+                                         ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT]
+        self.gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        self.gdi32.DeleteDC.argtypes = [wintypes.HDC]
+
+        self.lado = lado
+        self.ctypes = ctypes
+        self.tela = self.user32.GetDC(None)
+        self.memoria = self.gdi32.CreateCompatibleDC(self.tela)
+        self.bitmap = self.gdi32.CreateCompatibleBitmap(self.tela, lado, lado)
+        self.gdi32.SelectObject(self.memoria, self.bitmap)
+        self.cabecalho = BITMAPINFOHEADER(biSize=ctypes.sizeof(BITMAPINFOHEADER), biWidth=lado,
+                                          biHeight=-lado, biPlanes=1, biBitCount=32, biCompression=0)
+        self.buffer = ctypes.create_string_buffer(lado * lado * 4)
+
+    def copiar(self, x, y):
+        """Retorna os pixels BGRX da região com canto superior esquerdo em (x, y)"""
+        SRCCOPY = 0x00CC0020
+        self.gdi32.BitBlt(self.memoria, 0, 0, self.lado, self.lado, self.tela, x, y, SRCCOPY)
+        self.gdi32.GetDIBits(self.memoria, self.bitmap, 0, self.lado, self.buffer,
+                             self.ctypes.byref(self.cabecalho), 0)
+        return self.buffer.raw
+
+    def fechar(self):
+        self.gdi32.DeleteObject(self.bitmap)
+        self.gdi32.DeleteDC(self.memoria)
+        self.user32.ReleaseDC(None, self.tela)
+
+
+def abrir_captura_mouse(janela_pai, hotkey, ao_capturar):
+    """Abre modo de captura de posição do mouse
+
+    `ao_capturar(x, y)` é chamada com a posição capturada pela hotkey.
+    Com `hotkey` None, nenhuma hotkey global é registrada (a janela só
+    mostra a posição, como nos benchmarks). Retorna a função que fecha a
+    janela sem capturar.
+    """
+    pyautogui = obter_pyautogui()
+
+    # Variável para controlar se a janela ainda está aberta
+    janela_aberta = True
+    
+    # Criar janela de captura
+    captura_window = tk.Toplevel(janela_pai)
+    captura_window.title("Capture Mouse Position")
+    captura_window.geometry("400x420")
+    captura_window.transient(janela_pai)
+    captura_window.grab_set()
+    
+    # Tornar a janela semi-transparente
+    captura_window.attributes('-alpha', 0.7)
+    
+    tk.Label(captura_window, text="Move mouse to desired position\n\nPress hotkey to capture", 
+            font=("Arial", 12), justify=tk.CENTER).pack(pady=20)
+    
+    # Frame para informações em tempo real
+    info_frame = ttk.Frame(captura_window)
+    info_frame.pack(fill=tk.X, padx=20, pady=10)
+    
+    # Coordenadas X,Y
+    coords_label = tk.Label(info_frame, text="X: 0, Y: 0", font=("Arial", 14, "bold"), fg="blue")
+    coords_label.pack()
+    
+    # Cor do pixel
+    color_label = tk.Label(info_frame, text="Color: #000000", font=("Arial", 10), fg="gray")
+    color_label.pack()
+    
+    # Preview da cor
+    color_preview = tk.Label(info_frame, text="   ", bg="#000000", relief="solid", borderwidth=1)
+    color_preview.pack(pady=5)
+    
+    # Hotkey info
+    if hotkey is not None:
+        hotkey_label = tk.Label(captura_window, 
+                            text=f"Hotkey: {hotkey}", 
+                            font=("Arial", 10), fg="green")
+        hotkey_label.pack(pady=5)
+    
+    # Visualização ampliada da região amostrada (mesma leitura, sem custo extra)
+    lado_zoom = (2 * RAIO_AMOSTRA + 1) * ZOOM_AMOSTRA
+    zoom_canvas = tk.Canvas(info_frame, width=lado_zoom, height=lado_zoom,
+                            highlightthickness=1, highlightbackground="gray")
+    zoom_canvas.pack(pady=5)
+    imagem_amostra = tk.PhotoImage(width=2 * RAIO_AMOSTRA + 1, height=2 * RAIO_AMOSTRA + 1)
+    imagem_zoom = imagem_amostra.zoom(ZOOM_AMOSTRA)
+    zoom_canvas.create_image(0, 0, image=imagem_zoom, anchor="nw")
+    inicio_centro = RAIO_AMOSTRA * ZOOM_AMOSTRA
+    zoom_canvas.create_rectangle(inicio_centro, inicio_centro, inicio_centro + ZOOM_AMOSTRA,
+                                 inicio_centro + ZOOM_AMOSTRA, outline="red")
+    
+    amostrador = AmostradorPixel(pyautogui)
+    intervalo = INTERVALO_MINIMO
+    
+    # Variável para armazenar posição capturada
+    posicao_capturada = None
+    
+    def atualizar_preview():
+        nonlocal intervalo
+        # Verificar se a janela ainda está aberta
+        if not janela_aberta:
+            return
+            
+        try:
+            # Obter posição atual do mouse
+            x, y = pyautogui.position()
+            
+            # Ler apenas a região ao redor do cursor, e só se ele se moveu
+            try:
+                moveu = (x, y) != amostrador.posicao
+                if amostrador.amostrar(x, y):
+                    coords_label.config(text=f"X: {x}, Y: {y}")
+                    hex_color = amostrador.cor_central()
+                    color_label.config(text=f"Color: {hex_color}")
+                    color_preview.config(bg=hex_color)
+                    imagem_amostra.put(" ".join("{" + " ".join(linha) + "}" for linha in amostrador.pixels))
+                    # Ampliar no próprio Tk, sem recriar a imagem exibida
+                    imagem_zoom.tk.call(str(imagem_zoom), "copy", str(imagem_amostra), "-zoom", ZOOM_AMOSTRA)
+                if moveu:
+                    intervalo = INTERVALO_MINIMO
+                else:
+                    # Cursor parado: consultar cada vez menos
+                    intervalo = min(intervalo * 2, INTERVALO_MAXIMO)
+            except Exception:
+                coords_label.config(text=f"X: {x}, Y: {y}")
+                color_label.config(text="Color: N/A")
+                intervalo = INTERVALO_MAXIMO
+            
+            # Continuar atualizando apenas se a janela estiver aberta
+            if janela_aberta:
+                captura_window.after(intervalo, atualizar_preview)
+        except Exception:
+            # Se ocorrer erro (janela fechada), para o loop
+            pass
+    
+    def capturar_posicao():
+        nonlocal posicao_capturada, janela_aberta
+        janela_aberta = False  # Para o loop
+        posicao_capturada = pyautogui.position()
+        
+        # Remover hotkey antes de fechar
+        try:
+            keyboard.remove_hotkey(capturar_posicao)
+        except:
+            pass
+            
+        captura_window.destroy()
+    
+    def cancelar_captura():
+        nonlocal janela_aberta
+        janela_aberta = False  # Para o loop
+        
+        # Remover hotkey antes de fechar
+        try:
+            keyboard.remove_hotkey(capturar_posicao)
+        except:
+            pass
+            
+        captura_window.destroy()
+    
+    def on_closing():
+        nonlocal janela_aberta
+        janela_aberta = False
+        
+        # Remover hotkey antes de fechar
+        try:
+            keyboard.remove_hotkey(capturar_posicao)
+        except:
+            pass
+            
+        captura_window.destroy()
+    
+    def finalizar_captura():
+        amostrador.fechar()
+        if posicao_capturada:
+            x, y = posicao_capturada
+            ao_capturar(x, y)
+    
+    # Botão cancelar (pode ser renomeado para "Confirm" se preferir)
+    btn_cancelar = ttk.Button(captura_window, text="Cancel", command=cancelar_captura)
+    btn_cancelar.pack(pady=10)
+    
+    # Configurar hotkey para captura
+    if hotkey is not None:
+        try:
+            keyboard.add_hotkey(hotkey, capturar_posicao)
+        except Exception as e:
+            print(f"Error configuring capture hotkey: {e}")
+    
+    # Iniciar preview
+    atualizar_preview()
+    
+    # Configurar destruição da janela — usar lambda para evitar execução imediata
+    captura_window.protocol("WM_DELETE_WINDOW", lambda: on_closing())
+    captura_window.bind('<Destroy>', lambda e: finalizar_captura())
+    return cancelar_captura
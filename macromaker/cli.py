@@ -0,0 +1,482 @@
+"""Linha de comando do MacroMaker
+
+Sem comando, abre o editor. Os demais comandos não carregam a interface Tk
+(exceto `startup`, que mede justamente a abertura da janela).
+
+Exemplos:
+    python MacroMaker-v1.py run "My Macro" --repeat 10 --mode steady --time 0.05
+    python MacroMaker-v1.py startup --output startup.jsonl
+    python MacroMaker-v1.py simplify "Recorded Gesture" --tolerance 3
+    python MacroMaker-v1.py convert macros.json macros.mmb
+    python MacroMaker-v1.py latency --histogram
+    python MacroMaker-v1.py bench --output bench.json --compare base.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .armazenamento import arquivo_padrao, carregar_macros, salvar_macros
+from .caminhos import TOLERANCIA_CAMINHO, simplificar_movimentos
+from .entrada import BACKENDS, criar_backend
+from .execucao import Executor, formatar_resumo
+from .gerenciador import LIMITE_SIMULTANEAS, GerenciadorExecucoes, ler_prioridade
+from .latencia import ARQUIVO_LATENCIAS, RegistroLatencias, formatar_tabela
+from .linha_tempo import LinhaTempo, exportar_trace, formatar_linha_tempo
+from .plano import TEMPO_MOVIMENTO, compilar_macro, ler_tempo
+from .registro import NIVEIS_LOG, NIVEL_ERRO, resolver_nivel_log
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="MacroMaker-v1.py",
+                                     description="Keyboard and mouse macro player")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    run = subparsers.add_parser("run", help="play saved macros without opening the editor")
+    run.add_argument("nomes", nargs="+", metavar="NAME",
+                     help="macro name(s); several names are played one after another")
+    run.add_argument("--file", dest="arquivo",
+                     help="macro library: .db, .json or .mmb (default: macros.db, "
+                          "or macros.json if there is no macros.db)")
+    run.add_argument("--repeat", dest="repeticoes", type=int,
+                     help="number of repetitions (default: saved value)")
+    run.add_argument("--mode", dest="modo_tempo", choices=["steady", "personalized", "random"],
+                     help="time mode (default: saved value)")
+    run.add_argument("--time", dest="tempo_fixo", type=float,
+                     help="delay between steps in steady mode (default: saved value)")
+    run.add_argument("--min", dest="tempo_min", type=float, default=0.3,
+                     help="minimum delay in random mode (default: 0.3)")
+    run.add_argument("--max", dest="tempo_max", type=float, default=2.0,
+                     help="maximum delay in random mode (default: 2.0)")
+    run.add_argument("--scale", dest="escala_tempo", type=float,
+                     help="multiply every delay, hold and travel time by this factor (default: saved value or 1)")
+    run.add_argument("--max-speed", dest="velocidade_maxima", action="store_true", default=None,
+                     help="drop every delay, hold and travel time")
+    run.add_argument("--backend", default="system", choices=list(BACKENDS),
+                     help="input backend: system (keyboard/pyautogui), memory (no input, "
+                          "for measurements) or xtest (direct X11 injection; default: system)")
+    run.add_argument("--log-level", dest="nivel_log", default="auto", choices=["auto"] + list(NIVEIS_LOG),
+                     help="progress output: errors, summary, steps (one line per step) or auto "
+                          "(steps unless they are less than 50 ms apart; default: auto)")
+    run.add_argument("--quiet", action="store_true", help="print only errors and the final summary")
+    run.add_argument("--parallel", dest="paralelo", action="store_true",
+                     help="play the macros at the same time instead of one after another; key "
+                          "combinations and move-then-click steps are never interleaved, and macros "
+                          "with a higher saved priority get the input first")
+    run.add_argument("--max-concurrent", dest="simultaneas", type=int, default=LIMITE_SIMULTANEAS,
+                     help=f"with --parallel, how many macros may run at once; the rest wait "
+                          f"(default: {LIMITE_SIMULTANEAS}; threads engine only)")
+    run.add_argument("--engine", dest="motor", default="threads", choices=["threads", "asyncio"],
+                     help="threads (one thread per run, sub-millisecond timing) or asyncio (every run "
+                          "in one event loop, ~1 ms timing, for many simultaneous runs; default: threads)")
+    run.add_argument("--timeline", dest="linha_tempo", metavar="FILE",
+                     help="record every step (planned and actual start, wait, input call time) and "
+                          "write a Chrome trace JSON to FILE; prints the slowest steps and the drift")
+
+    simplify = subparsers.add_parser("simplify", help="reduce recorded mouse paths to a few waypoints")
+    simplify.add_argument("nomes", nargs="+", metavar="NAME", help="macro name(s) to simplify in place")
+    simplify.add_argument("--file", dest="arquivo",
+                          help="macro library: .db, .json or .mmb (default: macros.db, "
+                               "or macros.json if there is no macros.db)")
+    simplify.add_argument("--tolerance", dest="tolerancia", type=float, default=TOLERANCIA_CAMINHO,
+                          help=f"maximum deviation from the recorded path in pixels (default: {TOLERANCIA_CAMINHO})")
+
+    convert = subparsers.add_parser("convert", help="convert a macro library between SQLite (.db), JSON and binary (.mmb)")
+    convert.add_argument("origem", metavar="SOURCE", help="library to read (.db, .json or .mmb)")
+    convert.add_argument("destino", metavar="DEST", help="library to write; the format follows the extension")
+
+    latency = subparsers.add_parser("latency", help="show trigger-to-first-action latency recorded by the editor")
+    latency.add_argument("--file", dest="arquivo", default=ARQUIVO_LATENCIAS,
+                         help=f"latency samples saved by the editor (default: {ARQUIVO_LATENCIAS})")
+    latency.add_argument("--json", dest="json", action="store_true",
+                         help="print the percentiles as JSON")
+    latency.add_argument("--histogram", dest="histograma", action="store_true",
+                         help="also print the distribution of the total latency")
+
+    bench = subparsers.add_parser("bench", help="benchmark the executor, step table, library storage "
+                                                 "and capture window")
+    bench.add_argument("grupos", nargs="*", metavar="GROUP",
+                       help="groups to measure: executor, table, storage, capture (default: all; table "
+                            "and capture need a display, e.g. xvfb-run)")
+    bench.add_argument("--runs", dest="execucoes", type=int,
+                       help="measurements per metric, the median is kept (default: 5)")
+    bench.add_argument("--output", dest="saida", help="write the results to this JSON file")
+    bench.add_argument("--compare", dest="base", metavar="BASE",
+                       help="compare with an earlier --output file and flag regressions (exit code 1)")
+    bench.add_argument("--threshold", dest="limite", type=float,
+                       help="relative change counted as a regression, in percent (default: 10)")
+
+    startup = subparsers.add_parser("startup", help="measure import time and time to first window")
+    startup.add_argument("--runs", dest="execucoes", type=int, default=5,
+                         help="number of cold starts to measure (default: 5)")
+    startup.add_argument("--output", dest="saida",
+                         help="append the result as one JSON line to this file")
+    return parser
+
+
+def comando_run(args):
+    """Executa os macros pedidos em sequência; retorna o código de saída"""
+    if args.arquivo is None:
+        args.arquivo = arquivo_padrao()
+    try:
+        # Em uma biblioteca SQLite, lê apenas os macros pedidos
+        macros = carregar_macros(args.arquivo, args.nomes)
+    except Exception as e:
+        print(f"Error loading macros: {e}", file=sys.stderr)
+        return 1
+
+    # Compilar tudo antes de executar o primeiro macro
+    planos = []
+    prioridades = []
+    for nome in args.nomes:
+        if nome not in macros:
+            print(f"Error: macro '{nome}' not found in {args.arquivo}", file=sys.stderr)
+            return 1
+        try:
+            planos.append(compilar_macro(macros[nome], repeticoes=args.repeticoes,
+                                         modo_tempo=args.modo_tempo, tempo_fixo=args.tempo_fixo,
+                                         tempo_min=args.tempo_min, tempo_max=args.tempo_max,
+                                         escala_tempo=args.escala_tempo,
+                                         velocidade_maxima=args.velocidade_maxima,
+                                         carregar_macro=macros.get))
+            prioridades.append(ler_prioridade(macros[nome]))
+        except ValueError as e:
+            print(f"Error: invalid macro '{nome}': {e}", file=sys.stderr)
+            return 1
+
+    try:
+        backend = criar_backend(args.backend)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # Uma linha do tempo por macro; sem --timeline, nada é registrado
+    if args.linha_tempo:
+        linhas = [LinhaTempo(nome) for nome in args.nomes]
+    else:
+        linhas = [None] * len(planos)
+
+    try:
+        if args.motor == "asyncio":
+            return executar_com_asyncio(args, planos, prioridades, backend, linhas)
+        if args.paralelo:
+            return executar_em_paralelo(args, planos, prioridades, backend, linhas)
+        return executar_em_sequencia(args, planos, backend, linhas)
+    finally:
+        backend.fechar()
+        if args.linha_tempo:
+            gravar_linhas_tempo(args.linha_tempo, linhas)
+
+
+def executar_em_sequencia(args, planos, backend, linhas):
+    """Executa os planos um após o outro"""
+    for nome, plano, linha_tempo in zip(args.nomes, planos, linhas):
+        if not args.quiet:
+            print(f"=== {nome} ===")
+        nivel_log = NIVEL_ERRO if args.quiet else resolver_nivel_log(args.nivel_log, plano)
+        executor = Executor(plano, backend=backend, nivel_log=nivel_log, linha_tempo=linha_tempo)
+        try:
+            resumo = executor.executar()
+        except KeyboardInterrupt:
+            executor.parar()
+            print("Stopped", file=sys.stderr)
+            return 130
+        if args.quiet:
+            print(f"{nome}: {formatar_resumo(resumo)}")
+    return 0
+
+
+def gravar_linhas_tempo(caminho, linhas):
+    """Exporta as linhas do tempo (também de execuções interrompidas) e exibe os resumos"""
+    linhas = [linha for linha in linhas if linha.inicio is not None]
+    for linha in linhas:
+        print(f"[{linha.nome}] {formatar_linha_tempo(linha.resumo())}")
+    try:
+        exportar_trace(linhas, caminho)
+    except OSError as e:
+        print(f"Error writing timeline: {e}", file=sys.stderr)
+        return
+    print(f"Timeline written to {caminho} (open it in chrome://tracing or ui.perfetto.dev)")
+
+
+def registrador_com_nome(nome):
+    """Função de log que prefixa cada linha com o nome do macro (execuções simultâneas)"""
+    return lambda mensagem: print(f"[{nome}] {mensagem}")
+
+
+def executar_em_paralelo(args, planos, prioridades, backend, linhas):
+    """Executa os planos ao mesmo tempo; cada linha do log leva o nome do macro"""
+    gerenciador = GerenciadorExecucoes(args.simultaneas)
+    execucoes = []
+    for nome, plano, prioridade, linha_tempo in zip(args.nomes, planos, prioridades, linhas):
+        nivel_log = NIVEL_ERRO if args.quiet else resolver_nivel_log(args.nivel_log, plano)
+        execucoes.append(gerenciador.iniciar(plano, prioridade, ao_registrar=registrador_com_nome(nome),
+                                             backend=backend, nivel_log=nivel_log, linha_tempo=linha_tempo))
+    try:
+        gerenciador.aguardar_todas()
+    except KeyboardInterrupt:
+        gerenciador.parar_todas()
+        gerenciador.aguardar_todas()
+        print("Stopped", file=sys.stderr)
+        return 130
+    if args.quiet:
+        for nome, execucao in zip(args.nomes, execucoes):
+            if execucao.resumo is not None:
+                print(f"{nome}: {formatar_resumo(execucao.resumo)}")
+    return 0 if all(execucao.resumo is not None for execucao in execucoes) else 1
+
+
+def executar_com_asyncio(args, planos, prioridades, backend, linhas):
+    """Executa os planos no motor asyncio, em sequência ou (com --parallel) ao mesmo tempo"""
+    # asyncio é a maior importação da linha de comando: só no caminho que o usa
+    import asyncio
+
+    from .assincrono import MotorAssincrono
+
+    motor = MotorAssincrono()
+    executores = []
+    for nome, plano, prioridade, linha_tempo in zip(args.nomes, planos, prioridades, linhas):
+        nivel_log = NIVEL_ERRO if args.quiet else resolver_nivel_log(args.nivel_log, plano)
+        registrar = registrador_com_nome(nome) if args.paralelo else print
+        executores.append(motor.criar(plano, prioridade, ao_registrar=registrar, backend=backend,
+                                      nivel_log=nivel_log, linha_tempo=linha_tempo))
+
+    async def executar():
+        if args.paralelo:
+            return await motor.executar_todos(executores)
+        resumos = []
+        for nome, executor in zip(args.nomes, executores):
+            if not args.quiet:
+                print(f"=== {nome} ===")
+            resumos.append(await executor.executar())
+        return resumos
+
+    try:
+        resumos = asyncio.run(executar())
+    except KeyboardInterrupt:
+        print("Stopped", file=sys.stderr)
+        return 130
+    finally:
+        motor.fechar()
+    codigo = 0
+    for nome, resumo in zip(args.nomes, resumos):
+        if isinstance(resumo, BaseException):
+            print(f"Error in '{nome}': {resumo}", file=sys.stderr)
+            codigo = 1
+        elif args.quiet:
+            print(f"{nome}: {formatar_resumo(resumo)}")
+    return codigo
+
+
+def comando_simplify(args):
+    """Simplifica os caminhos do mouse dos macros pedidos e salva a biblioteca"""
+    if args.arquivo is None:
+        args.arquivo = arquivo_padrao()
+    try:
+        # Em uma biblioteca SQLite, lê apenas os macros pedidos
+        macros = carregar_macros(args.arquivo, args.nomes)
+    except Exception as e:
+        print(f"Error loading macros: {e}", file=sys.stderr)
+        return 1
+
+    for nome in args.nomes:
+        if nome not in macros:
+            print(f"Error: macro '{nome}' not found in {args.arquivo}", file=sys.stderr)
+            return 1
+        macro = macros[nome]
+        antes = len(macro.get("etapas", []))
+        inicio = time.perf_counter()
+        try:
+            tempo_movimento = ler_tempo(macro, "tempo_movimento", TEMPO_MOVIMENTO, "travel time")
+            macro["etapas"] = simplificar_movimentos(macro.get("etapas", []), args.tolerancia, tempo_movimento)
+        except ValueError as e:
+            print(f"Error: invalid macro '{nome}': {e}", file=sys.stderr)
+            return 1
+        duracao = time.perf_counter() - inicio
+        print(f"{nome}: {antes} -> {len(macro['etapas'])} steps ({duracao * 1000:.1f} ms)")
+
+    salvar_macros(macros, args.arquivo)
+    return 0
+
+
+def comando_convert(args):
+    """Converte uma biblioteca entre JSON e o formato binário colunar"""
+    try:
+        inicio = time.perf_counter()
+        macros = carregar_macros(args.origem)
+        meio = time.perf_counter()
+        salvar_macros(macros, args.destino)
+        fim = time.perf_counter()
+    except Exception as e:
+        print(f"Error converting {args.origem}: {e}", file=sys.stderr)
+        return 1
+    etapas = sum(len(macro.get("etapas", [])) for macro in macros.values())
+    print(f"{len(macros)} macros, {etapas} steps: read {(meio - inicio) * 1000:.1f} ms, "
+          f"written {(fim - meio) * 1000:.1f} ms ({os.path.getsize(args.destino)} bytes)")
+    return 0
+
+
+def comando_latency(args):
+    """Exibe os percentis da latência de início gravada pelo editor"""
+    if not os.path.exists(args.arquivo):
+        print(f"Error: {args.arquivo} not found (start a macro from the editor first)", file=sys.stderr)
+        return 1
+    latencias = RegistroLatencias()
+    try:
+        latencias.carregar(args.arquivo)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+    resumo = latencias.resumo()
+    if args.json:
+        print(json.dumps(resumo, indent=2))
+        return 0
+    if not resumo:
+        print("No samples")
+        return 0
+    print(formatar_tabela(resumo))
+    if args.histograma:
+        faixas = latencias.histograma("total")
+        maior = max(faixas.values())
+        print("\ntrigger -> first action")
+        for limite, quantidade in faixas.items():
+            print(f"  < {limite:>8} us {quantidade:>6} {'#' * max(1, quantidade * 40 // maior)}")
+    return 0
+
+
+def comando_bench(args):
+    """Executa os benchmarks; com --compare, aponta as regressões"""
+    # O módulo de benchmarks (e o que ele importa) só é carregado por este comando
+    from .desempenho import (EXECUCOES_BENCHMARK, GRUPOS as GRUPOS_BENCHMARK, LIMITE_REGRESSAO, comparar,
+                             executar_benchmarks, formatar_comparacao, formatar_resultado)
+    if args.execucoes is None:
+        args.execucoes = EXECUCOES_BENCHMARK
+    if args.limite is None:
+        args.limite = LIMITE_REGRESSAO * 100
+    desconhecidos = [grupo for grupo in args.grupos if grupo not in GRUPOS_BENCHMARK]
+    if desconhecidos:
+        print(f"Error: unknown group(s) {', '.join(desconhecidos)}; choose from "
+              f"{', '.join(GRUPOS_BENCHMARK)}", file=sys.stderr)
+        return 1
+    base = None
+    if args.base:
+        try:
+            with open(args.base, "r", encoding="utf-8") as f:
+                base = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {args.base}: {e}", file=sys.stderr)
+            return 1
+
+    resultado = executar_benchmarks(args.grupos or None, max(1, args.execucoes),
+                                    ao_progredir=lambda grupo: print(f"Measuring {grupo}...", file=sys.stderr))
+    print(formatar_resultado(resultado))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+    if base is None:
+        return 0
+
+    comparacao = comparar(base, resultado, args.limite / 100)
+    print()
+    print(formatar_comparacao(comparacao))
+    regressoes = [item for item in comparacao if item[4]]
+    if regressoes:
+        print(f"\n{len(regressoes)} regression(s) over {args.limite:g}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+def medir_inicio_editor():
+    """Mede, no processo atual, a importação e a abertura da janela do editor
+
+    Executado em um processo novo por comando_startup, para medir partida a frio.
+    """
+    inicio = time.perf_counter()
+    import tkinter  # medido à parte do restante do editor
+    del tkinter
+    fim_tk = time.perf_counter()
+    from .editor import EditorMacros
+    fim_importacao = time.perf_counter()
+
+    app = EditorMacros()
+    # Processar eventos até a janela principal ser exibida
+    while not app.janela.winfo_ismapped():
+        app.janela.update()
+    fim_janela = time.perf_counter()
+    app.janela.destroy()
+
+    print(json.dumps({
+        "importacao_tk": fim_tk - inicio,
+        "importacao": fim_importacao - inicio,
+        "primeira_janela": fim_janela - inicio,
+    }))
+
+
+def comando_startup(args):
+    """Mede o tempo de partida a frio em processos separados"""
+    import subprocess
+
+    codigo = "from macromaker.cli import medir_inicio_editor; medir_inicio_editor()"
+    comando_headless = "import macromaker.cli, macromaker.execucao"
+    # Os processos filhos precisam encontrar o pacote a partir de qualquer diretório
+    ambiente = dict(os.environ)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ambiente["PYTHONPATH"] = os.pathsep.join(filter(None, [raiz, ambiente.get("PYTHONPATH")]))
+    medidas = []
+    for _ in range(args.execucoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", comando_headless], check=True, env=ambiente)
+        tempo_headless = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        processo = subprocess.run([sys.executable, "-c", codigo], env=ambiente,
+                                  capture_output=True, text=True)
+        tempo_processo = time.perf_counter() - inicio
+        if processo.returncode != 0:
+            print(f"Error: unable to open the editor:\n{processo.stderr}", file=sys.stderr)
+            return 1
+        medida = json.loads(processo.stdout.strip().splitlines()[-1])
+        medida["processo_headless"] = tempo_headless
+        medida["processo_editor"] = tempo_processo
+        medidas.append(medida)
+
+    # Mediana de cada métrica, em segundos
+    resultado = {"data": time.strftime("%Y-%m-%dT%H:%M:%S"), "execucoes": args.execucoes}
+    for chave in medidas[0]:
+        valores = sorted(m[chave] for m in medidas)
+        resultado[chave] = valores[len(valores) // 2]
+
+    for chave, valor in resultado.items():
+        if isinstance(valor, float):
+            print(f"{chave:20} {valor * 1000:8.1f} ms")
+    if args.saida:
+        with open(args.saida, "a", encoding="utf-8") as f:
+            f.write(json.dumps(resultado) + "\n")
+    return 0
+
+
+def abrir_editor():
+    """Abre o editor (importa a interface apenas aqui)"""
+    from .editor import EditorMacros
+    app = EditorMacros()
+    app.executar()
+    return 0
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if args.comando == "run":
+        return comando_run(args)
+    if args.comando == "simplify":
+        return comando_simplify(args)
+    if args.comando == "convert":
+        return comando_convert(args)
+    if args.comando == "latency":
+        return comando_latency(args)
+    if args.comando == "bench":
+        return comando_bench(args)
+    if args.comando == "startup":
+        return comando_startup(args)
+    return abrir_editor()
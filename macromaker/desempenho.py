@@ -0,0 +1,347 @@
+"""Benchmarks dos caminhos críticos: executor, tabela de etapas, biblioteca e captura
+
+Cada grupo mede algumas métricas, repetidas `execucoes` vezes (vale a
+mediana). O resultado é um dicionário pronto para JSON, e comparar()
+aponta as métricas que pioraram em relação a um resultado anterior.
+
+Os grupos que precisam de tela (tabela de etapas e janela de captura)
+abrem janelas Tk de verdade; sem display (ou sem as dependências), eles
+são pulados e o motivo fica registrado no resultado. Nenhum grupo registra
+hotkeys globais nem altera os hooks do teclado.
+"""
+
+import os
+import platform
+import shutil
+import tempfile
+import time
+
+from .entrada import BackendMemoria
+from .execucao import Executor
+from .plano import compilar_macro
+from .registro import NIVEL_ERRO
+
+EXECUCOES_BENCHMARK = 5
+LIMITE_REGRESSAO = 0.10             # piora relativa que conta como regressão
+RUIDO_VAZAO = 0.15                  # variação relativa da vazão entre execuções iguais (GC, escalonador)
+OPERACOES_VAZAO = 2000              # operações por medida de vazão (velocidade máxima)
+OPERACOES_PRECISAO = 100            # operações por medida de precisão (atrasos de ~2 ms)
+TAMANHOS_TABELA = (100, 1000, 10000)
+TAMANHO_BIBLIOTECA = (500, 200)     # macros, etapas por macro
+DURACAO_CAPTURA = 2.0               # s com a janela de captura aberta
+
+MENOR = "lower"     # sentido em que a métrica melhora
+MAIOR = "higher"
+
+
+class Indisponivel(Exception):
+    """O grupo não pode ser medido neste ambiente (sem display ou dependência)"""
+
+
+def mediana(valores):
+    ordenados = sorted(valores)
+    return ordenados[len(ordenados) // 2]
+
+
+def cronometrar(funcao):
+    """Tempo de uma chamada, em milissegundos"""
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def metrica(valores, unidade, melhor=MENOR, ruido=0.0):
+    """Mediana das medidas; diferenças abaixo do ruído nunca são regressão
+
+    O ruído é o maior entre `ruido` (o piso da métrica) e a dispersão
+    (máximo - mínimo) das próprias medidas.
+    """
+    return {"valor": mediana(valores), "unidade": unidade, "melhor": melhor,
+            "ruido": max(ruido, max(valores) - min(valores))}
+
+
+def etapas_exemplo(quantidade, tempo="0.002"):
+    """Etapas variadas (teclas, combinações, cliques), como as de uma gravação"""
+    etapas = []
+    for i in range(quantidade):
+        if i % 4 == 3:
+            etapas.append({"tipo": "mouse", "acao": "left_click", "x": i % 1920, "y": i % 1080,
+                           "tempo": tempo, "repeticoes": 1})
+        else:
+            etapas.append({"tipo": "keyboard", "acao": "ctrl + c" if i % 4 == 2 else "a",
+                           "tempo": tempo, "repeticoes": 1})
+    return etapas
+
+
+def medir_executor(execucoes):
+    """Vazão (velocidade máxima) e precisão (atrasos de ~2 ms) em cada modo de tempo"""
+    metricas = {}
+    modos = {
+        "steady": {"modo_tempo": "steady", "tempo_fixo": 0.002},
+        "personalized": {"modo_tempo": "personalized"},
+        "random": {"modo_tempo": "random", "tempo_min": 0.001, "tempo_max": 0.003},
+    }
+    for modo, parametros in modos.items():
+        vazao = compilar_macro({"nome": modo, "etapas": etapas_exemplo(OPERACOES_VAZAO)},
+                               velocidade_maxima=True, **parametros)
+        precisao = compilar_macro({"nome": modo, "etapas": etapas_exemplo(OPERACOES_PRECISAO),
+                                   "tempo_pressionar": 0.001, "tempo_movimento": 0.001,
+                                   "pausa_repeticoes": 0}, **parametros)
+        acoes, medio, maximo, desvio = [], [], [], []
+        for _ in range(execucoes):
+            resumo = Executor(vazao, backend=BackendMemoria(), nivel_log=NIVEL_ERRO).executar()
+            acoes.append(resumo["acoes_por_segundo"])
+            resumo = Executor(precisao, backend=BackendMemoria(), nivel_log=NIVEL_ERRO).executar()
+            medio.append(resumo["atraso_medio"] * 1000)
+            maximo.append(resumo["atraso_maximo"] * 1000)
+            desvio.append(resumo["desvio_final"] * 1000)
+        metricas[f"executor.{modo}.acoes_por_segundo"] = metrica(acoes, "actions/s", MAIOR,
+                                                                ruido=mediana(acoes) * RUIDO_VAZAO)
+        metricas[f"executor.{modo}.atraso_medio_ms"] = metrica(medio, "ms", ruido=0.25)
+        metricas[f"executor.{modo}.atraso_maximo_ms"] = metrica(maximo, "ms", ruido=5.0)
+        metricas[f"executor.{modo}.desvio_final_ms"] = metrica(desvio, "ms", ruido=0.5)
+    return metricas
+
+
+def _abrir_tk():
+    """Cria a janela raiz do Tk ou lança Indisponivel"""
+    try:
+        import tkinter as tk
+    except ImportError as e:
+        raise Indisponivel(f"tkinter not available ({e})")
+    try:
+        return tk.Tk()
+    except tk.TclError as e:
+        raise Indisponivel(f"no display ({e}); run under Xvfb, e.g. xvfb-run")
+
+
+def tk_var(valor):
+    """Variável Tk com `valor` (tem o get() dos widgets que a tabela consulta)"""
+    import tkinter as tk
+    if isinstance(valor, bool):
+        return tk.BooleanVar(value=valor)
+    return tk.StringVar(value=valor)
+
+
+class EditorTabela:
+    """O mínimo do editor que a tabela de etapas usa
+
+    Sem o EditorMacros, o benchmark não registra hotkeys globais, não mexe
+    nos hooks do teclado nem abre a biblioteca e as configurações do usuário.
+    """
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        # Mesmos valores iniciais da interface do editor
+        self.combo_modo_tempo = tk_var("steady")
+        self.entry_tempo_fixo = tk_var("0.3")
+        self.entry_tempo_min = tk_var("0.3")
+        self.entry_tempo_max = tk_var("2.0")
+        self.var_repetir_acoes = tk_var(False)
+
+    def validar_numero(self, valor):
+        return True
+
+    def __getattr__(self, nome):
+        # Ações das linhas (cliques, edições): nenhuma é disparada no benchmark
+        return lambda *args: None
+
+
+def medir_tabela(execucoes):
+    """Reconstrução da tabela de etapas para 100, 1k e 10k etapas
+
+    Mede só a tabela (TabelaEtapas e ModeloEtapas) em uma janela do tamanho
+    da do editor, sem abrir o editor inteiro.
+    """
+    raiz = _abrir_tk()
+    try:
+        try:
+            import tkinter as tk
+            from .modelo import ModeloEtapas
+            from .tabela_etapas import TabelaEtapas
+        except ImportError as e:
+            raise Indisponivel(f"step table dependencies missing ({e})")
+
+        raiz.geometry("1000x700")
+        frame = tk.Frame(raiz)
+        frame.pack(fill=tk.BOTH, expand=True)
+        modelo = ModeloEtapas()
+        tabela = TabelaEtapas(frame, EditorTabela(modelo))
+        raiz.update()
+
+        metricas = {}
+        for tamanho in TAMANHOS_TABELA:
+            etapas = etapas_exemplo(tamanho)
+
+            def reconstruir():
+                modelo.redefinir(list(etapas))
+                tabela.atualizar()
+                raiz.update_idletasks()
+
+            def rolar_ate_o_fim():
+                tabela.mostrar_etapa(tamanho - 1)
+                raiz.update_idletasks()
+
+            reconstrucoes, rolagens = [], []
+            for _ in range(execucoes):
+                reconstrucoes.append(cronometrar(reconstruir))
+                rolagens.append(cronometrar(rolar_ate_o_fim))
+            metricas[f"tabela.{tamanho}.reconstruir_ms"] = metrica(reconstrucoes, "ms", ruido=1.0)
+            metricas[f"tabela.{tamanho}.rolar_fim_ms"] = metrica(rolagens, "ms", ruido=1.0)
+    finally:
+        raiz.destroy()
+    return metricas
+
+
+def medir_armazenamento(execucoes):
+    """carregar_macros/salvar_macros de uma biblioteca grande em cada formato"""
+    from .armazenamento import carregar_macros, salvar_macros
+
+    quantidade, etapas_por_macro = TAMANHO_BIBLIOTECA
+    macros = {}
+    for i in range(quantidade):
+        nome = f"Macro {i:05d}"
+        macros[nome] = {"nome": nome, "etapas": etapas_exemplo(etapas_por_macro, "0.3"),
+                        "repeticoes": 1, "modo_tempo": "steady", "tempo_fixo": "0.3"}
+    um_macro = [f"Macro {quantidade // 2:05d}"]
+
+    metricas = {}
+    temporario = tempfile.mkdtemp(prefix="macromaker-bench-")
+    try:
+        for formato in ("json", "db", "mmb"):
+            caminho = os.path.join(temporario, f"macros.{formato}")
+            gravacoes, leituras, leituras_um = [], [], []
+            for _ in range(execucoes):
+                # Gravação em arquivo novo: a biblioteca SQLite não mistura execuções
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+                gravacoes.append(cronometrar(lambda: salvar_macros(macros, caminho)))
+                leituras.append(cronometrar(lambda: carregar_macros(caminho)))
+                if formato == "db":
+                    leituras_um.append(cronometrar(lambda: carregar_macros(caminho, um_macro)))
+            metricas[f"armazenamento.{formato}.salvar_ms"] = metrica(gravacoes, "ms", ruido=5.0)
+            metricas[f"armazenamento.{formato}.carregar_ms"] = metrica(leituras, "ms", ruido=5.0)
+            if leituras_um:
+                metricas[f"armazenamento.{formato}.carregar_um_ms"] = metrica(leituras_um, "ms", ruido=1.0)
+            metricas[f"armazenamento.{formato}.tamanho_mb"] = metrica(
+                [os.path.getsize(caminho) / 1024 / 1024], "MB", ruido=0.1)
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+    return metricas
+
+
+def medir_captura(execucoes):
+    """CPU da janela de captura aberta com o cursor parado, e custo de cada leitura"""
+    raiz = _abrir_tk()
+    try:
+        try:
+            from .captura import AmostradorPixel, abrir_captura_mouse
+            from .entrada import obter_pyautogui
+            pyautogui = obter_pyautogui()
+        except Exception as e:
+            raise Indisponivel(f"capture dependencies missing ({e})")
+
+        raiz.withdraw()
+        cpu = []
+        for _ in range(execucoes):
+            # Sem hotkey: o benchmark não registra atalhos globais
+            fechar = abrir_captura_mouse(raiz, None, lambda x, y: None)
+            try:
+                # Deixa o intervalo de leitura chegar ao regime de cursor parado
+                fim = time.perf_counter() + 0.5
+                while time.perf_counter() < fim:
+                    raiz.update()
+                    time.sleep(0.005)
+                inicio_cpu, inicio = time.process_time(), time.perf_counter()
+                fim = inicio + DURACAO_CAPTURA
+                while time.perf_counter() < fim:
+                    raiz.update()
+                    time.sleep(0.005)
+                cpu.append((time.process_time() - inicio_cpu) / (time.perf_counter() - inicio) * 100)
+            finally:
+                fechar()
+
+        # Leitura forçada (posição sempre nova), como com o cursor em movimento
+        amostrador = AmostradorPixel(pyautogui)
+        try:
+            leituras = []
+            for _ in range(execucoes):
+                inicio = time.perf_counter()
+                for i in range(100):
+                    amostrador.amostrar(10 + i % 50, 10 + i // 50)
+                leituras.append((time.perf_counter() - inicio) / 100 * 1e6)
+        finally:
+            amostrador.fechar()
+    finally:
+        raiz.destroy()
+    return {
+        "captura.cpu_parado_pct": metrica(cpu, "%", ruido=1.0),
+        "captura.leitura_us": metrica(leituras, "us", ruido=50.0),
+    }
+
+
+# Nome na linha de comando -> função do grupo
+GRUPOS = {
+    "executor": medir_executor,
+    "table": medir_tabela,
+    "storage": medir_armazenamento,
+    "capture": medir_captura,
+}
+
+
+def executar_benchmarks(grupos=None, execucoes=EXECUCOES_BENCHMARK, ao_progredir=None):
+    """Mede os grupos pedidos (todos por padrão); retorna o resultado para JSON"""
+    resultado = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "execucoes": execucoes,
+        "metricas": {},
+        "pulados": {},
+    }
+    for grupo in grupos or GRUPOS:
+        if ao_progredir is not None:
+            ao_progredir(grupo)
+        try:
+            resultado["metricas"].update(GRUPOS[grupo](execucoes))
+        except Indisponivel as e:
+            resultado["pulados"][grupo] = str(e)
+    return resultado
+
+
+def comparar(base, atual, limite=LIMITE_REGRESSAO):
+    """Compara as métricas presentes nos dois resultados
+
+    Retorna [(nome, valor base, valor atual, variação relativa, regressão)];
+    é regressão uma piora maior que `limite` (relativo) e que o ruído da
+    métrica (o maior dos dois resultados).
+    """
+    comparacao = []
+    for nome, medida in atual["metricas"].items():
+        anterior = base.get("metricas", {}).get(nome)
+        if anterior is None:
+            continue
+        valor_base, valor = anterior["valor"], medida["valor"]
+        variacao = (valor - valor_base) / valor_base if valor_base else 0.0
+        piora = valor - valor_base if medida["melhor"] == MENOR else valor_base - valor
+        ruido = max(medida.get("ruido", 0.0), anterior.get("ruido", 0.0))
+        regressao = piora > ruido and piora > abs(valor_base) * limite
+        comparacao.append((nome, valor_base, valor, variacao, regressao))
+    return comparacao
+
+
+def formatar_resultado(resultado):
+    """Tabela das métricas medidas e dos grupos pulados"""
+    linhas = [f"{nome:48}{medida['valor']:>14.3f} {medida['unidade']}"
+              for nome, medida in resultado["metricas"].items()]
+    for grupo, motivo in resultado["pulados"].items():
+        linhas.append(f"{grupo}: skipped, {motivo}")
+    return "\n".join(linhas)
+
+
+def formatar_comparacao(comparacao):
+    linhas = [f"{'metric':48}{'base':>14}{'now':>14}{'change':>9}"]
+    for nome, valor_base, valor, variacao, regressao in comparacao:
+        linhas.append(f"{nome:48}{valor_base:>14.3f}{valor:>14.3f}{variacao:>+9.1%}"
+                      + ("  REGRESSION" if regressao else ""))
+    return "\n".join(linhas)
@@ -0,0 +1,1911 @@
+"""Editor de macros (interface Tk)"""
+
+import json
+import os
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
+
+import keyboard
+
+from .armazenamento import ARQUIVO_MACROS
+from .biblioteca import LIMITE_BUSCA, BibliotecaMacros
+from .cache_planos import ORCAMENTO_CACHE_MB, CachePlanos, formatar_estatisticas
+from .caminhos import simplificar_movimentos
+from .eventos import CONCLUSAO, GRAVAR, INICIADA, INICIAR, PARAR, PAUSAR, PROGRESSO, STATUS, CanalEventos
+from .gerenciador import LIMITE_SIMULTANEAS, GerenciadorExecucoes, ler_prioridade
+from .gravador import Gravador, converter_gravacao
+from .latencia import ARQUIVO_LATENCIAS, ATENDIDO, PLANO, MedicaoLatencia, RegistroLatencias, formatar_latencia
+from .linha_tempo import LinhaTempo, exportar_trace, formatar_linha_tempo
+from .modelo import ModeloEtapas
+from .plano import (AcaoMouse, PAUSA_REPETICAO_ETAPA, PAUSA_REPETICOES, TEMPO_MOVIMENTO,
+                    TEMPO_PRESSIONAR, TIPO_BLOCO, TIPO_CHAMADA, TIPO_FIM_BLOCO, encontrar_ciclo, ler_tempo,
+                    nova_etapa_bloco)
+from .registro import LIMITE_LINHAS, NIVEIS_LOG, RegistroExecucao, resolver_nivel_log
+from .tabela_etapas import TabelaEtapas
+
+INTERVALO_EVENTOS_MS = 33   # eventos da execução e log são aplicados ~30 vezes por segundo
+
+
+class EditorMacros:
+    def __init__(self):
+        self.janela = tk.Tk()
+        self.janela.title("MacroMaker")
+        self.janela.geometry("900x750")
+        self.janela.resizable(True, True)
+        self.hotkey_iniciar = "ctrl+enter"
+        self.hotkey_parar = "esc"
+        self.hotkey_pausar = "ctrl+shift+p"
+        self.hotkey_gravar = "ctrl+shift+r"
+        self.gravador = None
+        self.biblioteca = None
+        self.macro_atual = {"nome": "New Macro", "etapas": [], "repeticoes": 1, "modo_tempo": "steady", "tempo_fixo": "0.3"}
+        # Execução iniciada pelo START (acompanhada no status); as demais rodam ao lado dela
+        self.executando = False
+        self.executor = None
+        self.pausado = False
+        self.total_etapas = 0
+        # Threads de execução e hotkeys falam com a interface apenas por este canal
+        self.canal = CanalEventos()
+        # Toda alteração de etapas passa pelo modelo, que avisa a tabela
+        self.modelo = ModeloEtapas(self.macro_atual["etapas"])
+        self.aguardando_tecla = False
+        self.tecla_atual = ""
+
+        # Ações de mouse suportadas
+        self.acoes_mouse = [acao.value for acao in AcaoMouse]
+        # Hotkey para captura de mouse
+        self.hotkey_captura_mouse = "ctrl+shift+c"
+        # Log de execução: nível de detalhe, limite de linhas e arquivo opcional
+        self.nivel_log = "auto"
+        self.limite_log = LIMITE_LINHAS
+        self.arquivo_log = ""
+        # Memória máxima dos planos compilados guardados (MB)
+        self.cache_planos_mb = ORCAMENTO_CACHE_MB
+        # Quantas execuções podem rodar ao mesmo tempo (as demais esperam na fila)
+        self.execucoes_simultaneas = LIMITE_SIMULTANEAS
+        # Hotkey de cada macro (hotkey -> nome) e os planos já compilados delas
+        self.atalhos_macros = {}
+        self.atalhos_prontos = {}
+        # Linha do tempo por execução (opcional) e as das últimas execuções concluídas
+        self.gravar_linha_tempo = False
+        self.linhas_tempo = []
+
+        self.carregar_macros()
+        self.criar_interface()
+
+        # Carregar configurações globais
+        self.carregar_configuracoes_globais()
+        self.combo_nivel_log.set(self.nivel_log)
+
+        # A thread de execução só enfileira mensagens e eventos; o timer os aplica em lotes
+        self.registro = RegistroExecucao(self.limite_log, self.arquivo_log or None)
+        # Planos compilados por conteúdo: reexecutar ou voltar a um macro não recompila
+        self.cache_planos = CachePlanos(self.cache_planos_mb * 1024 * 1024)
+        self.gerenciador = GerenciadorExecucoes(self.execucoes_simultaneas)
+        # Latência do gatilho (START ou hotkey) até a primeira ação, acumulada entre sessões
+        self.latencias = RegistroLatencias()
+        try:
+            self.latencias.carregar(ARQUIVO_LATENCIAS)
+        except (OSError, ValueError) as e:
+            print(f"Error loading latencies: {e}")
+        self.versao_latencias = None
+        # Hotkeys registradas só depois das configurações e com os macros vinculados já compilados
+        self.preparar_atalhos()
+        self.configurar_hotkeys()
+        self.processar_eventos()
+
+
+    def salvar_configuracoes_globais(self):
+        """Salva as configurações globais em arquivo"""
+        config = {
+            "hotkey_iniciar": self.hotkey_iniciar,
+            "hotkey_parar": self.hotkey_parar,
+            "hotkey_pausar": self.hotkey_pausar,
+            "hotkey_gravar": self.hotkey_gravar,
+            "hotkey_captura_mouse": self.hotkey_captura_mouse,
+            "nivel_log": self.nivel_log,
+            "limite_log": self.limite_log,
+            "arquivo_log": self.arquivo_log,
+            "cache_planos_mb": self.cache_planos_mb,
+            "execucoes_simultaneas": self.execucoes_simultaneas,
+            "hotkeys_macros": self.atalhos_macros
+        }
+        
+        try:
+            with open("config_global.json", "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error saving global settings: {e}")
+
+    def carregar_configuracoes_globais(self):
+        """Carrega as configurações globais do arquivo"""
+        try:
+            if os.path.exists("config_global.json"):
+                with open("config_global.json", "r", encoding="utf-8") as f:
+                    config = json.load(f)
+                
+                self.hotkey_iniciar = config.get("hotkey_iniciar", "ctrl+enter")
+                self.hotkey_parar = config.get("hotkey_parar", "esc")
+                self.hotkey_pausar = config.get("hotkey_pausar", "ctrl+shift+p")
+                self.hotkey_gravar = config.get("hotkey_gravar", "ctrl+shift+r")
+                self.hotkey_captura_mouse = config.get("hotkey_captura_mouse", "ctrl+shift+c")
+                self.nivel_log = config.get("nivel_log", "auto")
+                if self.nivel_log != "auto" and self.nivel_log not in NIVEIS_LOG:
+                    self.nivel_log = "auto"
+                self.limite_log = max(10, int(config.get("limite_log", LIMITE_LINHAS)))
+                self.arquivo_log = config.get("arquivo_log", "")
+                self.cache_planos_mb = max(0, int(config.get("cache_planos_mb", ORCAMENTO_CACHE_MB)))
+                self.execucoes_simultaneas = max(1, int(config.get("execucoes_simultaneas", LIMITE_SIMULTANEAS)))
+                self.atalhos_macros = dict(config.get("hotkeys_macros", {}))
+        except Exception as e:
+            print(f"Error loading global settings: {e}")
+
+    def configurar_hotkeys(self):
+        """Configura as hotkeys globais"""
+        try:
+            # Remover hotkeys antigas se existirem
+            keyboard.unhook_all()
+            
+            # Configurar novas hotkeys
+            keyboard.add_hotkey(self.hotkey_iniciar, self.pedir_inicio)
+            keyboard.add_hotkey(self.hotkey_parar, self.pedir_parada)
+            keyboard.add_hotkey(self.hotkey_pausar, self.pedir_pausa)
+            keyboard.add_hotkey(self.hotkey_gravar, self.pedir_gravacao)
+            for hotkey in self.atalhos_macros:
+                keyboard.add_hotkey(hotkey, self.disparar_atalho, args=(hotkey,))
+            
+            print(f"Hotkeys configured: {self.hotkey_iniciar}=Start, {self.hotkey_parar}=Stop, {self.hotkey_pausar}=Pause/Resume, {self.hotkey_gravar}=Record, {self.hotkey_captura_mouse}=Mouse Capt.")
+            if self.atalhos_macros:
+                print("Macro hotkeys: " + ", ".join(f"{h}={n}" for h, n in self.atalhos_macros.items()))
+        except Exception as e:
+            print(f"Warning: unable to configure hotkeys: {e}")
+
+
+
+    def criar_dialogo_padrao(self, titulo, largura=400, altura=300):
+        """Cria um diálogo padronizado centralizado"""
+        dialog = tk.Toplevel(self.janela)
+        dialog.title(titulo)
+        dialog.geometry(f"{largura}x{altura}")
+        dialog.resizable(False, False)
+        dialog.transient(self.janela)
+        dialog.grab_set()
+        
+        # Frame principal com padding
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Centralizar
+        dialog.update_idletasks()
+        x = (self.janela.winfo_x() + self.janela.winfo_width() // 2 - dialog.winfo_width() // 2)
+        y = (self.janela.winfo_y() + self.janela.winfo_height() // 2 - dialog.winfo_height() // 2)
+        dialog.geometry(f"+{x}+{y}")
+        
+        return dialog, main_frame
+
+
+    def carregar_macros(self):
+        """Abre a biblioteca SQLite (importando o macros.json antigo na primeira vez)"""
+        try:
+            self.biblioteca = BibliotecaMacros()
+            importados = self.biblioteca.importar_json(ARQUIVO_MACROS)
+            if importados:
+                print(f"Imported {importados} macros from {ARQUIVO_MACROS}")
+        except Exception as e:
+            print(f"Error loading macros: {e}")
+            # Biblioteca apenas em memória, para o editor continuar utilizável
+            self.biblioteca = BibliotecaMacros(":memory:")
+
+    def filtrar_macros(self, event=None):
+        """Atualiza a lista do combobox com os nomes que correspondem ao texto digitado"""
+        if event is not None and event.keysym in ("Return", "Up", "Down", "Escape"):
+            return
+        try:
+            self.combo_macros['values'] = self.biblioteca.buscar(self.combo_macros.get(), LIMITE_BUSCA)
+        except Exception as e:
+            print(f"Error searching macros: {e}")
+    
+    def criar_interface(self):
+        """Cria a interface principal"""
+        # Frame principal com scroll
+        main_frame = ttk.Frame(self.janela)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Canvas e Scrollbar para toda a interface
+        canvas = tk.Canvas(main_frame)
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+        self.scrollable_main_frame = ttk.Frame(canvas)
+        
+        self.scrollable_main_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        canvas.create_window((0, 0), window=self.scrollable_main_frame, anchor="nw", tags="frame")
+        # E ADICIONE estas linhas DEPOIS:
+        canvas.bind('<Configure>', lambda e: canvas.itemconfig("frame", width=e.width))
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Título
+        titulo = tk.Label(self.scrollable_main_frame, text="MacroMaker", 
+                         font=("Arial", 16, "bold"))
+        titulo.pack(pady=10)
+        
+        # Frame de gerenciamento de macros
+        self.criar_frame_macros(self.scrollable_main_frame)
+        
+        # Frame de configurações
+        self.criar_frame_configuracoes(self.scrollable_main_frame)
+        
+        # Frame de etapas
+        self.criar_frame_etapas(self.scrollable_main_frame)
+        
+        # Frame de preview do teclado
+        self.criar_frame_preview(self.scrollable_main_frame)
+        
+        # Frame de controles e status
+        self.criar_frame_controles(self.scrollable_main_frame)
+    
+    def criar_frame_macros(self, parent):
+        """Frame de gerenciamento de macros"""
+        frame = ttk.LabelFrame(parent, text="💾 Macro Management", padding=10)
+        frame.pack(fill=tk.X, pady=5, padx=10)
+        
+        # Linha 1 - Seleção de macro
+        linha1 = ttk.Frame(frame)
+        linha1.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(linha1, text="Macro:").pack(side=tk.LEFT, padx=5)
+        
+        # Só os nomes que correspondem ao texto digitado são lidos da biblioteca
+        self.combo_macros = ttk.Combobox(linha1, width=30, postcommand=self.filtrar_macros)
+        self.combo_macros.pack(side=tk.LEFT, padx=5)
+        self.combo_macros.bind('<<ComboboxSelected>>', self.carregar_macro_selecionado)
+        self.combo_macros.bind('<KeyRelease>', self.filtrar_macros)
+        self.combo_macros.bind('<Return>', self.carregar_macro_selecionado)
+        
+        ttk.Button(linha1, text="📁 Load File", command=self.carregar_arquivo).pack(side=tk.LEFT, padx=2)
+        ttk.Button(linha1, text="➕ New", command=self.novo_macro).pack(side=tk.LEFT, padx=2)
+        ttk.Button(linha1, text="✏️ Edit Name", command=self.editar_nome_macro).pack(side=tk.LEFT, padx=2)
+        ttk.Button(linha1, text="🗑️ Delete", command=self.excluir_macro).pack(side=tk.LEFT, padx=2)
+        ttk.Button(linha1, text="💾 Save", command=self.salvar_macro_atual).pack(side=tk.LEFT, padx=2)
+        
+        # Linha 2 - Nome do macro
+        linha2 = ttk.Frame(frame)
+        linha2.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(linha2, text="Name:").pack(side=tk.LEFT, padx=5)
+        self.entry_nome = ttk.Entry(linha2, width=40)
+        self.entry_nome.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.entry_nome.insert(0, "New Macro")
+
+    def atualizar_tempos_aleatorios(self):
+        """Atualiza os tempos aleatórios na interface quando os valores mudam"""
+        if self.combo_modo_tempo.get() == "random":
+            self.tabela_etapas.atualizar_texto_tempo()
+
+    def atualizar_tempos_fixos(self):
+        """Atualiza os tempos fixos na interface quando o valor muda"""
+        # Um único texto compartilhado por todas as linhas: não redesenha a lista
+        if self.combo_modo_tempo.get() == "steady":
+            self.tabela_etapas.atualizar_texto_tempo()
+
+    def atualizar_interface_repeticao(self):
+        """Atualiza a interface quando o checkbox de repetição é alterado"""
+        self.tabela_etapas.invalidar()
+
+    def criar_frame_configuracoes(self, parent):
+        """Frame de configurações gerais"""
+        frame = ttk.LabelFrame(parent, text="⚙️ General Settings", padding=10)
+        frame.pack(fill=tk.X, pady=5, padx=10)
+        
+        linha = ttk.Frame(frame)
+        linha.pack(fill=tk.X, pady=5)
+        
+        # Checkbox para ativar repetições por etapa
+        self.var_repetir_acoes = tk.BooleanVar()
+        self.check_repetir_acoes = ttk.Checkbutton(linha, text="Step repetitions", 
+                                                variable=self.var_repetir_acoes,
+                                                command=self.atualizar_interface_repeticao)
+        self.check_repetir_acoes.pack(side=tk.LEFT, padx=5)
+        
+        # Repetições
+        ttk.Label(linha, text="Repetitions:").pack(side=tk.LEFT, padx=5)
+        self.spin_repeticoes = ttk.Spinbox(linha, from_=1, to=100, width=5, validate="key")
+        self.spin_repeticoes.configure(validatecommand=(self.spin_repeticoes.register(self.validar_numero), '%P'))
+        self.spin_repeticoes.set(1)
+        self.spin_repeticoes.pack(side=tk.LEFT, padx=5)
+        
+        # Modo de tempo
+        ttk.Label(linha, text="Time Mode:").pack(side=tk.LEFT, padx=5)
+        self.combo_modo_tempo = ttk.Combobox(linha, values=["steady", "personalized", "random"], width=12)
+        self.combo_modo_tempo.set("steady")
+        self.combo_modo_tempo.pack(side=tk.LEFT, padx=5)
+        self.combo_modo_tempo.bind('<<ComboboxSelected>>', self.atualizar_interface_tempo)
+        
+        # Linha 2 - Velocidade da execução
+        linha2 = ttk.Frame(frame)
+        linha2.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(linha2, text="Time scale:").pack(side=tk.LEFT, padx=5)
+        self.entry_escala_tempo = ttk.Entry(linha2, width=6)
+        self.entry_escala_tempo.insert(0, "1.0")
+        self.entry_escala_tempo.pack(side=tk.LEFT, padx=2)
+        ttk.Label(linha2, text="× all times").pack(side=tk.LEFT, padx=2)
+        
+        self.var_velocidade_maxima = tk.BooleanVar()
+        ttk.Checkbutton(linha2, text="⚡ Max speed (no delays)",
+                        variable=self.var_velocidade_maxima).pack(side=tk.LEFT, padx=10)
+        
+        ttk.Button(linha2, text="⏱️ Timing...", command=self.configurar_tempos_macro).pack(side=tk.LEFT, padx=5)
+        
+        # Frame para tempo fixo
+        self.frame_tempo_fixo = ttk.Frame(frame)
+        ttk.Label(self.frame_tempo_fixo, text="Fixed time:").pack(side=tk.LEFT, padx=5)
+        self.entry_tempo_fixo = ttk.Entry(self.frame_tempo_fixo, width=8)
+        self.entry_tempo_fixo.insert(0, "0.3")
+        self.entry_tempo_fixo.bind('<KeyRelease>', lambda e: self.atualizar_tempos_fixos())
+        self.entry_tempo_fixo.bind('<FocusOut>', lambda e: self.atualizar_tempos_fixos())
+        self.entry_tempo_fixo.pack(side=tk.LEFT, padx=2)
+        ttk.Label(self.frame_tempo_fixo, text="seconds").pack(side=tk.LEFT, padx=5)
+        
+        # Frame para configurações de tempo aleatório
+        self.frame_tempo_aleatorio = ttk.Frame(frame)
+        ttk.Label(self.frame_tempo_aleatorio, text="Between").pack(side=tk.LEFT, padx=5)
+        self.entry_tempo_min = ttk.Entry(self.frame_tempo_aleatorio, width=5)
+        self.entry_tempo_min.insert(0, "0.3")
+        self.entry_tempo_min.pack(side=tk.LEFT, padx=2)
+        self.entry_tempo_min.bind('<KeyRelease>', lambda e: self.atualizar_tempos_aleatorios())
+        self.entry_tempo_min.bind('<FocusOut>', lambda e: self.atualizar_tempos_aleatorios())
+        ttk.Label(self.frame_tempo_aleatorio, text="and").pack(side=tk.LEFT, padx=2)
+        self.entry_tempo_max = ttk.Entry(self.frame_tempo_aleatorio, width=5)
+        self.entry_tempo_max.insert(0, "2.0")
+        self.entry_tempo_max.pack(side=tk.LEFT, padx=2)
+        self.entry_tempo_max.bind('<KeyRelease>', lambda e: self.atualizar_tempos_aleatorios())  # ← NOVO
+        self.entry_tempo_max.bind('<FocusOut>', lambda e: self.atualizar_tempos_aleatorios())   # ← NOVO
+        ttk.Label(self.frame_tempo_aleatorio, text="seconds").pack(side=tk.LEFT, padx=5)
+        
+        # Mostrar tempo fixo por padrão
+        self.frame_tempo_fixo.pack(fill=tk.X, pady=5)
+    
+    def criar_frame_etapas(self, parent):
+        """Frame de edição de etapas"""
+        frame = ttk.LabelFrame(parent, text="🎯 Macro Steps", padding=10)
+        frame.pack(fill=tk.BOTH, expand=True, pady=5, padx=10)
+        
+        # Tabela virtualizada: widgets apenas para as linhas visíveis
+        self.tabela_etapas = TabelaEtapas(frame, self)
+        
+        botoes_frame = ttk.Frame(frame)
+        botoes_frame.pack(pady=10)
+        
+        # Botão adicionar etapa
+        ttk.Button(botoes_frame, text="➕ Add Step", command=self.adicionar_etapa).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botoes_frame, text="🔁 Add Block", command=self.adicionar_bloco).pack(side=tk.LEFT, padx=5)
+        
+        # Gravação de teclado e mouse
+        self.btn_gravar = ttk.Button(botoes_frame, text="⏺️ Record", command=self.alternar_gravacao)
+        self.btn_gravar.pack(side=tk.LEFT, padx=5)
+        self.var_gravar_movimentos = tk.BooleanVar()
+        ttk.Checkbutton(botoes_frame, text="Record mouse moves",
+                        variable=self.var_gravar_movimentos).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botoes_frame, text="〰️ Simplify Moves",
+                   command=self.simplificar_movimentos_macro).pack(side=tk.LEFT, padx=5)
+    
+    def criar_frame_preview(self, parent):
+        """Frame de preview do teclado (simplificado)"""
+        frame = ttk.LabelFrame(parent, text="⌨️ Keyboard Preview", padding=10)
+        frame.pack(fill=tk.X, pady=5, padx=10)
+        
+        # Área simplificada do teclado
+        self.label_preview = tk.Label(frame, text="PT/BR Keyboard - Layout detected\nClick on an action box and press the desired keys", 
+                                     bg="lightgray", height=4, font=("Arial", 10), justify=tk.LEFT)
+        self.label_preview.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(frame, text="🔄 Update Preview", command=self.atualizar_preview).pack(pady=5)
+    
+    def configurar_hotkeys_dialog(self):
+        """Abre diálogo para configurar hotkeys"""
+        dialog = tk.Toplevel(self.janela)
+        dialog.title("Configure Hotkeys")
+        dialog.geometry("500x380")  # Tamanho fixo adequado
+        dialog.resizable(False, False)  # Não redimensionável
+        dialog.transient(self.janela)
+        dialog.grab_set()
+        
+        # Frame principal com padding
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(main_frame, text="Configure Hotkeys", 
+                font=("Arial", 14, "bold")).pack(pady=(0, 20))
+        
+        # Frame para as hotkeys - usando grid para alinhamento perfeito
+        keys_frame = ttk.Frame(main_frame)
+        keys_frame.pack(fill=tk.X, pady=10)
+        
+        # Hotkey Iniciar
+        ttk.Label(keys_frame, text="Start:", width=12).grid(row=0, column=0, padx=5, pady=8, sticky="w")
+        entry_iniciar = ttk.Entry(keys_frame, width=20)
+        entry_iniciar.insert(0, self.hotkey_iniciar)
+        entry_iniciar.grid(row=0, column=1, padx=5, pady=8, sticky="ew")
+        ttk.Button(keys_frame, text="Detect", width=8,
+                command=lambda: self.detectar_hotkey(entry_iniciar)).grid(row=0, column=2, padx=5, pady=8)
+        
+        # Hotkey Parar
+        ttk.Label(keys_frame, text="Stop:", width=12).grid(row=1, column=0, padx=5, pady=8, sticky="w")
+        entry_parar = ttk.Entry(keys_frame, width=20)
+        entry_parar.insert(0, self.hotkey_parar)
+        entry_parar.grid(row=1, column=1, padx=5, pady=8, sticky="ew")
+        ttk.Button(keys_frame, text="Detect", width=8,
+                command=lambda: self.detectar_hotkey(entry_parar)).grid(row=1, column=2, padx=5, pady=8)
+        
+        # Hotkey Pausar/Retomar
+        ttk.Label(keys_frame, text="Pause/Resume:", width=12).grid(row=2, column=0, padx=5, pady=8, sticky="w")
+        entry_pausar = ttk.Entry(keys_frame, width=20)
+        entry_pausar.insert(0, self.hotkey_pausar)
+        entry_pausar.grid(row=2, column=1, padx=5, pady=8, sticky="ew")
+        ttk.Button(keys_frame, text="Detect", width=8,
+                command=lambda: self.detectar_hotkey(entry_pausar)).grid(row=2, column=2, padx=5, pady=8)
+        
+        # Hotkey Gravar
+        ttk.Label(keys_frame, text="Record:", width=12).grid(row=3, column=0, padx=5, pady=8, sticky="w")
+        entry_gravar = ttk.Entry(keys_frame, width=20)
+        entry_gravar.insert(0, self.hotkey_gravar)
+        entry_gravar.grid(row=3, column=1, padx=5, pady=8, sticky="ew")
+        ttk.Button(keys_frame, text="Detect", width=8,
+                command=lambda: self.detectar_hotkey(entry_gravar)).grid(row=3, column=2, padx=5, pady=8)
+        
+        # Hotkey Mouse Capture
+        ttk.Label(keys_frame, text="Mouse Capt.:", width=12).grid(row=4, column=0, padx=5, pady=8, sticky="w")
+        entry_captura = ttk.Entry(keys_frame, width=20)
+        entry_captura.insert(0, self.hotkey_captura_mouse)
+        entry_captura.grid(row=4, column=1, padx=5, pady=8, sticky="ew")
+        ttk.Button(keys_frame, text="Detect", width=8,
+                command=lambda: self.detectar_hotkey(entry_captura)).grid(row=4, column=2, padx=5, pady=8)
+        
+        # Configurar grid weights para responsividade
+        keys_frame.columnconfigure(1, weight=1)
+        
+        # Frame para botões na parte inferior
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(side=tk.BOTTOM, pady=(20, 0))
+        
+        def aplicar():
+            self.hotkey_iniciar = entry_iniciar.get().lower()
+            self.hotkey_parar = entry_parar.get().lower()
+            self.hotkey_pausar = entry_pausar.get().lower()
+            self.hotkey_gravar = entry_gravar.get().lower()
+            self.hotkey_captura_mouse = entry_captura.get().lower()
+            self.configurar_hotkeys()
+            self.salvar_configuracoes_globais()
+            dialog.destroy()
+            messagebox.showinfo("Success", "Hotkeys updated!")
+        
+        ttk.Button(buttons_frame, text="Aplicar", command=aplicar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Default", 
+                command=lambda: [
+                    entry_iniciar.delete(0, tk.END), entry_iniciar.insert(0, "ctrl+enter"),
+                    entry_parar.delete(0, tk.END), entry_parar.insert(0, "esc"),
+                    entry_pausar.delete(0, tk.END), entry_pausar.insert(0, "ctrl+shift+p"),
+                    entry_gravar.delete(0, tk.END), entry_gravar.insert(0, "ctrl+shift+r"),
+                    entry_captura.delete(0, tk.END), entry_captura.insert(0, "ctrl+shift+c")
+                ]).pack(side=tk.LEFT, padx=5)
+        
+        # Centralizar diálogo
+        dialog.update_idletasks()
+        x = (self.janela.winfo_x() + self.janela.winfo_width() // 2 - dialog.winfo_width() // 2)
+        y = (self.janela.winfo_y() + self.janela.winfo_height() // 2 - dialog.winfo_height() // 2)
+        dialog.geometry(f"+{x}+{y}")
+
+    def criar_frame_controles(self, parent):
+        """Frame de controles e status"""
+        frame = ttk.LabelFrame(parent, text="🚀 Controls", padding=10)
+        frame.pack(fill=tk.X, pady=5, padx=10)
+            
+        # Botões de controle
+        botoes_frame = ttk.Frame(frame)
+        botoes_frame.pack(fill=tk.X, pady=5)
+        
+        self.btn_iniciar = ttk.Button(botoes_frame, text="▶️ START", command=self.iniciar_execucao)
+        self.btn_iniciar.pack(side=tk.LEFT, padx=5)
+        
+        self.btn_parar = ttk.Button(botoes_frame, text="⏹️ STOP", command=self.parar_execucao, state="disabled")
+        self.btn_parar.pack(side=tk.LEFT, padx=5)
+        
+        self.btn_pausar = ttk.Button(botoes_frame, text="⏸️ PAUSE", command=self.alternar_pausa, state="disabled")
+        self.btn_pausar.pack(side=tk.LEFT, padx=5)
+
+        # Roda o macro atual ao lado das execuções em curso
+        ttk.Button(botoes_frame, text="⏩ Run Alongside",
+                   command=lambda: self.iniciar_execucao(paralela=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Label(botoes_frame, text="Priority:").pack(side=tk.LEFT, padx=(5, 2))
+        self.spin_prioridade = ttk.Spinbox(botoes_frame, from_=0, to=9, width=3)
+        self.spin_prioridade.set(0)
+        self.spin_prioridade.pack(side=tk.LEFT)
+
+        ttk.Button(botoes_frame, text="⚙️ Configure Hotkeys", 
+          command=self.configurar_hotkeys_dialog).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botoes_frame, text="⌨️ Macro Hotkeys",
+                   command=self.configurar_atalhos_macros_dialog).pack(side=tk.LEFT, padx=5)
+        
+        # Nível de detalhe do log
+        ttk.Label(botoes_frame, text="Log:").pack(side=tk.LEFT, padx=(15, 2))
+        self.combo_nivel_log = ttk.Combobox(botoes_frame, values=["auto"] + list(NIVEIS_LOG),
+                                            width=8, state="readonly")
+        self.combo_nivel_log.pack(side=tk.LEFT)
+        self.combo_nivel_log.bind('<<ComboboxSelected>>', self.alterar_nivel_log)
+        
+        # Status
+        self.label_status = tk.Label(frame, text="Status: Ready", font=("Arial", 10), fg="blue")
+        self.label_status.pack(anchor="w", pady=2)
+        self.label_latencia = tk.Label(frame, text="", font=("Arial", 9), fg="gray")
+        self.label_latencia.pack(anchor="w")
+
+        # Execuções em curso e na fila
+        execucoes_frame = ttk.Frame(frame)
+        execucoes_frame.pack(fill=tk.X, pady=2)
+        self.lista_execucoes = tk.Listbox(execucoes_frame, height=3, font=("Arial", 9))
+        self.lista_execucoes.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(execucoes_frame, text="⏹️ Stop Selected",
+                   command=self.parar_execucao_selecionada).pack(side=tk.LEFT, padx=5)
+        self.var_linha_tempo = tk.BooleanVar()
+        ttk.Checkbutton(execucoes_frame, text="📈 Timeline", variable=self.var_linha_tempo,
+                        command=self.alternar_linha_tempo).pack(side=tk.LEFT, padx=5)
+        ttk.Button(execucoes_frame, text="Export Timeline",
+                   command=self.exportar_linha_tempo).pack(side=tk.LEFT)
+        
+        
+
+        # Frame para o log que pode ser redimensionado
+        log_container = ttk.Frame(frame)
+        log_container.pack(fill=tk.X, pady=2)
+
+        # Text log dentro do container
+        self.text_log = tk.Text(log_container, height=4, font=("Arial", 9))
+        self.text_log.pack(fill=tk.BOTH, expand=True)
+
+        # Cantinho de redimensionamento no container do log
+        def start_resize(event):
+            log_container.start_height = self.text_log.cget("height")
+            log_container.start_y = event.y_root
+
+        def do_resize(event):
+            if hasattr(log_container, 'start_height') and hasattr(log_container, 'start_y'):
+                delta = event.y_root - log_container.start_y
+                # Cada 10 pixels = 1 linha (ajuste a sensibilidade)
+                new_height = max(2, log_container.start_height + delta // 10)
+                self.text_log.config(height=new_height)
+
+        def stop_resize(event):
+            if hasattr(log_container, 'start_height'):
+                delattr(log_container, 'start_height')
+            if hasattr(log_container, 'start_y'):
+                delattr(log_container, 'start_y')
+
+        # Frame do cantinho (15x15 pixels no canto inferior direito)
+        resize_handle = ttk.Frame(log_container, width=15, height=15)
+        resize_handle.place(relx=1.0, rely=1.0, anchor="se")  # Posiciona no canto inferior direito
+        resize_handle.configure(cursor="sizing")
+
+        resize_handle.bind('<Button-1>', start_resize)
+        resize_handle.bind('<B1-Motion>', do_resize)
+        resize_handle.bind('<ButtonRelease-1>', stop_resize)
+
+        # Hotkeys info
+        info_hotkeys = tk.Label(frame, text=f"Hotkeys: {self.hotkey_iniciar}=Start, {self.hotkey_parar}=Stop, {self.hotkey_pausar}=Pause/Resume, {self.hotkey_gravar}=Record, {self.hotkey_captura_mouse}=Mouse Capt.", 
+                            font=("Arial", 8), fg="gray")
+        info_hotkeys.pack(anchor="w")
+
+
+        # Hotkeys info
+        info_hotkeys = tk.Label(frame, 
+                            text=f"Hotkeys: {self.hotkey_iniciar}=Start, {self.hotkey_parar}=Stop, {self.hotkey_captura_mouse}=Mouse Capt.", 
+                            font=("Arial", 8), fg="gray")
+
+    def detectar_hotkey(self, entry_widget):
+        """Detecta uma hotkey pressionada pelo usuário"""
+        dialog = tk.Toplevel(self.janela)
+        dialog.title("Detect Hotkey")
+        dialog.geometry("400x200")
+        dialog.transient(self.janela)
+        dialog.grab_set()
+        
+        tk.Label(dialog, text="Press the desired key combination\n\nClick X when finished", 
+                font=("Arial", 10), justify=tk.CENTER).pack(pady=20)
+        
+        lbl_status = tk.Label(dialog, text="Waiting...", fg="blue")
+        lbl_status.pack(pady=10)
+        
+        teclas_pressionadas = set()
+        modificadores_pressionados = set()
+        
+        def on_key_press(e):
+            tecla = e.keysym
+            
+            # Lista de teclas de modificador
+            teclas_modificadoras = {
+                'Control_L': 'ctrl', 'Control_R': 'ctrl',
+                'Alt_L': 'alt', 'Alt_R': 'alt', 
+                'Shift_L': 'shift', 'Shift_R': 'shift'
+            }
+            
+            # Adicionar à lista de teclas pressionadas
+            if tecla in teclas_modificadoras:
+                modificador = teclas_modificadoras[tecla]
+                modificadores_pressionados.add(modificador)
+            else:
+                teclas_pressionadas.add(tecla)
+            
+            # Construir a string final
+            modificadores_list = list(modificadores_pressionados)
+            teclas_list = list(teclas_pressionadas)
+            
+            if modificadores_list and teclas_list:
+                hotkey = "+".join(modificadores_list + teclas_list)
+            elif modificadores_list:
+                hotkey = "+".join(modificadores_list)
+            elif teclas_list:
+                hotkey = "+".join(teclas_list)
+            else:
+                hotkey = ""
+            
+            entry_widget.delete(0, tk.END)
+            entry_widget.insert(0, hotkey)
+            lbl_status.config(text=f"Detected: {hotkey}")
+        
+        def on_key_release(e):
+            tecla = e.keysym
+            teclas_modificadoras = {
+                'Control_L': 'ctrl', 'Control_R': 'ctrl',
+                'Alt_L': 'alt', 'Alt_R': 'alt', 
+                'Shift_L': 'shift', 'Shift_R': 'shift'
+            }
+            
+            if tecla in teclas_modificadoras:
+                modificador = teclas_modificadoras[tecla]
+                modificadores_pressionados.discard(modificador)
+            else:
+                teclas_pressionadas.discard(tecla)
+        
+        def finalizar_deteccao():
+            dialog.destroy()
+        
+        # Vincular eventos
+        dialog.bind('<KeyPress>', on_key_press)
+        dialog.bind('<KeyRelease>', on_key_release)
+        
+        # Botão para fechar manualmente — label padronizado
+        btn_fechar = ttk.Button(dialog, text="Confirm", command=finalizar_deteccao)
+        btn_fechar.pack(pady=10)
+        
+        dialog.focus_set()
+        # Usa lambda para garantir que a função NÃO seja chamada no momento da ligação
+        dialog.protocol("WM_DELETE_WINDOW", lambda: finalizar_deteccao())
+
+
+    def validar_numero(self, valor):
+        """Valida se o valor é um número"""
+        if valor == "":
+            return True
+        try:
+            float(valor)
+            return True
+        except ValueError:
+            return False
+    
+    def atualizar_interface_tempo(self, event=None):
+        """Atualiza a interface baseada no modo de tempo selecionado"""
+        modo = self.combo_modo_tempo.get()
+        
+        # Esconder todos os frames primeiro
+        self.frame_tempo_fixo.pack_forget()
+        self.frame_tempo_aleatorio.pack_forget()
+        
+        # Mostrar o frame correto
+        if modo == "steady":
+            self.frame_tempo_fixo.pack(fill=tk.X, pady=5)
+        elif modo == "random":
+            self.frame_tempo_aleatorio.pack(fill=tk.X, pady=5)
+
+        # Atualizar a lista de etapas para refletir a mudança
+        self.tabela_etapas.invalidar()
+
+
+    def copiar_etapa(self, index):
+        """Cria cópias de uma etapa - VERSÃO CORRIGIDA"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            dialog = tk.Toplevel(self.janela)
+            dialog.title("Copy Step")
+            dialog.geometry("300x230")
+            dialog.resizable(False, False)
+            dialog.transient(self.janela)
+            dialog.grab_set()
+            
+            # Centralizar
+            dialog.update_idletasks()
+            x = (self.janela.winfo_x() + self.janela.winfo_width() // 2 - dialog.winfo_width() // 2)
+            y = (self.janela.winfo_y() + self.janela.winfo_height() // 2 - dialog.winfo_height() // 2)
+            dialog.geometry(f"+{x}+{y}")
+            
+            # **CORREÇÃO: Usar grid para layout preciso**
+            
+            # Label
+            label = tk.Label(dialog, text="How many copies?", 
+                            font=("Arial", 11))
+            label.grid(row=0, column=0, columnspan=2, pady=20, padx=20)
+            
+            # Input
+            ttk.Label(dialog, text="Copies:").grid(row=1, column=0, padx=5, pady=10, sticky="e")
+            
+            entry_copias = ttk.Entry(dialog, width=10)
+            entry_copias.insert(0, "1")
+            entry_copias.grid(row=1, column=1, padx=5, pady=10, sticky="w")
+            
+            # Como bloco, a etapa fica uma vez só e repete n + 1 vezes
+            var_bloco = tk.BooleanVar(value=True)
+            ttk.Checkbutton(dialog, text="As a block (stored once)",
+                            variable=var_bloco).grid(row=2, column=0, columnspan=2, pady=5)
+            
+            def confirmar_copias():
+                try:
+                    num_copias = int(entry_copias.get())
+                    if num_copias > 0:
+                        # Em uma etapa de abertura ou fim, copia o bloco inteiro
+                        inicio = fim = index
+                        par = self.modelo.par_bloco(index)
+                        if par is not None:
+                            inicio, fim = min(index, par), max(index, par)
+                        if var_bloco.get():
+                            abertura, fechamento = nova_etapa_bloco(num_copias + 1)
+                            self.modelo.inserir(fim + 1, fechamento)
+                            self.modelo.inserir(inicio, abertura)
+                        else:
+                            self.modelo.duplicar(inicio, fim, num_copias)
+                        dialog.destroy()
+                except ValueError:
+                    messagebox.showerror("Error", "Enter a valid number!")
+            
+            # Botão
+            btn_confirmar = ttk.Button(dialog, text="Confirm", command=confirmar_copias)
+            btn_confirmar.grid(row=3, column=0, columnspan=2, pady=15)
+            
+            # Configurar grid weights
+            dialog.grid_rowconfigure(0, weight=1)
+            dialog.grid_rowconfigure(1, weight=0)
+            dialog.grid_rowconfigure(2, weight=0)
+            dialog.grid_rowconfigure(3, weight=1)
+            dialog.grid_columnconfigure(0, weight=1)
+            dialog.grid_columnconfigure(1, weight=1)
+            
+            entry_copias.focus_set()
+            entry_copias.select_range(0, tk.END)
+            entry_copias.bind('<Return>', lambda e: confirmar_copias())
+
+
+    def adicionar_etapa(self):
+        """Adiciona uma nova etapa à lista"""
+        etapa = {
+            "tipo": "keyboard",  # ← NOVO CAMPO
+            "acao": "Click to set key", 
+            "tempo": "0.3", 
+            "repeticoes": 1,
+            "x": 0,  # ← NOVO CAMPO (para mouse)
+            "y": 0   # ← NOVO CAMPO (para mouse)
+        }
+        self.modelo.inserir(len(self.modelo), etapa)
+        self.tabela_etapas.mostrar_etapa(len(self.modelo) - 1)
+    
+    def adicionar_bloco(self):
+        """Envolve um trecho de etapas em um bloco que se repete"""
+        if not len(self.modelo):
+            messagebox.showerror("Error", "Add the steps to repeat first!")
+            return
+        
+        dialog, main_frame = self.criar_dialogo_padrao("Add Block", 320, 250)
+        
+        tk.Label(main_frame, text="Repeat a range of steps:", font=("Arial", 11)).pack(pady=10)
+        
+        campos_frame = ttk.Frame(main_frame)
+        campos_frame.pack(pady=5)
+        entradas = []
+        for linha, (texto, valor) in enumerate((("First step:", 1), ("Last step:", len(self.modelo)),
+                                                 ("Repetitions:", 2))):
+            ttk.Label(campos_frame, text=texto).grid(row=linha, column=0, padx=5, pady=3, sticky="w")
+            entrada = ttk.Entry(campos_frame, width=8)
+            entrada.insert(0, str(valor))
+            entrada.grid(row=linha, column=1, padx=5, pady=3)
+            entradas.append(entrada)
+        
+        def confirmar_bloco():
+            try:
+                primeira, ultima, repeticoes = (int(entrada.get()) for entrada in entradas)
+            except ValueError:
+                messagebox.showerror("Error", "Enter valid numbers!", parent=dialog)
+                return
+            if not 1 <= primeira <= ultima <= len(self.modelo):
+                messagebox.showerror("Error", f"Steps must be between 1 and {len(self.modelo)}, "
+                                     "first before last!", parent=dialog)
+                return
+            if repeticoes < 1:
+                messagebox.showerror("Error", "Repetitions must be at least 1!", parent=dialog)
+                return
+            if not self.modelo.intervalo_equilibrado(primeira - 1, ultima - 1):
+                messagebox.showerror("Error", "The range cuts through another block!", parent=dialog)
+                return
+            # Fim antes da abertura, para os índices do trecho não mudarem
+            abertura, fechamento = nova_etapa_bloco(repeticoes)
+            self.modelo.inserir(ultima, fechamento)
+            self.modelo.inserir(primeira - 1, abertura)
+            self.tabela_etapas.mostrar_etapa(primeira - 1)
+            dialog.destroy()
+        
+        ttk.Button(main_frame, text="Confirm", command=confirmar_bloco).pack(side=tk.BOTTOM, pady=10)
+        entradas[0].focus_set()
+        entradas[0].select_range(0, tk.END)
+        for entrada in entradas:
+            entrada.bind('<Return>', lambda e: confirmar_bloco())
+    
+    def configurar_bloco(self, index):
+        """Altera as repetições do bloco da etapa de abertura ou fim `index`"""
+        if self.modelo[index].get("tipo") != TIPO_BLOCO:
+            index = self.modelo.par_bloco(index)
+            if index is None:
+                return
+        repeticoes = simpledialog.askinteger("Block", "Repeat the block how many times?",
+                                             initialvalue=self.modelo[index].get("repeticoes", 1),
+                                             minvalue=1, parent=self.janela)
+        if repeticoes is not None:
+            self.modelo.atualizar(index, repeticoes=repeticoes)
+    
+    def configurar_chamada(self, index):
+        """Escolhe o macro chamado pela etapa, quantas vezes e se herda os tempos"""
+        etapa = self.modelo[index]
+        dialog, main_frame = self.criar_dialogo_padrao("Call Macro", 340, 250)
+        
+        tk.Label(main_frame, text="Run another saved macro:", font=("Arial", 11)).pack(pady=10)
+        
+        campos_frame = ttk.Frame(main_frame)
+        campos_frame.pack(pady=5)
+        ttk.Label(campos_frame, text="Macro:").grid(row=0, column=0, padx=5, pady=3, sticky="w")
+        try:
+            nomes = self.biblioteca.nomes()
+        except Exception as e:
+            print(f"Error listing macros: {e}")
+            nomes = []
+        combo_macro = ttk.Combobox(campos_frame, values=nomes, width=20)
+        combo_macro.set(etapa.get("acao", ""))
+        combo_macro.grid(row=0, column=1, padx=5, pady=3)
+        ttk.Label(campos_frame, text="Times:").grid(row=1, column=0, padx=5, pady=3, sticky="w")
+        entry_vezes = ttk.Entry(campos_frame, width=8)
+        entry_vezes.insert(0, str(etapa.get("repeticoes", 1)))
+        entry_vezes.grid(row=1, column=1, padx=5, pady=3, sticky="w")
+        var_herdar = tk.BooleanVar(value=etapa.get("herdar_tempos", True))
+        ttk.Checkbutton(campos_frame, text="Use this macro's timing",
+                        variable=var_herdar).grid(row=2, column=0, columnspan=2, pady=3, sticky="w")
+        
+        def confirmar_chamada():
+            nome = combo_macro.get().strip()
+            if not nome:
+                messagebox.showerror("Error", "Choose the macro to call!", parent=dialog)
+                return
+            try:
+                vezes = int(entry_vezes.get())
+            except ValueError:
+                vezes = 0
+            if vezes < 1:
+                messagebox.showerror("Error", "Times must be a whole number of at least 1!", parent=dialog)
+                return
+            self.modelo.atualizar(index, acao=nome, repeticoes=vezes, herdar_tempos=var_herdar.get())
+            dialog.destroy()
+        
+        ttk.Button(main_frame, text="Confirm", command=confirmar_chamada).pack(side=tk.BOTTOM, pady=10)
+        combo_macro.focus_set()
+        combo_macro.bind('<Return>', lambda e: confirmar_chamada())
+        entry_vezes.bind('<Return>', lambda e: confirmar_chamada())
+    
+    def atualizar_lista_etapas(self):
+        """Redesenha a lista visual de etapas (apenas as linhas visíveis)"""
+        self.tabela_etapas.invalidar()
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+    def configurar_acao_mouse(self, index):
+
+        """Abre seletor de ação de mouse"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            # Criar diálogo de seleção
+            dialog = tk.Toplevel(self.janela)
+            dialog.title("Select Mouse Action")
+            dialog.geometry("300x300")
+            dialog.transient(self.janela)
+            dialog.grab_set()
+            
+            tk.Label(dialog, text="Select mouse action:", 
+                    font=("Arial", 11)).pack(pady=15)
+            
+            # Frame para ações
+            frame_acoes = ttk.Frame(dialog)
+            frame_acoes.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+            
+            # Variável para armazenar seleção
+            acao_selecionada = tk.StringVar(value=self.macro_atual["etapas"][index].get("acao", "move"))
+            
+            # Botões para cada ação
+            acoes_info = [
+                ("move", "🖱️ Move", "Only moves the cursor"),
+                ("left_click", "🖱️ Left Click", "Click with left button"),
+                ("right_click", "🖱️ Right Click", "Click with right button"), 
+                ("middle_click", "🖱️ Middle Click", "Click with middle button"),
+                ("double_left_click", "🖱️ Double Left Click", "Double left click"),
+                ("double_right_click", "🖱️ Double Right Click", "Double right click")
+            ]
+            
+            for acao_id, acao_texto, acao_desc in acoes_info:
+                frame_acao = ttk.Frame(frame_acoes)
+                frame_acao.pack(fill=tk.X, pady=2)
+                
+                rb = ttk.Radiobutton(frame_acao, text=acao_texto, 
+                                variable=acao_selecionada, value=acao_id)
+                rb.pack(side=tk.LEFT, anchor="w")
+                
+                lbl_desc = ttk.Label(frame_acao, text=acao_desc, font=("Arial", 8), foreground="gray")
+                lbl_desc.pack(side=tk.LEFT, padx=10)
+            
+            def aplicar_acao():
+                self.modelo.atualizar(index, acao=acao_selecionada.get())
+                dialog.destroy()
+            
+            # Botões de ação — APENAS "Confirm"
+            frame_botoes = ttk.Frame(dialog)
+            frame_botoes.pack(pady=10)
+            
+            ttk.Button(frame_botoes, text="Confirm", command=aplicar_acao).pack(side=tk.LEFT, padx=5)
+            
+            # Evita execução acidental e permite fechar com X
+            dialog.protocol("WM_DELETE_WINDOW", lambda: dialog.destroy())
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+    def atualizar_tipo_etapa(self, index, novo_tipo):
+        """Atualiza o tipo de uma etapa de forma escalável"""
+        if 0 <= index < len(self.modelo):
+            etapa = self.modelo[index]
+            tipo_antigo = etapa.get("tipo", "keyboard")
+            
+            if tipo_antigo != novo_tipo:
+                campos = {"tipo": novo_tipo}
+                
+                # Sistema de reset por tipo (ESCALÁVEL)
+                config_por_tipo = {
+                    "keyboard": {
+                        "acao_padrao": "Click to set key",
+                        "resetar_coordenadas": True
+                    },
+                    "mouse": {
+                        "acao_padrao": "move", 
+                        "resetar_coordenadas": False
+                    },
+                    TIPO_CHAMADA: {
+                        "acao_padrao": "",
+                        "resetar_coordenadas": True
+                    }
+                }
+                
+                if novo_tipo in config_por_tipo:
+                    config = config_por_tipo[novo_tipo]
+                    campos["acao"] = config["acao_padrao"]
+                    
+                    if config["resetar_coordenadas"]:
+                        campos["x"] = 0
+                        campos["y"] = 0
+                
+                # Um único evento para todos os campos alterados
+                self.modelo.atualizar(index, **campos)
+
+    def atualizar_coordenada_x(self, index, x):
+        """Atualiza coordenada X de uma etapa mouse"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            try:
+                self.modelo.atualizar(index, x=int(x))
+            except ValueError:
+                pass
+
+    def atualizar_coordenada_y(self, index, y):
+        """Atualiza coordenada Y de uma etapa mouse"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            try:
+                self.modelo.atualizar(index, y=int(y))
+            except ValueError:
+                pass
+
+
+    def capturar_posicao_mouse(self, index):
+        """Abre modo de captura de posição do mouse"""
+        # Importado aqui: só carrega o pyautogui quando a captura é usada
+        from .captura import abrir_captura_mouse
+        
+        def ao_capturar(x, y):
+            if 0 <= index < len(self.modelo):
+                self.modelo.atualizar(index, x=x, y=y)
+        
+        abrir_captura_mouse(self.janela, self.hotkey_captura_mouse, ao_capturar)
+
+
+    def atualizar_repeticao_etapa(self, index, repeticoes):
+        """Atualiza as repetições de uma etapa"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            try:
+                self.modelo.atualizar(index, repeticoes=int(repeticoes))
+            except ValueError:
+                pass
+
+
+
+
+
+
+
+
+    def configurar_tecla(self, index):
+        """Configura uma tecla através de detecção de pressionamento"""
+        self.aguardando_tecla = True
+        self.tecla_atual = ""
+        
+        dialog, main_frame = self.criar_dialogo_padrao("Detect Key", 400, 200)
+        
+        # Conteúdo clean
+        tk.Label(main_frame, text="Press desired key", 
+                font=("Arial", 12)).pack(pady=15)
+        
+        lbl_status = tk.Label(main_frame, text="Waiting...", font=("Arial", 10), fg="blue")
+        lbl_status.pack(pady=10)
+        
+        # Botão clean e discreto
+        btn_confirmar = ttk.Button(main_frame, text="Confirm")
+        btn_confirmar.pack(pady=15)
+        
+        teclas_pressionadas = set()
+        modificadores_pressionados = set()
+        
+        def on_key_press(e):
+            tecla = e.keysym
+            
+            teclas_modificadoras = {
+                'Control_L': 'Ctrl', 'Control_R': 'Ctrl',
+                'Alt_L': 'Alt', 'Alt_R': 'Alt', 
+                'Shift_L': 'Shift', 'Shift_R': 'Shift'
+            }
+            
+            if tecla in teclas_modificadoras:
+                modificador = teclas_modificadoras[tecla]
+                modificadores_pressionados.add(modificador)
+            else:
+                teclas_pressionadas.add(tecla)
+            
+            modificadores_list = list(modificadores_pressionados)
+            teclas_list = list(teclas_pressionadas)
+            
+            if modificadores_list and teclas_list:
+                tecla_completa = " + ".join(modificadores_list + teclas_list)
+            elif modificadores_list:
+                tecla_completa = " + ".join(modificadores_list)
+            elif teclas_list:
+                tecla_completa = " + ".join(teclas_list)
+            else:
+                tecla_completa = ""
+            
+            self.tecla_atual = tecla_completa
+            lbl_status.config(text=f"Key: {tecla_completa}")
+        
+        def on_key_release(e):
+            tecla = e.keysym
+            teclas_modificadoras = {
+                'Control_L': 'Ctrl', 'Control_R': 'Ctrl',
+                'Alt_L': 'Alt', 'Alt_R': 'Alt', 
+                'Shift_L': 'Shift', 'Shift_R': 'Shift'
+            }
+            
+            if tecla in teclas_modificadoras:
+                modificador = teclas_modificadoras[tecla]
+                modificadores_pressionados.discard(modificador)
+            else:
+                teclas_pressionadas.discard(tecla)
+        
+        def finalizar_deteccao():
+            dialog.destroy()
+            self.aguardando_tecla = False
+            if self.tecla_atual and 0 <= index < len(self.modelo):
+                self.modelo.atualizar(index, acao=self.tecla_atual)
+        
+        # Configurar o botão
+        btn_confirmar.config(command=finalizar_deteccao)
+        
+        # Vincular eventos
+        dialog.bind('<KeyPress>', on_key_press)
+        dialog.bind('<KeyRelease>', on_key_release)
+        
+        dialog.focus_set()
+        # Proteção: passar lambda evita execução acidental
+        dialog.protocol("WM_DELETE_WINDOW", lambda: finalizar_deteccao())
+
+
+    def finalizar_deteccao_tecla(self, index):
+        """Finaliza a detecção de tecla e atualiza a etapa"""
+        self.aguardando_tecla = False
+        if self.tecla_atual and 0 <= index < len(self.modelo):
+            self.modelo.atualizar(index, acao=self.tecla_atual)
+    
+    def atualizar_tempo_etapa(self, index, tempo):
+        """Atualiza o tempo de uma etapa"""
+        if 0 <= index < len(self.macro_atual["etapas"]):
+            if self.validar_numero(tempo):
+                self.modelo.atualizar(index, tempo=tempo)
+            else:
+                messagebox.showerror("Error", "Time must be a number!")
+    
+    def mover_etapa(self, index, direcao):
+        """Move uma etapa para cima ou para baixo"""
+        novo_index = index + direcao
+        if 0 <= novo_index < len(self.modelo):
+            # Abertura e fim do mesmo bloco não podem trocar de lugar
+            if self.modelo.par_bloco(index) == novo_index:
+                return
+            # Trocar posições
+            self.modelo.mover(index, novo_index)
+    
+    
+
+    def editar_etapa(self, index):
+        """Abre editor manual para a etapa (fallback) e para os tempos próprios dela"""
+        etapa = self.macro_atual["etapas"][index]
+        if etapa.get("tipo") in (TIPO_BLOCO, TIPO_FIM_BLOCO):
+            self.configurar_bloco(index)
+            return
+        if etapa.get("tipo") == TIPO_CHAMADA:
+            self.configurar_chamada(index)
+            return
+        
+        dialog, main_frame = self.criar_dialogo_padrao("Edit Action Manually", 400, 300)
+        
+        tk.Label(main_frame, text="Enter action manually:", 
+                font=("Arial", 11)).pack(pady=15)
+        
+        entry_acao = ttk.Entry(main_frame, width=30, font=("Arial", 10))
+        entry_acao.insert(0, etapa["acao"])
+        entry_acao.pack(pady=10)
+        entry_acao.select_range(0, tk.END)
+        entry_acao.focus_set()
+        
+        # Tempos da etapa (vazio = usar os do macro)
+        if etapa.get("tipo") == "mouse":
+            chave_duracao, texto_duracao = "tempo_movimento", "Travel time:"
+        else:
+            chave_duracao, texto_duracao = "tempo_pressionar", "Hold time:"
+        campos = [(chave_duracao, texto_duracao), ("pausa_repeticao_etapa", "Repeat gap:")]
+        
+        tempos_frame = ttk.Frame(main_frame)
+        tempos_frame.pack(pady=5)
+        entradas = {}
+        for linha, (chave, texto) in enumerate(campos):
+            ttk.Label(tempos_frame, text=texto).grid(row=linha, column=0, padx=5, pady=3, sticky="w")
+            entrada = ttk.Entry(tempos_frame, width=8)
+            entrada.insert(0, str(etapa.get(chave, "")))
+            entrada.grid(row=linha, column=1, padx=5, pady=3)
+            ttk.Label(tempos_frame, text="s (empty = macro default)", foreground="gray").grid(
+                row=linha, column=2, padx=5, pady=3, sticky="w")
+            entradas[chave] = entrada
+        
+        def confirmar_edicao():
+            nova_acao = entry_acao.get().strip()
+            if not nova_acao:
+                return
+            tempos = {}
+            for chave, texto in campos:
+                valor = entradas[chave].get().strip()
+                try:
+                    tempos[chave] = ler_tempo({chave: valor}, chave, None, texto.rstrip(":").lower())
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e).capitalize(), parent=dialog)
+                    return
+            # Tempos vazios (None) são removidos da etapa, que volta a usar os do macro
+            self.modelo.atualizar(index, acao=nova_acao, **tempos)
+            dialog.destroy()
+        
+        # Botões — APENAS "Confirm"
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(side=tk.BOTTOM, pady=10)
+        
+        ttk.Button(buttons_frame, text="Confirm", command=confirmar_edicao).pack(side=tk.LEFT, padx=5)
+        
+        # Permitir fechar com Enter ou X
+        entry_acao.bind('<Return>', lambda e: confirmar_edicao())
+        dialog.protocol("WM_DELETE_WINDOW", lambda: dialog.destroy())
+
+    def remover_etapa(self, index):
+        """Remove uma etapa"""
+        if 0 <= index < len(self.modelo):
+            # Remover a abertura ou o fim desfaz o bloco (as etapas dentro ficam)
+            par = self.modelo.par_bloco(index)
+            if par is not None:
+                self.modelo.remover(max(index, par))
+                self.modelo.remover(min(index, par))
+            else:
+                self.modelo.remover(index)
+    
+    def atualizar_preview(self):
+        """Atualiza o preview do teclado"""
+        self.label_preview.config(text="PT/BR Keyboard - Layout detected ✓\nClick on an action box and press the desired keys")
+    
+    def carregar_arquivo(self):
+        """Carrega arquivo de macro"""
+        arquivo = filedialog.askopenfilename(
+            title="Load Macro",
+            filetypes=[("Arquivos JSON", "*.json"), ("Todos os arquivos", "*.*")]
+        )
+        if arquivo:
+            try:
+                with open(arquivo, "r", encoding="utf-8") as f:
+                    macro_carregado = json.load(f)
+                
+                nome = macro_carregado.get("nome", "Imported Macro")
+                self.macro_atual = macro_carregado
+                self.modelo.redefinir(self.macro_atual.setdefault("etapas", []))
+                self.entry_nome.delete(0, tk.END)
+                self.entry_nome.insert(0, nome)
+                self.spin_repeticoes.set(self.macro_atual.get("repeticoes", 1))
+                self.combo_modo_tempo.set(self.macro_atual.get("modo_tempo", "steady"))
+                self.atualizar_interface_tempo()
+                self.carregar_velocidade()
+                
+                messagebox.showinfo("Success", f"Macro '{nome}' carregado com sucesso!")
+                
+            except Exception as e:
+                messagebox.showerror("Error", f"Error loading file: {e}")
+    
+    def carregar_macro_selecionado(self, event=None):
+        """Carrega o macro selecionado no combobox"""
+        nome = self.combo_macros.get()
+        try:
+            macro = self.biblioteca.carregar(nome)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error loading macro: {e}")
+            return
+        if macro is not None:
+            self.macro_atual = macro
+            self.modelo.redefinir(self.macro_atual.setdefault("etapas", []))
+            self.entry_nome.delete(0, tk.END)
+            self.entry_nome.insert(0, nome)
+            self.spin_repeticoes.set(self.macro_atual.get("repeticoes", 1))
+            self.combo_modo_tempo.set(self.macro_atual.get("modo_tempo", "steady"))
+            self.atualizar_interface_tempo()
+            self.carregar_velocidade()
+            self.var_repetir_acoes.set(self.macro_atual.get("repetir_acoes", False))
+            self.atualizar_interface_repeticao()
+            self.preparar_plano()
+
+    def novo_macro(self):
+        """Cria um novo macro"""
+        self.macro_atual = {"nome": "New Macro", "etapas": [], "repeticoes": 1, "modo_tempo": "steady", "tempo_fixo": "0.3"}
+        self.modelo.redefinir(self.macro_atual["etapas"])
+        self.entry_nome.delete(0, tk.END)
+        self.entry_nome.insert(0, "New Macro")
+        self.spin_repeticoes.set(1)
+        self.combo_modo_tempo.set("steady")
+        self.atualizar_interface_tempo()
+        self.carregar_velocidade()
+
+    def carregar_velocidade(self):
+        """Mostra a escala de tempo, o modo de velocidade máxima e a prioridade do macro atual"""
+        self.entry_escala_tempo.delete(0, tk.END)
+        self.entry_escala_tempo.insert(0, str(self.macro_atual.get("escala_tempo", "1.0")))
+        self.var_velocidade_maxima.set(self.macro_atual.get("velocidade_maxima", False))
+        self.spin_prioridade.set(self.macro_atual.get("prioridade", 0))
+    
+    def configurar_tempos_macro(self):
+        """Diálogo das pausas fixas do macro (as etapas podem substituí-las)"""
+        dialog, main_frame = self.criar_dialogo_padrao("Macro Timing", 400, 300)
+        
+        campos = [
+            ("tempo_pressionar", "Key hold time:", TEMPO_PRESSIONAR),
+            ("tempo_movimento", "Mouse travel time:", TEMPO_MOVIMENTO),
+            ("pausa_repeticao_etapa", "Gap between step repeats:", PAUSA_REPETICAO_ETAPA),
+            ("pausa_repeticoes", "Gap between repetitions:", PAUSA_REPETICOES),
+        ]
+        campos_frame = ttk.Frame(main_frame)
+        campos_frame.pack(fill=tk.X, pady=10)
+        entradas = {}
+        for linha, (chave, texto, padrao) in enumerate(campos):
+            ttk.Label(campos_frame, text=texto).grid(row=linha, column=0, padx=5, pady=5, sticky="w")
+            entrada = ttk.Entry(campos_frame, width=8)
+            entrada.insert(0, str(self.macro_atual.get(chave, padrao)))
+            entrada.grid(row=linha, column=1, padx=5, pady=5)
+            ttk.Label(campos_frame, text="seconds").grid(row=linha, column=2, padx=5, pady=5, sticky="w")
+            entradas[chave] = entrada
+        
+        def aplicar():
+            valores = {}
+            for chave, texto, padrao in campos:
+                try:
+                    valores[chave] = ler_tempo({chave: entradas[chave].get().strip()}, chave, padrao,
+                                               texto.rstrip(":").lower())
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e).capitalize(), parent=dialog)
+                    return
+            for chave, texto, padrao in campos:
+                # Valores iguais ao padrão não são gravados no macro
+                if valores[chave] == padrao:
+                    self.macro_atual.pop(chave, None)
+                else:
+                    self.macro_atual[chave] = valores[chave]
+            dialog.destroy()
+        
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(side=tk.BOTTOM, pady=10)
+        ttk.Button(buttons_frame, text="Confirm", command=aplicar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def editar_nome_macro(self):
+        """Permite editar o nome do macro atual"""
+        dialog, main_frame = self.criar_dialogo_padrao("Edit Macro Name", 400, 200)
+        
+        tk.Label(main_frame, text="New name for the macro:", 
+                font=("Arial", 11)).pack(pady=15)
+        
+        entry_nome = ttk.Entry(main_frame, width=30, font=("Arial", 10))
+        entry_nome.insert(0, self.entry_nome.get())
+        entry_nome.pack(pady=10)
+        entry_nome.select_range(0, tk.END)
+        entry_nome.focus_set()
+        
+        def confirmar_nome():
+            novo_nome = entry_nome.get().strip()
+            if novo_nome:
+                self.entry_nome.delete(0, tk.END)
+                self.entry_nome.insert(0, novo_nome)
+                dialog.destroy()
+            else:
+                messagebox.showerror("Error", "Name cannot be empty!")
+        
+        # Botões — APENAS "Confirm"
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(side=tk.BOTTOM, pady=10)
+        
+        ttk.Button(buttons_frame, text="Confirm", command=confirmar_nome).pack(side=tk.LEFT, padx=5)
+        
+        entry_nome.bind('<Return>', lambda e: confirmar_nome())
+        dialog.protocol("WM_DELETE_WINDOW", lambda: dialog.destroy())
+
+    
+    def excluir_macro(self):
+        """Exclui o macro selecionado"""
+        nome = self.combo_macros.get()
+        if nome in self.biblioteca:
+            if messagebox.askyesno("Confirm", f"Delete macro '{nome}'?"):
+                try:
+                    self.biblioteca.excluir(nome)
+                    self.cache_planos.invalidar(nome)
+                    if self.atalho_depende(nome):
+                        self.preparar_atalhos()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error deleting macro: {e}")
+                    return
+                self.combo_macros.set('')
+                self.novo_macro()
+    
+    def salvar_macro_atual(self):
+        """Salva o macro atual"""
+        nome = self.entry_nome.get().strip()
+        if not nome:
+            messagebox.showerror("Error", "Enter a name for the macro!")
+            return
+        
+        # Atualizar dados atuais
+        self.macro_atual["nome"] = nome
+        self.macro_atual["repeticoes"] = int(self.spin_repeticoes.get())
+        self.macro_atual["modo_tempo"] = self.combo_modo_tempo.get()
+        self.macro_atual["tempo_fixo"] = self.entry_tempo_fixo.get()
+        self.macro_atual["repetir_acoes"] = self.var_repetir_acoes.get()
+        self.macro_atual["escala_tempo"] = self.entry_escala_tempo.get()
+        self.macro_atual["velocidade_maxima"] = self.var_velocidade_maxima.get()
+        self.macro_atual["prioridade"] = self.spin_prioridade.get()
+
+        # Um macro não pode chamar, direta ou indiretamente, a si mesmo
+        try:
+            ciclo = encontrar_ciclo(self.macro_atual, self.biblioteca.carregar)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error checking macro calls: {e}")
+            return
+        if ciclo:
+            messagebox.showerror("Error", f"Macro calls form a cycle: {' → '.join(ciclo)}")
+            return
+        
+        # Cada macro é gravado em sua própria transação
+        try:
+            self.biblioteca.salvar(nome, self.macro_atual)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving macros: {e}")
+            return
+        
+        # Os planos de quem chama este macro ficam desatualizados
+        self.cache_planos.invalidar(nome)
+        self.combo_macros.set(nome)
+        if self.atalho_depende(nome):
+            self.preparar_atalhos()
+        messagebox.showinfo("Success", f"Macro '{nome}' salvo com sucesso!")
+    
+    def parametros_execucao(self):
+        """Parâmetros de compilação definidos na interface para o macro atual"""
+        return {
+            "repeticoes": self.spin_repeticoes.get(),
+            "modo_tempo": self.combo_modo_tempo.get(),
+            "tempo_fixo": self.entry_tempo_fixo.get(),
+            "tempo_min": self.entry_tempo_min.get(),
+            "tempo_max": self.entry_tempo_max.get(),
+            "escala_tempo": self.entry_escala_tempo.get(),
+            "velocidade_maxima": self.var_velocidade_maxima.get(),
+        }
+
+    def preparar_plano(self):
+        """Compila o macro atual no cache, para que o início da execução seja imediato"""
+        try:
+            self.cache_planos.obter(self.macro_atual, self.biblioteca.carregar, **self.parametros_execucao())
+        except ValueError:
+            pass    # o erro é mostrado quando o macro for executado
+
+    def preparar_atalhos(self):
+        """Compila os macros vinculados a hotkeys, para que a hotkey inicie a execução na hora
+
+        Usa as configurações salvas de cada macro (não as da interface).
+        """
+        prontos = {}
+        for hotkey, nome in self.atalhos_macros.items():
+            try:
+                macro = self.biblioteca.carregar(nome)
+                if macro is None:
+                    self.atualizar_log(f"⚠️ Hotkey {hotkey}: macro '{nome}' not found")
+                    continue
+                plano = self.cache_planos.obter(macro, self.biblioteca.carregar)
+                prontos[hotkey] = (plano, ler_prioridade(macro), resolver_nivel_log(self.nivel_log, plano))
+            except Exception as e:
+                self.atualizar_log(f"⚠️ Hotkey {hotkey}: macro '{nome}' is invalid: {e}")
+        # Troca de uma vez: a thread do keyboard nunca vê um dicionário pela metade
+        self.atalhos_prontos = prontos
+
+    def atalho_depende(self, nome):
+        """Verdadeiro se alguma hotkey executa o macro `nome` ou um macro que o chama"""
+        return (nome in self.atalhos_macros.values()
+                or any(nome in plano.chamados for plano, _, _ in self.atalhos_prontos.values()))
+
+    def configurar_atalhos_macros_dialog(self):
+        """Diálogo para vincular macros salvos a hotkeys globais"""
+        dialog, main_frame = self.criar_dialogo_padrao("Macro Hotkeys", 460, 360)
+
+        tk.Label(main_frame, text="Each hotkey starts its macro directly, with the macro's saved settings",
+                 font=("Arial", 9), fg="gray").pack(anchor="w")
+        lista = tk.Listbox(main_frame, height=8, font=("Arial", 9))
+        lista.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        def atualizar_lista():
+            lista.delete(0, tk.END)
+            for hotkey, nome in sorted(self.atalhos_macros.items()):
+                lista.insert(tk.END, f"{hotkey}  →  {nome}")
+
+        campos = ttk.Frame(main_frame)
+        campos.pack(fill=tk.X, pady=5)
+        ttk.Label(campos, text="Hotkey:").grid(row=0, column=0, sticky="w", padx=2)
+        entry_hotkey = ttk.Entry(campos, width=18)
+        entry_hotkey.grid(row=0, column=1, padx=2)
+        ttk.Button(campos, text="Detect", width=8,
+                   command=lambda: self.detectar_hotkey(entry_hotkey)).grid(row=0, column=2, padx=2)
+        ttk.Label(campos, text="Macro:").grid(row=1, column=0, sticky="w", padx=2, pady=5)
+        combo_macro = ttk.Combobox(campos, width=30)
+        combo_macro.configure(postcommand=lambda: combo_macro.configure(
+            values=self.biblioteca.buscar(combo_macro.get(), LIMITE_BUSCA)))
+        combo_macro.grid(row=1, column=1, columnspan=2, sticky="ew", padx=2, pady=5)
+        combo_macro.set(self.entry_nome.get().strip())
+
+        def vincular():
+            hotkey = entry_hotkey.get().strip().lower()
+            nome = combo_macro.get().strip()
+            if not hotkey or not nome:
+                messagebox.showerror("Error", "Enter a hotkey and a macro!", parent=dialog)
+                return
+            globais = {self.hotkey_iniciar, self.hotkey_parar, self.hotkey_pausar,
+                       self.hotkey_gravar, self.hotkey_captura_mouse}
+            if hotkey in globais:
+                messagebox.showerror("Error", f"'{hotkey}' is already used by a global hotkey", parent=dialog)
+                return
+            if nome not in self.biblioteca:
+                messagebox.showerror("Error", f"Macro '{nome}' is not saved", parent=dialog)
+                return
+            self.atalhos_macros[hotkey] = nome
+            aplicar()
+
+        def remover():
+            selecao = lista.curselection()
+            if not selecao:
+                return
+            hotkey = sorted(self.atalhos_macros)[selecao[0]]
+            del self.atalhos_macros[hotkey]
+            aplicar()
+
+        def aplicar():
+            self.preparar_atalhos()
+            self.configurar_hotkeys()
+            self.salvar_configuracoes_globais()
+            atualizar_lista()
+
+        botoes = ttk.Frame(main_frame)
+        botoes.pack(side=tk.BOTTOM, pady=(5, 0))
+        ttk.Button(botoes, text="Bind", command=vincular).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botoes, text="Remove Selected", command=remover).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botoes, text="Close", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        atualizar_lista()
+
+    def iniciar_execucao(self, paralela=False, medicao=None):
+        """Inicia a execução do macro
+
+        Com `paralela`, o macro roda ao lado das execuções em curso (que
+        podem ser do mesmo macro); sem ela, apenas se o START estiver livre.
+        `medicao` vem da hotkey de início; pelos botões, o gatilho é agora.
+        """
+        if medicao is None:
+            medicao = MedicaoLatencia(self.latencias)
+        medicao.marcar(ATENDIDO)
+        if self.gravador is not None or (self.executando and not paralela):
+            return
+        
+        if not self.macro_atual["etapas"]:
+            messagebox.showerror("Error", "Add steps before executing!")
+            return
+        
+        # Compilar o macro com as configurações atuais da interface (ou reutilizar o plano)
+        inicio = time.perf_counter()
+        acertos = self.cache_planos.acertos
+        try:
+            plano = self.cache_planos.obter(self.macro_atual, self.biblioteca.carregar,
+                                            **self.parametros_execucao())
+            prioridade = ler_prioridade({"prioridade": self.spin_prioridade.get()})
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid macro: {e}")
+            return
+        medicao.marcar(PLANO)
+        preparo = "cached" if self.cache_planos.acertos > acertos else "compiled"
+        self.atualizar_log(f"📦 Plan {preparo} in {(time.perf_counter() - inicio) * 1000:.1f} ms "
+                           f"({formatar_estatisticas(self.cache_planos.estatisticas())})")
+        
+        # Cada execução roda em sua própria thread e só se comunica pelo registro e pelo canal
+        if not self.gerenciador.listar():
+            self.linhas_tempo = []
+        # Em pausa, a primeira ação espera a retomada: a medição não faria sentido
+        execucao = self.gerenciador.iniciar(plano, prioridade, ao_registrar=self.atualizar_log,
+                                            nivel_log=resolver_nivel_log(self.nivel_log, plano),
+                                            canal=self.canal, medicao=None if self.pausado else medicao,
+                                            linha_tempo=self.nova_linha_tempo(plano))
+        if self.pausado:
+            execucao.executor.pausar()
+        self.btn_parar.config(state="normal")
+        self.btn_pausar.config(state="normal")
+        if not self.executando:
+            self.executando = True
+            self.executor = execucao.executor
+            self.total_etapas = len(self.modelo)
+            self.btn_iniciar.config(state="disabled")
+            if not self.pausado:
+                self.label_status.config(text="Status: Running...", fg="green")
+        self.atualizar_lista_execucoes()
+    
+    def parar_execucao(self):
+        """Para todas as execuções (em curso e na fila)"""
+        if not self.gerenciador.listar():
+            return
+        self.gerenciador.parar_todas()
+        # Os botões voltam quando as threads publicarem a conclusão
+        self.btn_parar.config(state="disabled")
+        self.btn_pausar.config(state="disabled")
+        self.label_status.config(text="Status: Stopping...", fg="red")
+
+    def parar_execucao_selecionada(self):
+        """Para apenas a execução selecionada na lista"""
+        selecao = self.lista_execucoes.curselection()
+        if not selecao:
+            return
+        execucoes = self.gerenciador.listar()
+        if selecao[0] < len(execucoes):
+            self.gerenciador.parar(execucoes[selecao[0]])
+    
+    def alternar_pausa(self):
+        """Pausa todas as execuções em curso ou retoma as pausadas"""
+        if not self.gerenciador.listar():
+            return
+        if self.pausado:
+            self.pausado = False
+            self.gerenciador.retomar_todas()
+            self.btn_pausar.config(text="⏸️ PAUSE")
+            self.label_status.config(text="Status: Running...", fg="green")
+        else:
+            self.pausado = True
+            self.gerenciador.pausar_todas()
+            self.btn_pausar.config(text="▶️ RESUME")
+            self.label_status.config(text="Status: Paused", fg="orange")
+
+    def atualizar_lista_execucoes(self):
+        """Mostra as execuções em curso e na fila"""
+        self.lista_execucoes.delete(0, tk.END)
+        for execucao in self.gerenciador.listar():
+            self.lista_execucoes.insert(tk.END, f"#{execucao.numero} {execucao.nome or 'Macro'} — "
+                                                f"{execucao.estado}, priority {execucao.prioridade}")
+    
+    def alternar_gravacao(self, por_hotkey=False):
+        """Inicia a gravação ou a encerra, acrescentando as etapas gravadas ao macro"""
+        if self.gravador is None:
+            # Gravar durante uma execução capturaria a própria entrada injetada
+            if self.gerenciador.listar():
+                return
+            self.gravador = Gravador()
+            try:
+                self.gravador.iniciar()
+            except Exception as e:
+                self.gravador = None
+                messagebox.showerror("Error", f"Unable to start recording: {e}")
+                return
+            if self.gravador.aviso:
+                self.atualizar_log(f"⚠️ {self.gravador.aviso}")
+            self.btn_gravar.config(text="⏹️ Stop Recording")
+            self.btn_iniciar.config(state="disabled")
+            self.label_status.config(text=f"Status: Recording... ({self.hotkey_gravar} to stop)", fg="red")
+            return
+        
+        gravador, self.gravador = self.gravador, None
+        eventos = gravador.parar()
+        # Sem a hotkey ou o clique que encerrou a gravação
+        etapas = converter_gravacao(eventos, gravador.posicao_inicial,
+                                    movimentos=self.var_gravar_movimentos.get(),
+                                    teclas_finais=self.hotkey_gravar.split("+") if por_hotkey else (),
+                                    descartar_clique=not por_hotkey)
+        self.btn_gravar.config(text="⏺️ Record")
+        self.btn_iniciar.config(state="normal")
+        self.label_status.config(text="Status: Ready", fg="blue")
+        
+        if self.var_gravar_movimentos.get():
+            # Milhares de movimentos viram poucos pontos de passagem
+            etapas = simplificar_movimentos(etapas)
+        mensagem = f"⏺️ Recorded {len(etapas)} steps from {len(eventos)} events"
+        if gravador.descartados:
+            mensagem += f" ({gravador.descartados} oldest events dropped: buffer full)"
+        self.atualizar_log(mensagem)
+        if etapas:
+            self.modelo.inserir(len(self.modelo), *etapas)
+            # Os tempos gravados só valem no modo personalizado
+            self.combo_modo_tempo.set("personalized")
+            self.atualizar_interface_tempo()
+            self.tabela_etapas.mostrar_etapa(len(self.modelo) - 1)
+    
+    def simplificar_movimentos_macro(self):
+        """Reduz as sequências de etapas "move" do macro a poucos pontos de passagem"""
+        antes = len(self.modelo)
+        inicio = time.perf_counter()
+        try:
+            tempo_movimento = ler_tempo(self.macro_atual, "tempo_movimento", TEMPO_MOVIMENTO, "travel time")
+            etapas = simplificar_movimentos(self.macro_atual["etapas"], tempo_movimento=tempo_movimento)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid macro: {e}")
+            return
+        duracao = time.perf_counter() - inicio
+        if len(etapas) == antes:
+            self.atualizar_log("〰️ No mouse moves to simplify")
+            return
+        self.macro_atual["etapas"] = etapas
+        self.modelo.redefinir(etapas)
+        self.atualizar_log(f"〰️ Simplified moves: {antes} → {len(etapas)} steps in {duracao * 1000:.1f} ms")
+    
+    def pedir_inicio(self):
+        """Hotkey de início: roda na thread do keyboard, então só publica o pedido"""
+        self.canal.publicar(INICIAR, MedicaoLatencia(self.latencias))
+    
+    def pedir_parada(self):
+        """Hotkey de parada: interrompe já as execuções e avisa a interface pelo canal"""
+        self.gerenciador.parar_todas()
+        self.canal.publicar(PARAR)
+    
+    def disparar_atalho(self, hotkey):
+        """Hotkey de um macro: inicia o plano já compilado direto na thread do keyboard
+
+        Não passa pela interface nem lê a biblioteca; a interface só é
+        avisada depois, pelo canal.
+        """
+        medicao = MedicaoLatencia(self.latencias)
+        pronto = self.atalhos_prontos.get(hotkey)
+        if pronto is None or self.gravador is not None:
+            return
+        plano, prioridade, nivel_log = pronto
+        # Como o START: o mesmo macro não é iniciado de novo enquanto roda
+        if any(execucao.executor.plano is plano for execucao in self.gerenciador.listar()):
+            return
+        # Sem fila nem compilação: o plano já estava pronto
+        medicao.marcar(ATENDIDO)
+        medicao.marcar(PLANO)
+        execucao = self.gerenciador.iniciar(plano, prioridade, ao_registrar=self.atualizar_log,
+                                            nivel_log=nivel_log, canal=self.canal,
+                                            medicao=None if self.pausado else medicao,
+                                            linha_tempo=self.nova_linha_tempo(plano))
+        self.canal.publicar(INICIADA, (hotkey, execucao))
+    
+    def nova_linha_tempo(self, plano):
+        """LinhaTempo para uma nova execução, se a opção estiver marcada (qualquer thread)"""
+        return LinhaTempo(plano.nome) if self.gravar_linha_tempo else None
+    
+    def alternar_linha_tempo(self):
+        # Copiado para um atributo simples: as hotkeys dos macros o leem fora da thread do Tk
+        self.gravar_linha_tempo = self.var_linha_tempo.get()
+    
+    def exportar_linha_tempo(self):
+        """Grava as linhas do tempo das últimas execuções em um arquivo Chrome Trace"""
+        if not self.linhas_tempo:
+            messagebox.showinfo("Timeline", "Check \"📈 Timeline\" and run a macro first.")
+            return
+        arquivo = filedialog.asksaveasfilename(
+            title="Export Timeline",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json"), ("Todos os arquivos", "*.*")]
+        )
+        if not arquivo:
+            return
+        try:
+            exportar_trace(self.linhas_tempo, arquivo)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error writing timeline: {e}")
+            return
+        self.atualizar_log(f"📈 Timeline of {len(self.linhas_tempo)} run(s) written to {arquivo} "
+                           f"(open it in chrome://tracing or ui.perfetto.dev)")
+    
+    def pedir_gravacao(self):
+        """Hotkey de gravação: alternada na thread principal"""
+        self.canal.publicar(GRAVAR)
+    
+    def pedir_pausa(self):
+        """Hotkey de pausa: a interface e o executor são atualizados na thread principal"""
+        self.canal.publicar(PAUSAR)
+    
+    def finalizar_execucao(self, executor, resumo):
+        """Restaura a interface após a conclusão (ou parada) de uma execução"""
+        if executor.linha_tempo is not None:
+            self.linhas_tempo.append(executor.linha_tempo)
+            self.atualizar_log(f"[{executor.plano.nome}] {formatar_linha_tempo(executor.linha_tempo.resumo())}")
+        # A conclusão é publicada antes de a execução sair da lista do gerenciador
+        restantes = [e for e in self.gerenciador.listar() if e.executor is not executor]
+        self.atualizar_lista_execucoes()
+        if not restantes:
+            self.pausado = False
+            self.btn_parar.config(state="disabled")
+            self.btn_pausar.config(state="disabled", text="⏸️ PAUSE")
+        if executor is not self.executor:
+            return
+        self.executando = False
+        self.executor = None
+        self.btn_iniciar.config(state="normal")
+        if resumo is None:
+            self.label_status.config(text="Status: Error", fg="red")
+        elif resumo["concluido"]:
+            self.label_status.config(text="Status: Completed ✓", fg="darkgreen")
+        else:
+            self.label_status.config(text="Status: Stopped", fg="red")
+    
+    def processar_eventos(self):
+        """Timer da thread principal: aplica os eventos do canal e exibe o log"""
+        progresso = None
+        for evento in self.canal.drenar():
+            if evento.tipo == PROGRESSO:
+                # Só o progresso mais recente da execução do START interessa
+                if evento.dados[0] is self.executor:
+                    progresso = evento.dados[1:]
+            elif evento.tipo == STATUS:
+                executor, texto = evento.dados
+                if executor is self.executor:
+                    cor = "orange" if texto == "Paused" else "green"
+                    self.label_status.config(text=f"Status: {texto}", fg=cor)
+            elif evento.tipo == CONCLUSAO:
+                progresso = None
+                self.finalizar_execucao(*evento.dados)
+            elif evento.tipo == INICIAR:
+                self.iniciar_execucao(medicao=evento.dados)
+            elif evento.tipo == PARAR:
+                self.parar_execucao()
+            elif evento.tipo == PAUSAR:
+                self.alternar_pausa()
+            elif evento.tipo == GRAVAR:
+                self.alternar_gravacao(por_hotkey=True)
+            elif evento.tipo == INICIADA:
+                hotkey, execucao = evento.dados
+                # Primeira execução desde a interface parada: começa um novo conjunto de linhas do tempo
+                if self.gerenciador.listar() == [execucao]:
+                    self.linhas_tempo = []
+                self.atualizar_log(f"⌨️ {hotkey}: {execucao.nome}")
+                if self.pausado:
+                    execucao.executor.pausar()
+                # Uma execução curta pode ter terminado antes deste aviso
+                if execucao.executor.executando:
+                    self.btn_parar.config(state="normal")
+                    self.btn_pausar.config(state="normal")
+                self.atualizar_lista_execucoes()
+        if progresso is not None and self.executor is not None and not self.executor.pausado:
+            repeticao, repeticoes, etapa = progresso
+            self.label_status.config(text=f"Status: Running... repetition {repeticao}/{repeticoes}, "
+                                          f"step {etapa}/{self.total_etapas}", fg="green")
+        if self.latencias.versao != self.versao_latencias:
+            self.atualizar_latencias()
+        self.descarregar_log()
+        self.janela.after(INTERVALO_EVENTOS_MS, self.processar_eventos)
+    
+    def atualizar_latencias(self):
+        """Exibe os percentis da latência de início e guarda as amostras"""
+        primeira_vez = self.versao_latencias is None
+        self.versao_latencias = self.latencias.versao
+        self.label_latencia.config(text=formatar_latencia(self.latencias.resumo()))
+        if primeira_vez:
+            return
+        try:
+            self.latencias.salvar(ARQUIVO_LATENCIAS)
+        except OSError as e:
+            print(f"Error saving latencies: {e}")
+    
+    def atualizar_log(self, mensagem):
+        """Acrescenta uma mensagem ao log (pode ser chamado de qualquer thread)"""
+        self.registro.registrar(mensagem)
+    
+    def descarregar_log(self):
+        """Exibe de uma vez as mensagens acumuladas e mantém o limite de linhas"""
+        lote = self.registro.coletar()
+        if lote:
+            self.text_log.insert(tk.END, "\n".join(lote) + "\n")
+            # Descartar as linhas mais antigas além do limite
+            linhas = int(self.text_log.index("end-1c").split(".")[0]) - 1
+            excesso = linhas - self.registro.limite
+            if excesso > 0:
+                self.text_log.delete("1.0", f"{excesso + 1}.0")
+            self.text_log.see(tk.END)
+    
+    def alterar_nivel_log(self, event=None):
+        """Altera o nível de detalhe do log (vale a partir da próxima execução)"""
+        self.nivel_log = self.combo_nivel_log.get()
+        self.salvar_configuracoes_globais()
+        self.preparar_atalhos()
+    
+    def executar(self):
+        """Inicia a aplicação"""
+        try:
+            self.janela.mainloop()
+        finally:
+            self.registro.fechar()
@@ -0,0 +1,224 @@
+"""Backends de injeção de entrada usados pelo executor
+
+O executor só conversa com a interface BackendEntrada. Implementações:
+
+- BackendSistema: keyboard + pyautogui (comportamento original)
+- BackendMemoria: apenas grava os eventos em uma lista (testes e benchmarks)
+- BackendXTest: injeta direto no servidor X pela extensão XTest (python-xlib),
+  acumulando os eventos e enviando-os de uma vez em descarregar()
+
+As bibliotecas são importadas no primeiro uso: o pyautogui carrega a pilha
+de screenshot (e o tkinter, via pymsgbox), o que pesa no tempo de início
+de execuções curtas que nem usam o mouse.
+"""
+
+import time
+
+_keyboard = None
+_pyautogui = None
+
+
+def obter_keyboard():
+    """Retorna o módulo keyboard, importando-o no primeiro uso"""
+    global _keyboard
+    if _keyboard is None:
+        import keyboard
+        _keyboard = keyboard
+    return _keyboard
+
+
+def obter_pyautogui():
+    """Retorna o módulo pyautogui, importando-o no primeiro uso"""
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        # O agendador controla todos os tempos; desativa a pausa implícita do pyautogui
+        pyautogui.PAUSE = 0
+        _pyautogui = pyautogui
+    return _pyautogui
+
+
+class BackendEntrada:
+    """Interface de injeção de eventos de teclado e mouse
+
+    Teclas usam os nomes do plano ("ctrl", "enter", "a"); botões são
+    "left", "right" ou "middle". Backends que acumulam eventos só os enviam
+    em descarregar(), chamado pelo executor antes de cada espera.
+
+    `bloqueante` indica se as chamadas podem demorar (movimento animado,
+    E/S): o motor asyncio as envia a uma thread em vez de chamá-las no loop.
+    """
+
+    bloqueante = True
+
+    def pressionar(self, tecla):
+        raise NotImplementedError
+
+    def soltar(self, tecla):
+        raise NotImplementedError
+
+    def mover(self, x, y, duracao=0.0):
+        raise NotImplementedError
+
+    def clicar(self, botao, cliques=1):
+        raise NotImplementedError
+
+    def descarregar(self):
+        """Envia os eventos acumulados (nada a fazer por padrão)"""
+
+    def fechar(self):
+        """Libera os recursos do backend"""
+
+
+class BackendSistema(BackendEntrada):
+    """Injeção pelas bibliotecas keyboard e pyautogui"""
+
+    def pressionar(self, tecla):
+        obter_keyboard().press(tecla)
+
+    def soltar(self, tecla):
+        obter_keyboard().release(tecla)
+
+    def mover(self, x, y, duracao=0.0):
+        obter_pyautogui().moveTo(x, y, duration=duracao)
+
+    def clicar(self, botao, cliques=1):
+        obter_pyautogui().click(button=botao, clicks=cliques)
+
+
+class BackendMemoria(BackendEntrada):
+    """Grava os eventos em memória, sem enviar nada ao sistema
+
+    Cada evento é uma tupla ("pressionar", tecla), ("soltar", tecla),
+    ("mover", x, y) ou ("clicar", botao, cliques). Com `com_tempo`, o
+    instante (time.perf_counter) é acrescentado ao final de cada tupla.
+    """
+
+    bloqueante = False
+
+    def __init__(self, com_tempo=False):
+        self.com_tempo = com_tempo
+        self.eventos = []
+        self.descargas = 0
+
+    def _gravar(self, *evento):
+        if self.com_tempo:
+            evento += (time.perf_counter(),)
+        self.eventos.append(evento)
+
+    def pressionar(self, tecla):
+        self._gravar("pressionar", tecla)
+
+    def soltar(self, tecla):
+        self._gravar("soltar", tecla)
+
+    def mover(self, x, y, duracao=0.0):
+        self._gravar("mover", x, y)
+
+    def clicar(self, botao, cliques=1):
+        self._gravar("clicar", botao, cliques)
+
+    def descarregar(self):
+        self.descargas += 1
+
+
+class BackendXTest(BackendEntrada):
+    """Injeção direta pela extensão XTest do X11 (requer python-xlib)
+
+    Os eventos ficam no buffer de saída do Xlib e vão ao servidor em uma
+    única escrita em descarregar(). O movimento do mouse é instantâneo: a
+    duração planejada é cumprida pelo agendador.
+    Funciona em qualquer display X, inclusive Xvfb (`display=":99"`).
+    """
+
+    # Só escreve no buffer do Xlib (e envia em descarregar): não bloqueia
+    bloqueante = False
+
+    # Nomes de tecla do plano (padrão da biblioteca keyboard) -> keysym do X
+    KEYSYMS = {
+        "ctrl": "Control_L", "control": "Control_L", "left ctrl": "Control_L", "right ctrl": "Control_R",
+        "shift": "Shift_L", "left shift": "Shift_L", "right shift": "Shift_R",
+        "alt": "Alt_L", "left alt": "Alt_L", "right alt": "Alt_R", "alt gr": "ISO_Level3_Shift",
+        "windows": "Super_L", "win": "Super_L", "super": "Super_L", "cmd": "Super_L",
+        "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape",
+        "space": "space", "tab": "Tab", "backspace": "BackSpace", "delete": "Delete", "del": "Delete",
+        "insert": "Insert", "home": "Home", "end": "End",
+        "page up": "Prior", "prior": "Prior", "page down": "Next", "next": "Next",
+        "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+        "caps lock": "Caps_Lock", "caps_lock": "Caps_Lock", "num lock": "Num_Lock",
+        "print screen": "Print", "menu": "Menu",
+    }
+    BOTOES = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self, display=None):
+        try:
+            from Xlib import X, XK
+            from Xlib import display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError:
+            raise RuntimeError("The xtest backend requires python-xlib (pip install python-xlib)")
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        try:
+            self.display = xdisplay.Display(display)
+        except Exception as e:
+            raise RuntimeError(f"Unable to connect to the X display: {e}")
+        if not self.display.has_extension("XTEST"):
+            self.display.close()
+            raise RuntimeError("The X server does not support the XTEST extension")
+        self._keycodes = {}
+
+    def _keycode(self, tecla):
+        """Resolve (e guarda em cache) o keycode de uma tecla"""
+        keycode = self._keycodes.get(tecla)
+        if keycode is None:
+            XK = self._XK
+            nome = self.KEYSYMS.get(tecla, tecla)
+            keysym = XK.string_to_keysym(nome)
+            if not keysym and len(nome) > 1:
+                # Nomes vindos do Tk em minúsculas ("f5", "backspace")
+                keysym = XK.string_to_keysym(nome.capitalize()) or XK.string_to_keysym(nome.upper())
+            if not keysym and len(nome) == 1:
+                keysym = ord(nome)
+            keycode = self.display.keysym_to_keycode(keysym) if keysym else 0
+            if not keycode:
+                raise ValueError(f"unknown key '{tecla}'")
+            self._keycodes[tecla] = keycode
+        return keycode
+
+    def pressionar(self, tecla):
+        self._xtest.fake_input(self.display, self._X.KeyPress, self._keycode(tecla))
+
+    def soltar(self, tecla):
+        self._xtest.fake_input(self.display, self._X.KeyRelease, self._keycode(tecla))
+
+    def mover(self, x, y, duracao=0.0):
+        self._xtest.fake_input(self.display, self._X.MotionNotify, x=x, y=y)
+
+    def clicar(self, botao, cliques=1):
+        numero = self.BOTOES[botao]
+        for _ in range(cliques):
+            self._xtest.fake_input(self.display, self._X.ButtonPress, numero)
+            self._xtest.fake_input(self.display, self._X.ButtonRelease, numero)
+
+    def descarregar(self):
+        self.display.flush()
+
+    def fechar(self):
+        self.display.close()
+
+
+# Backends disponíveis pelo nome (linha de comando)
+BACKENDS = {
+    "system": BackendSistema,
+    "memory": BackendMemoria,
+    "xtest": BackendXTest,
+}
+
+
+def criar_backend(nome="system"):
+    """Cria um backend pelo nome; lança ValueError/RuntimeError se indisponível"""
+    if nome not in BACKENDS:
+        raise ValueError(f"unknown input backend '{nome}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[nome]()
@@ -0,0 +1,41 @@
+"""Canal de eventos entre a execução (ou as hotkeys) e a interface
+
+Threads que não são a do Tk nunca chamam a interface diretamente: publicam
+eventos aqui, e o editor os processa em um timer na thread principal.
+"""
+
+from collections import deque, namedtuple
+
+# Tipos de evento
+PROGRESSO = "progresso"     # dados: (executor, repetição, total de repetições, etapa), contados a partir de 1
+STATUS = "status"           # dados: (executor, texto curto do estado da execução)
+CONCLUSAO = "conclusao"     # dados: (executor, resumo); resumo é None se houve erro
+INICIAR = "iniciar"         # pedido de início (hotkey); dados: MedicaoLatencia
+PARAR = "parar"             # pedido de parada (hotkey)
+PAUSAR = "pausar"           # pedido de pausa ou retomada (hotkey)
+GRAVAR = "gravar"           # pedido de início ou fim da gravação (hotkey)
+INICIADA = "iniciada"       # dados: (hotkey, Execucao) iniciada direto pela hotkey de um macro
+
+Evento = namedtuple("Evento", ["tipo", "dados"])
+
+
+class CanalEventos:
+    """Fila de eventos de uma thread para a thread da interface
+
+    Usa um deque, cujos append() e popleft() são atômicos: quem publica
+    nunca espera por uma trava nem pela interface.
+    """
+
+    def __init__(self):
+        self.fila = deque()
+
+    def publicar(self, tipo, dados=None):
+        self.fila.append(Evento(tipo, dados))
+
+    def drenar(self):
+        """Retorna os eventos publicados até agora, na ordem"""
+        eventos = []
+        fila = self.fila
+        while fila:
+            eventos.append(fila.popleft())
+        return eventos
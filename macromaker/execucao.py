@@ -0,0 +1,362 @@
+"""Execução de planos compilados, sem dependência da interface"""
+
+import random
+import threading
+import time
+from functools import partial
+
+from .agendador import Agendador
+from .entrada import BackendSistema
+from .eventos import CONCLUSAO, PROGRESSO, STATUS
+from .latencia import INICIO, PRIMEIRA_ACAO
+from .plano import TipoOperacao, percorrer_operacoes
+from .registro import NIVEL_ETAPA, NIVEL_RESUMO
+
+
+def formatar_resumo(resumo):
+    """Formata o resumo de atrasos do agendador para o log"""
+    if not resumo["operacoes"]:
+        return "⏱️ No steps executed"
+    return (f"⏱️ {resumo['operacoes']} actions in {resumo['duracao']:.2f} s "
+            f"({resumo['acoes_por_segundo']:.1f} actions/s), lateness avg {resumo['atraso_medio'] * 1000:.2f} ms, "
+            f"max {resumo['atraso_maximo'] * 1000:.2f} ms (step {resumo['etapa_mais_atrasada']}), "
+            f"final drift {resumo['desvio_final'] * 1000:.2f} ms")
+
+
+# Pedidos que o laço do ExecutorAssincrono (ExecucaoPlano.passos) faz ao motor
+RESERVAR = "reservar"   # aguardar o prazo atual e a vez na entrada; responde se pode seguir
+SEGURAR = "segurar"     # aguardar até o prazo dado, interrompido por parada ou pausa
+CHAMAR = "chamar"       # chamar a função dada (acesso ao backend)
+AGUARDAR = "aguardar"   # aguardar o prazo final, atendendo pausas; responde se pode seguir
+
+
+class ExecucaoPlano:
+    """Base dos motores de execução: tudo o que não espera
+
+    Início e fim da execução, o registro de cada operação, o próximo prazo
+    e as chamadas ao backend ficam aqui. Cada motor só percorre o plano e
+    espera à sua maneira: o Executor direto na thread, o ExecutorAssincrono
+    conduzindo passos(), que lhe entrega as esperas como pedidos.
+    """
+
+    def __init__(self, plano, ao_registrar=print, backend=None, nivel_log=NIVEL_ETAPA, canal=None,
+                 arbitro=None, prioridade=0, medicao=None, linha_tempo=None):
+        self.plano = plano
+        self.ao_registrar = ao_registrar
+        self.nivel_log = nivel_log
+        # Decidido uma vez: com o nível baixo, nada é formatado nem entregue por etapa
+        self.detalhar = nivel_log >= NIVEL_ETAPA
+        self.canal = canal
+        self.arbitro = arbitro
+        self.prioridade = prioridade
+        self.medicao = medicao
+        self.linha_tempo = linha_tempo
+        if linha_tempo is not None:
+            # Só com a linha do tempo as chamadas ao backend são cronometradas
+            backend = linha_tempo.cronometrar(backend if backend is not None else BackendSistema())
+        self.backend = backend if backend is not None else BackendSistema()
+        self.executando = True
+        self.pausado = False
+        self.agendador = Agendador()
+
+    def _inicio_pausa(self):
+        if self.canal is not None:
+            self.canal.publicar(STATUS, (self, "Paused"))
+        return time.perf_counter()
+
+    def _fim_pausa(self, inicio_pausa):
+        """Desconta a pausa dos prazos; retorna a duração dela"""
+        pausa = time.perf_counter() - inicio_pausa
+        # O tempo em pausa não consome o intervalo restante
+        self.agendador.deslocar(pausa)
+        if self.executando and self.canal is not None:
+            self.canal.publicar(STATUS, (self, "Running..."))
+        return pausa
+
+    def liberar_entrada(self):
+        if self.arbitro is not None:
+            self.arbitro.liberar()
+
+    def primeira_acao(self):
+        """Entrega a medição de latência na primeira ação enviada (depois, nada faz)"""
+        if self.medicao is not None:
+            self.medicao.marcar(PRIMEIRA_ACAO)
+            self.medicao = None
+
+    def iniciar_execucao(self):
+        """Publica o início e zera o agendador (e a linha do tempo)"""
+        if self.canal is not None:
+            self.canal.publicar(STATUS, (self, "Running..."))
+        self.agendador.iniciar()
+        if self.linha_tempo is not None:
+            self.linha_tempo.iniciar(self.agendador.inicio)
+
+    def iniciar_repeticao(self, repeticao):
+        """Falso se a execução foi parada antes da repetição"""
+        if not self.executando:
+            return False
+        if self.nivel_log >= NIVEL_RESUMO:
+            self.ao_registrar(f"▶️ Repetition {repeticao + 1}/{self.plano.repeticoes}")
+        return True
+
+    def iniciar_operacao(self, repeticao, op):
+        """Marca o atraso da operação que começa agora e publica o progresso"""
+        self.agendador.marcar(op.indice)
+        if self.canal is not None:
+            self.canal.publicar(PROGRESSO, (self, repeticao + 1, self.plano.repeticoes, op.indice + 1))
+        if op.mensagem is not None and self.detalhar:
+            self.ao_registrar(op.mensagem)
+
+    def concluir_operacao(self, repeticao, op, antes):
+        """Registra a operação na linha do tempo e avança o prazo da próxima"""
+        agendador = self.agendador
+        if self.linha_tempo is not None:
+            self.linha_tempo.registrar(repeticao, op, agendador.prazo, agendador.ultimo_atraso, antes)
+        # Próximo prazo: duração da ação + tempo de espera (sorteado no modo random)
+        if op.variacao:
+            agendador.avancar(op.duracao + op.espera + random.random() * op.variacao)
+        else:
+            agendador.avancar(op.duracao + op.espera)
+
+    def concluir_repeticao(self, repeticao):
+        if repeticao < self.plano.repeticoes - 1:
+            self.agendador.avancar(self.plano.pausa_repeticoes)  # Pequena pausa entre repetições
+
+    def concluir_execucao(self, concluido):
+        """Encerra a execução; retorna o resumo de tempos (com "concluido", falso se parada)"""
+        resumir = self.nivel_log >= NIVEL_RESUMO
+        if concluido and resumir:
+            self.ao_registrar("✅ Macro completed!")
+        self.executando = False
+
+        resumo = self.agendador.resumo()
+        resumo["concluido"] = concluido
+        if resumir:
+            self.ao_registrar(formatar_resumo(resumo))
+        return resumo
+
+    def pressionar(self, teclas):
+        """Pressiona as teclas na ordem e envia"""
+        backend = self.backend
+        for tecla in teclas:
+            backend.pressionar(tecla)
+        backend.descarregar()
+
+    def soltar(self, teclas):
+        """Solta as teclas na ordem inversa e envia"""
+        backend = self.backend
+        for tecla in reversed(teclas):
+            backend.soltar(tecla)
+        backend.descarregar()
+
+    def mover_e_clicar(self, op):
+        """Move o mouse até a posição da operação e clica, se houver botão"""
+        backend = self.backend
+        # Mover para a posição primeiro
+        backend.mover(op.x, op.y, op.duracao)
+        # Executar clique (ação "move" não tem botão)
+        if op.botao is not None:
+            backend.clicar(op.botao, op.cliques)
+        backend.descarregar()
+
+    def erro_teclado(self, teclas, erro):
+        self.ao_registrar(f"❌ Error executing keyboard action '{' + '.join(teclas)}': {erro}")
+
+    def erro_mouse(self, op, erro):
+        self.ao_registrar(f"❌ Error executing mouse action '{op.acao_mouse.value}' at ({op.x},{op.y}): {erro}")
+
+    def passos(self):
+        """Gerador do laço de execução: produz (pedido, valor) e retorna o resumo
+
+        A resposta de cada pedido volta por send(); um erro ao atendê-lo volta
+        por throw(), no ponto do pedido.
+        """
+        plano = self.plano
+        agendador = self.agendador
+        self.iniciar_execucao()
+        for repeticao in range(plano.repeticoes):
+            if not self.iniciar_repeticao(repeticao):
+                break
+            # Sem blocos, a tupla do plano é percorrida direto
+            for op in percorrer_operacoes(plano.operacoes) if plano.blocos else plano.operacoes:
+                antes = time.perf_counter()
+                # Aguardar o prazo planejado da operação (e a vez na entrada)
+                if not (yield RESERVAR, None):
+                    break
+                try:
+                    self.iniciar_operacao(repeticao, op)
+                    if op.tipo is TipoOperacao.TECLADO:
+                        yield from self._passos_teclado(op.teclas, agendador.prazo + op.duracao)
+                    else:
+                        try:
+                            yield CHAMAR, partial(self.mover_e_clicar, op)
+                            self.primeira_acao()
+                        except Exception as e:
+                            self.erro_mouse(op, e)
+                finally:
+                    self.liberar_entrada()
+                self.concluir_operacao(repeticao, op, antes)
+            self.concluir_repeticao(repeticao)
+        return self.concluir_execucao(self.executando and (yield AGUARDAR, None))
+
+    def _passos_teclado(self, teclas, prazo_soltar):
+        try:
+            try:
+                yield CHAMAR, partial(self.pressionar, teclas)
+                self.primeira_acao()
+                # Uma parada ou pausa solta as teclas imediatamente
+                yield SEGURAR, prazo_soltar
+            finally:
+                # Nunca deixar teclas presas, mesmo se a execução for interrompida
+                yield CHAMAR, partial(self.soltar, teclas)
+        except Exception as e:
+            self.erro_teclado(teclas, e)
+
+
+class Executor(ExecucaoPlano):
+    """Executa um PlanoExecucao enviando as ações a um backend de entrada
+
+    Não lê nada da interface: tudo vem do plano. As mensagens de progresso
+    são entregues à função `ao_registrar`, filtradas por `nivel_log` (erros
+    são sempre entregues). Com um `canal` (CanalEventos), publica também o
+    progresso, o estado e a conclusão da execução. Sem `backend`, usa o
+    BackendSistema (keyboard/pyautogui). Com um `arbitro` (ArbitroEntrada),
+    cada operação só usa a entrada quando é a vez desta execução, segundo a
+    `prioridade`. Uma `medicao` (MedicaoLatencia) recebe as marcas do início
+    e da primeira ação enviada, e uma `linha_tempo` (LinhaTempo), os tempos
+    de cada operação.
+    """
+
+    def __init__(self, *args, **opcoes):
+        super().__init__(*args, **opcoes)
+        # Sinalizado a cada parada ou pausa, para interromper a espera em curso
+        self.sinal = threading.Event()
+        self.retomada = threading.Event()
+        self.retomada.set()
+
+    def parar(self):
+        """Pede a parada da execução (atendida em milissegundos, mesmo em pausa)
+
+        Pode ser chamado antes de executar(); nesse caso nada é executado.
+        Pode ser chamado de qualquer thread.
+        """
+        self.executando = False
+        self.sinal.set()
+        self.retomada.set()
+        if self.arbitro is not None:
+            self.arbitro.acordar()
+
+    def pausar(self):
+        """Pausa a execução na posição atual (teclas pressionadas são soltas)"""
+        if self.executando and not self.pausado:
+            self.pausado = True
+            self.retomada.clear()
+            self.sinal.set()
+            if self.arbitro is not None:
+                self.arbitro.acordar()
+
+    def retomar(self):
+        """Retoma uma execução pausada, mantendo o tempo que faltava para o próximo prazo"""
+        if self.pausado:
+            self.pausado = False
+            self.retomada.set()
+
+    def aguardar(self):
+        """Aguarda o prazo atual, atendendo pausas; retorna False se a execução foi parada"""
+        while True:
+            # Limpar antes de conferir o estado: uma mudança depois daqui encerra a espera
+            self.sinal.clear()
+            if not self.executando:
+                return False
+            if self.pausado:
+                inicio_pausa = self._inicio_pausa()
+                self.retomada.wait()
+                self._fim_pausa(inicio_pausa)
+                continue
+            if self.agendador.aguardar(None, self.sinal):
+                return True
+
+    def _pode_continuar(self):
+        return self.executando and not self.pausado
+
+    def reservar_entrada(self):
+        """Aguarda o prazo atual e a vez desta execução na entrada
+
+        Retorna False se a execução foi parada. Com True e um árbitro, a
+        entrada fica reservada até liberar_entrada().
+        """
+        while True:
+            if not self.aguardar():
+                return False
+            if self.arbitro is None:
+                return True
+            if self.arbitro.adquirir(self, self.prioridade, self._pode_continuar):
+                return True
+            # Parada ou pausa durante a espera: aguardar() decide
+
+    def executar(self):
+        """Executa o plano na thread atual; retorna o resumo de tempos
+
+        O resumo inclui a chave "concluido", falsa se a execução foi parada.
+        A conclusão é publicada no canal mesmo se houver erro (resumo None).
+        """
+        if self.medicao is not None:
+            self.medicao.marcar(INICIO)
+        resumo = None
+        try:
+            resumo = self.executar_plano()
+            return resumo
+        finally:
+            if self.canal is not None:
+                self.canal.publicar(CONCLUSAO, (self, resumo))
+
+    def executar_plano(self):
+        # Laço direto, sem passos(): na thread, cada espera é uma chamada comum
+        plano = self.plano
+        agendador = self.agendador
+        reservar_entrada = self.reservar_entrada
+        iniciar_operacao = self.iniciar_operacao
+        concluir_operacao = self.concluir_operacao
+        self.iniciar_execucao()
+        for repeticao in range(plano.repeticoes):
+            if not self.iniciar_repeticao(repeticao):
+                break
+            # Sem blocos, a tupla do plano é percorrida direto
+            for op in percorrer_operacoes(plano.operacoes) if plano.blocos else plano.operacoes:
+                antes = time.perf_counter()
+                # Aguardar o prazo planejado da operação (e a vez na entrada)
+                if not reservar_entrada():
+                    break
+                try:
+                    iniciar_operacao(repeticao, op)
+                    if op.tipo is TipoOperacao.TECLADO:
+                        self.executar_acao_teclado(op.teclas, agendador.prazo + op.duracao)
+                    else:
+                        self.executar_acao_mouse(op)
+                finally:
+                    self.liberar_entrada()
+                concluir_operacao(repeticao, op, antes)
+            self.concluir_repeticao(repeticao)
+        return self.concluir_execucao(self.executando and self.aguardar())
+
+    def executar_acao_teclado(self, teclas, prazo_soltar):
+        """Executa uma ação de teclado (tecla simples ou combinação)"""
+        try:
+            try:
+                self.pressionar(teclas)
+                self.primeira_acao()
+                # Uma parada ou pausa solta as teclas imediatamente
+                self.agendador.aguardar(prazo_soltar, self.sinal)
+            finally:
+                # Nunca deixar teclas presas, mesmo se a execução for interrompida
+                self.soltar(teclas)
+        except Exception as e:
+            self.erro_teclado(teclas, e)
+
+    def executar_acao_mouse(self, op):
+        """Executa uma ação de mouse"""
+        try:
+            self.mover_e_clicar(op)
+            self.primeira_acao()
+        except Exception as e:
+            self.erro_mouse(op, e)
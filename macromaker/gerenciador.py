@@ -0,0 +1,189 @@
+"""Várias execuções simultâneas, com arbitragem do teclado e do mouse
+
+Cada execução roda em sua própria thread, com o seu Executor (parada,
+pausa e estado independentes). O ArbitroEntrada garante que a entrada
+seja usada por uma operação de cada vez: uma combinação de teclas
+(pressionar, segurar, soltar) ou um movimento seguido de clique nunca é
+intercalado com a operação de outra execução. Entre operações, quem tem
+maior prioridade é atendido primeiro.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from .execucao import Executor
+
+LIMITE_SIMULTANEAS = 4
+
+# Estados de uma execução (exibidos na interface)
+NA_FILA = "queued"
+EXECUTANDO = "running"
+CONCLUIDA = "completed"
+PARADA = "stopped"
+ERRO = "error"
+
+
+class ArbitroEntrada:
+    """Trava da entrada com fila por prioridade (maior primeiro, depois ordem de chegada)"""
+
+    def __init__(self):
+        self.condicao = threading.Condition()
+        self.dono = None
+        self.fila = []
+        self.contador = itertools.count()
+
+    def adquirir(self, dono, prioridade=0, continuar=None):
+        """Espera a vez de `dono`; retorna False se `continuar()` ficar falso antes
+
+        Quem muda o que `continuar` consulta deve chamar acordar().
+        """
+        with self.condicao:
+            pedido = (-prioridade, next(self.contador), dono)
+            heapq.heappush(self.fila, pedido)
+            while True:
+                if continuar is not None and not continuar():
+                    self.fila.remove(pedido)
+                    heapq.heapify(self.fila)
+                    self.condicao.notify_all()
+                    return False
+                if self.dono is None and self.fila[0] is pedido:
+                    heapq.heappop(self.fila)
+                    self.dono = dono
+                    return True
+                self.condicao.wait()
+
+    def liberar(self):
+        with self.condicao:
+            self.dono = None
+            self.condicao.notify_all()
+
+    def acordar(self):
+        """Faz quem está esperando reavaliar a condição de continuar"""
+        with self.condicao:
+            self.condicao.notify_all()
+
+
+class Execucao:
+    """Uma execução iniciada pelo gerenciador"""
+
+    def __init__(self, numero, executor, prioridade):
+        self.numero = numero
+        self.executor = executor
+        self.nome = executor.plano.nome
+        self.prioridade = prioridade
+        self.estado = NA_FILA
+        self.resumo = None
+        self.thread = None
+
+    def __repr__(self):
+        return f"#{self.numero} {self.nome} ({self.estado}, priority {self.prioridade})"
+
+
+class GerenciadorExecucoes:
+    """Inicia execuções em paralelo, até `limite` ao mesmo tempo
+
+    As execuções além do limite esperam na fila (maior prioridade primeiro).
+    Todas compartilham o mesmo ArbitroEntrada. `ao_concluir(execucao)` é
+    chamado na thread da execução ao final de cada uma.
+    """
+
+    def __init__(self, limite=LIMITE_SIMULTANEAS, ao_concluir=None):
+        self.limite = max(1, limite)
+        self.ao_concluir = ao_concluir
+        self.arbitro = ArbitroEntrada()
+        self.trava = threading.Lock()
+        self.execucoes = []     # ativas e na fila, na ordem de início
+        self.fila = []          # (-prioridade, número, execucao)
+        self.em_execucao = 0
+        self.contador = itertools.count(1)
+
+    def iniciar(self, plano, prioridade=0, **opcoes):
+        """Cria uma execução do plano; as opções são as do Executor (backend, canal...)"""
+        executor = Executor(plano, arbitro=self.arbitro, prioridade=prioridade, **opcoes)
+        with self.trava:
+            execucao = Execucao(next(self.contador), executor, prioridade)
+            self.execucoes.append(execucao)
+            if self.em_execucao < self.limite:
+                self._disparar(execucao)
+            else:
+                heapq.heappush(self.fila, (-prioridade, execucao.numero, execucao))
+        return execucao
+
+    def _disparar(self, execucao):
+        # Chamado com a trava
+        self.em_execucao += 1
+        execucao.estado = EXECUTANDO
+        execucao.thread = threading.Thread(target=self._executar, args=(execucao,), daemon=True)
+        execucao.thread.start()
+
+    def _executar(self, execucao):
+        try:
+            execucao.resumo = execucao.executor.executar()
+            execucao.estado = CONCLUIDA if execucao.resumo["concluido"] else PARADA
+        except Exception as e:
+            execucao.estado = ERRO
+            execucao.executor.ao_registrar(f"❌ Error in run #{execucao.numero}: {e}")
+        finally:
+            with self.trava:
+                self.em_execucao -= 1
+                self.execucoes.remove(execucao)
+                if self.fila:
+                    self._disparar(heapq.heappop(self.fila)[2])
+            if self.ao_concluir is not None:
+                self.ao_concluir(execucao)
+
+    def parar(self, execucao):
+        """Para uma execução; se ainda estiver na fila, ela é descartada"""
+        execucao.executor.parar()
+        with self.trava:
+            na_fila = execucao.estado == NA_FILA
+            if na_fila:
+                self.fila = [item for item in self.fila if item[2] is not execucao]
+                heapq.heapify(self.fila)
+                self.execucoes.remove(execucao)
+                execucao.estado = PARADA
+        if na_fila:
+            # Executar o plano já parado apenas publica a conclusão (nada é enviado)
+            execucao.resumo = execucao.executor.executar()
+            if self.ao_concluir is not None:
+                self.ao_concluir(execucao)
+
+    def parar_todas(self):
+        for execucao in self.listar():
+            self.parar(execucao)
+
+    def pausar_todas(self):
+        for execucao in self.listar():
+            execucao.executor.pausar()
+
+    def retomar_todas(self):
+        for execucao in self.listar():
+            execucao.executor.retomar()
+
+    def listar(self):
+        """Execuções ativas e na fila, na ordem em que foram iniciadas"""
+        with self.trava:
+            return list(self.execucoes)
+
+    def aguardar_todas(self):
+        """Bloqueia até que todas as execuções (inclusive as da fila) terminem"""
+        while True:
+            execucoes = self.listar()
+            if not execucoes:
+                return
+            threads = [execucao.thread for execucao in execucoes if execucao.thread is not None]
+            if threads:
+                # Timeout curto: Ctrl+C continua sendo atendido na thread principal
+                threads[0].join(0.1)
+            else:
+                time.sleep(0.1)
+
+
+def ler_prioridade(macro):
+    """Prioridade salva no macro (maior é atendida primeiro; padrão 0)"""
+    try:
+        return int(macro.get("prioridade", 0))
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid priority '{macro.get('prioridade')}'")
@@ -0,0 +1,213 @@
+"""Gravação global de teclado e mouse, convertida em etapas de macro
+
+Os ganchos do keyboard e do mouse (biblioteca `mouse`, opcional) apenas
+guardam o evento recebido em um buffer circular pré-alocado, um por fonte,
+para que cada buffer tenha um único produtor e o callback não faça nenhuma
+outra operação. Toda a interpretação (combinações de teclas, cliques
+duplos, tempos) acontece em converter_gravacao(), depois da gravação.
+"""
+
+import heapq
+
+from .entrada import obter_keyboard
+
+CAPACIDADE_GRAVACAO = 1 << 20   # eventos por fonte (~17 min de mouse a 1 kHz)
+INTERVALO_CLIQUE_DUPLO = 0.4    # segundos entre dois cliques para formarem um duplo clique
+
+TECLADO = "teclado"
+MOUSE = "mouse"
+
+# Nome das teclas modificadoras (sem "left "/"right ") e como aparecem na etapa
+MODIFICADORES = {"ctrl": "Ctrl", "shift": "Shift", "alt": "Alt", "alt gr": "Alt Gr", "windows": "Windows"}
+
+_mouse = None
+
+
+def obter_mouse():
+    """Retorna o módulo mouse, importando-o no primeiro uso (ImportError se ausente)"""
+    global _mouse
+    if _mouse is None:
+        import mouse
+        _mouse = mouse
+    return _mouse
+
+
+def nome_base(nome):
+    """Nome da tecla sem o lado ("right ctrl" -> "ctrl")"""
+    nome = (nome or "").lower()
+    for prefixo in ("left ", "right "):
+        if nome.startswith(prefixo):
+            return nome[len(prefixo):]
+    return nome
+
+
+class BufferEventos:
+    """Buffer circular pré-alocado, para um único produtor
+
+    Quando cheio, os eventos mais antigos são sobrescritos; conteudo()
+    informa quantos se perderam.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_GRAVACAO):
+        # Potência de 2, para trocar o módulo por uma máscara
+        capacidade = 1 << max(0, capacidade - 1).bit_length()
+        self.itens = [None] * capacidade
+        self.mascara = capacidade - 1
+        self.total = 0
+
+    def acrescentar(self, evento):
+        self.itens[self.total & self.mascara] = evento
+        self.total += 1
+
+    def conteudo(self):
+        """Retorna (eventos em ordem de chegada, quantidade descartada)"""
+        total = self.total
+        capacidade = len(self.itens)
+        if total <= capacidade:
+            return self.itens[:total], 0
+        inicio = total & self.mascara
+        return self.itens[inicio:] + self.itens[:inicio], total - capacidade
+
+
+class Gravador:
+    """Grava eventos globais de teclado e mouse até parar() ser chamado"""
+
+    def __init__(self, capacidade=CAPACIDADE_GRAVACAO):
+        self.teclado = BufferEventos(capacidade)
+        self.mouse = BufferEventos(capacidade)
+        self.posicao_inicial = (0, 0)
+        self.gravando = False
+        self.aviso = None       # texto para o log se o mouse não puder ser gravado
+        self.descartados = 0
+        self._remover = []
+
+    def iniciar(self):
+        keyboard = obter_keyboard()
+        remover_teclado = keyboard.hook(self.teclado.acrescentar)
+        self._remover.append(lambda: keyboard.unhook(remover_teclado))
+        try:
+            mouse = obter_mouse()
+            self.posicao_inicial = mouse.get_position()
+            mouse.hook(self.mouse.acrescentar)
+            self._remover.append(lambda: mouse.unhook(self.mouse.acrescentar))
+        except ImportError:
+            self.aviso = "'mouse' library not installed: recording the keyboard only"
+        self.gravando = True
+
+    def parar(self):
+        """Remove os ganchos e retorna os eventos [(fonte, evento)] em ordem de tempo"""
+        for remover in self._remover:
+            try:
+                remover()
+            except Exception as e:
+                print(f"Error removing recording hook: {e}")
+        self._remover = []
+        self.gravando = False
+
+        teclado, perdidos_teclado = self.teclado.conteudo()
+        mouse, perdidos_mouse = self.mouse.conteudo()
+        self.descartados = perdidos_teclado + perdidos_mouse
+        # Cada fonte já está em ordem de tempo: basta intercalar
+        return list(heapq.merge(((e.time, TECLADO, e) for e in teclado),
+                                ((e.time, MOUSE, e) for e in mouse),
+                                key=lambda item: item[0]))
+
+
+def _descartar_final(eventos, teclas_finais, descartar_clique):
+    """Remove do fim da gravação a hotkey (ou o clique) que a encerrou e os movimentos até ela"""
+    teclas_finais = {nome_base(t.strip()) for t in teclas_finais}
+    cliques = 2 if descartar_clique else 0      # pressionar + soltar
+    while eventos:
+        _, fonte, evento = eventos[-1]
+        if fonte == TECLADO:
+            if nome_base(evento.name) not in teclas_finais:
+                break
+        elif hasattr(evento, "button"):
+            if cliques == 0:
+                break
+            cliques -= 1
+        elif not hasattr(evento, "x"):
+            break
+        eventos.pop()
+
+
+def converter_gravacao(eventos, posicao_inicial=(0, 0), movimentos=False,
+                       teclas_finais=(), descartar_clique=False):
+    """Converte os eventos gravados em etapas no formato do macro
+
+    Cada tecla (com os modificadores pressionados) vira uma etapa de
+    teclado com o tempo real em que ficou pressionada; cada clique vira uma
+    etapa de mouse na posição do cursor. O tempo de cada etapa é o
+    intervalo real até a próxima (para o modo "personalized"). Com
+    `movimentos`, cada movimento do mouse também vira uma etapa "move".
+    """
+    eventos = list(eventos)
+    _descartar_final(eventos, teclas_finais, descartar_clique)
+
+    acoes = []              # [instante, etapa, duração]
+    pressionadas = {}       # tecla -> índice da ação em acoes
+    modificadores = {}      # modificador -> [instante, usado em alguma combinação]
+    x, y = posicao_inicial
+
+    for instante, fonte, evento in eventos:
+        if fonte == TECLADO:
+            base = nome_base(evento.name)
+            if evento.event_type == "down":
+                if base in MODIFICADORES:
+                    modificadores.setdefault(base, [instante, False])
+                    continue
+                if base in pressionadas:
+                    continue    # repetição automática da tecla segurada
+                for estado in modificadores.values():
+                    estado[1] = True
+                partes = [MODIFICADORES[m] for m in modificadores] + [evento.name]
+                pressionadas[base] = len(acoes)
+                acoes.append([instante, {"tipo": "keyboard", "acao": " + ".join(partes)}, 0.0])
+            elif base in MODIFICADORES:
+                estado = modificadores.pop(base, None)
+                if estado is not None and not estado[1]:
+                    # Modificador pressionado e solto sozinho
+                    acoes.append([estado[0], {"tipo": "keyboard", "acao": MODIFICADORES[base]},
+                                  instante - estado[0]])
+            elif base in pressionadas:
+                indice = pressionadas.pop(base)
+                acoes[indice][2] = instante - acoes[indice][0]
+
+        elif hasattr(evento, "x"):
+            x, y = evento.x, evento.y
+            if movimentos:
+                acoes.append([instante, {"tipo": "mouse", "acao": "move", "x": x, "y": y}, 0.0])
+
+        elif hasattr(evento, "button") and evento.event_type in ("down", "double"):
+            if evento.button not in ("left", "right", "middle"):
+                continue
+            acao = f"{evento.button}_click"
+            anterior = acoes[-1] if acoes else None
+            if (anterior is not None and anterior[1]["acao"] == acao and evento.button != "middle"
+                    and (anterior[1]["x"], anterior[1]["y"]) == (x, y)
+                    and instante - anterior[0] <= INTERVALO_CLIQUE_DUPLO):
+                anterior[1]["acao"] = f"double_{acao}"
+                continue
+            acoes.append([instante, {"tipo": "mouse", "acao": acao, "x": x, "y": y}, 0.0])
+
+    # Ações de modificadores soltos sozinhos entram fora de ordem
+    acoes.sort(key=lambda acao: acao[0])
+
+    etapas = []
+    for i, (instante, etapa, duracao) in enumerate(acoes):
+        proximo = acoes[i + 1][0] if i + 1 < len(acoes) else instante + duracao
+        intervalo = max(0.0, proximo - instante)
+        if etapa["tipo"] == "keyboard":
+            # Teclas sobrepostas (digitação rápida) são soltas antes da próxima
+            duracao = min(duracao, intervalo)
+            etapa["tempo_pressionar"] = round(duracao, 3)
+            etapa.setdefault("x", 0)
+            etapa.setdefault("y", 0)
+        else:
+            # O caminho do cursor vem das próprias etapas "move"
+            duracao = 0.0
+            etapa["tempo_movimento"] = 0.0
+        etapa["tempo"] = f"{intervalo - duracao:.3f}"
+        etapa["repeticoes"] = 1
+        etapas.append(etapa)
+    return etapas
@@ -0,0 +1,152 @@
+"""Latência entre o gatilho (START ou hotkey) e a primeira ação injetada
+
+Cada início de execução leva uma MedicaoLatencia, que marca o instante
+(time.perf_counter_ns) de cada estágio do caminho:
+
+    gatilho        hotkey recebida ou botão clicado
+    atendido       pedido atendido na thread da interface
+    plano          plano pronto (compilado ou do cache)
+    inicio         thread (ou corrotina) de execução começando
+    primeira_acao  primeira ação enviada ao backend
+
+Ao marcar a primeira ação, a medição é entregue a RegistroLatencias, que
+guarda uma janela móvel das últimas amostras de cada trecho e calcula os
+percentis. O registro pode ser salvo em JSON (latencias.json) e lido pelo
+comando `latency`.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ARQUIVO_LATENCIAS = "latencias.json"
+JANELA_LATENCIAS = 1000     # amostras mantidas por trecho
+
+GATILHO = "gatilho"
+ATENDIDO = "atendido"
+PLANO = "plano"
+INICIO = "inicio"
+PRIMEIRA_ACAO = "primeira_acao"
+
+# (trecho, marca inicial, marca final, descrição)
+TRECHOS = (
+    ("fila", GATILHO, ATENDIDO, "hotkey -> UI thread"),
+    ("preparo", ATENDIDO, PLANO, "plan ready"),
+    ("despacho", PLANO, INICIO, "run started"),
+    ("primeira_acao", INICIO, PRIMEIRA_ACAO, "first action sent"),
+    ("total", GATILHO, PRIMEIRA_ACAO, "trigger -> first action"),
+)
+
+PERCENTIS = (50, 95, 99)
+
+
+class MedicaoLatencia:
+    """Instantes dos estágios de um único início de execução"""
+
+    def __init__(self, destino=None):
+        self.destino = destino
+        self.marcas = {GATILHO: time.perf_counter_ns()}
+
+    def marcar(self, estagio):
+        self.marcas[estagio] = time.perf_counter_ns()
+        if estagio == PRIMEIRA_ACAO and self.destino is not None:
+            self.destino.registrar(self)
+
+    def trechos(self):
+        """Duração (ns) de cada trecho cujas duas marcas existem"""
+        marcas = self.marcas
+        return {nome: marcas[fim] - marcas[inicio] for nome, inicio, fim, _ in TRECHOS
+                if inicio in marcas and fim in marcas}
+
+
+def percentil(ordenados, p):
+    """Percentil pelo método do posto mais próximo (lista já ordenada)"""
+    if not ordenados:
+        return None
+    posto = max(1, -(-p * len(ordenados) // 100))
+    return ordenados[posto - 1]
+
+
+class RegistroLatencias:
+    """Janela móvel das latências por trecho (pode ser usado de qualquer thread)"""
+
+    def __init__(self, janela=JANELA_LATENCIAS):
+        self.janela = janela
+        self.amostras = {nome: deque(maxlen=janela) for nome, _, _, _ in TRECHOS}
+        self.versao = 0     # muda a cada amostra, para a interface saber quando redesenhar
+        self.trava = threading.Lock()
+
+    def registrar(self, medicao):
+        trechos = medicao.trechos()
+        with self.trava:
+            for nome, duracao in trechos.items():
+                self.amostras[nome].append(duracao)
+            self.versao += 1
+
+    def resumo(self):
+        """{trecho: {"n", "p50", "p95", "p99", "max"}} em milissegundos"""
+        with self.trava:
+            copias = {nome: sorted(valores) for nome, valores in self.amostras.items()}
+        resumo = {}
+        for nome, ordenados in copias.items():
+            if not ordenados:
+                continue
+            estatisticas = {"n": len(ordenados)}
+            for p in PERCENTIS:
+                estatisticas[f"p{p}"] = percentil(ordenados, p) / 1e6
+            estatisticas["max"] = ordenados[-1] / 1e6
+            resumo[nome] = estatisticas
+        return resumo
+
+    def histograma(self, trecho="total"):
+        """Contagem das amostras por faixa em potências de 2 de microssegundos: {limite_us: n}"""
+        with self.trava:
+            valores = list(self.amostras.get(trecho, ()))
+        faixas = {}
+        for valor in valores:
+            limite = 1 << (valor // 1000).bit_length()
+            faixas[limite] = faixas.get(limite, 0) + 1
+        return dict(sorted(faixas.items()))
+
+    def salvar(self, caminho=ARQUIVO_LATENCIAS):
+        with self.trava:
+            dados = {"amostras_ns": {nome: list(valores) for nome, valores in self.amostras.items()}}
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        os.replace(temporario, caminho)
+
+    def carregar(self, caminho=ARQUIVO_LATENCIAS):
+        """Acrescenta as amostras salvas em `caminho` (se existir)"""
+        if not os.path.exists(caminho):
+            return
+        with open(caminho, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+        with self.trava:
+            for nome, valores in dados.get("amostras_ns", {}).items():
+                if nome in self.amostras:
+                    self.amostras[nome].extend(int(v) for v in valores)
+            self.versao += 1
+
+
+def formatar_latencia(resumo, trecho="total"):
+    """Linha curta com os percentis de um trecho (para a interface)"""
+    estatisticas = resumo.get(trecho)
+    if not estatisticas:
+        return "Trigger → first action: no samples yet"
+    return (f"Trigger → first action: p50 {estatisticas['p50']:.1f} ms, p95 {estatisticas['p95']:.1f} ms, "
+            f"p99 {estatisticas['p99']:.1f} ms (n={estatisticas['n']})")
+
+
+def formatar_tabela(resumo):
+    """Tabela de todos os trechos (para a linha de comando)"""
+    linhas = [f"{'stage':<26}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for nome, _, _, descricao in TRECHOS:
+        estatisticas = resumo.get(nome)
+        if not estatisticas:
+            continue
+        linhas.append(f"{descricao:<26}{estatisticas['n']:>6}{estatisticas['p50']:>10.2f}"
+                      f"{estatisticas['p95']:>10.2f}{estatisticas['p99']:>10.2f}{estatisticas['max']:>10.2f}")
+    return "\n".join(linhas)
@@ -0,0 +1,231 @@
+"""Linha do tempo de uma execução, exportável no formato Chrome Trace Event
+
+Com uma LinhaTempo, o executor guarda uma tupla por operação: prazo
+planejado, início real, fim, tempo de espera antes dela (prazo e vez na
+entrada) e tempo gasto nas chamadas ao backend, medido por um
+BackendCronometrado que envolve o backend só nessa execução. Sem ela, o
+laço do executor faz apenas um teste "is None" por operação.
+
+O arquivo exportado abre em chrome://tracing ou em https://ui.perfetto.dev:
+cada execução é uma linha (thread), com as repetições, as etapas, as esperas
+e um contador do atraso de cada operação.
+"""
+
+import json
+import time
+
+from .entrada import BackendEntrada
+from .plano import TipoOperacao
+
+LIMITE_MAIS_LENTAS = 5      # etapas listadas no resumo
+
+
+class BackendCronometrado(BackendEntrada):
+    """Envolve um backend somando o tempo gasto em cada chamada"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.bloqueante = getattr(backend, "bloqueante", True)
+        self.tempo = 0.0
+
+    def _medir(self, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            funcao(*args)
+        finally:
+            self.tempo += time.perf_counter() - inicio
+
+    def pressionar(self, tecla):
+        self._medir(self.backend.pressionar, tecla)
+
+    def soltar(self, tecla):
+        self._medir(self.backend.soltar, tecla)
+
+    def mover(self, x, y, duracao=0.0):
+        self._medir(self.backend.mover, x, y, duracao)
+
+    def clicar(self, botao, cliques=1):
+        self._medir(self.backend.clicar, botao, cliques)
+
+    def descarregar(self):
+        self._medir(self.backend.descarregar)
+
+    def fechar(self):
+        self.backend.fechar()
+
+
+def descrever_operacao(op):
+    """Texto curto da ação de uma operação (teclas ou ação de mouse)"""
+    if op.tipo is TipoOperacao.TECLADO:
+        return " + ".join(op.teclas)
+    return f"{op.acao_mouse.value} ({op.x},{op.y})"
+
+
+def descrever_etapa(op):
+    """Texto da etapa de quem executa: a chamada, se a operação veio de outro macro"""
+    if op.chamada is not None:
+        return f"call {op.chamada}"
+    return descrever_operacao(op)
+
+
+class LinhaTempo:
+    """Registro, operação por operação, de uma execução
+
+    Os instantes são de time.perf_counter(); `inicio` é o início da execução.
+    Cada registro é (repetição, operação, prazo, início, fim, espera, backend).
+    """
+
+    def __init__(self, nome=""):
+        self.nome = nome
+        self.inicio = None
+        self.registros = []
+        self.cronometro = None
+        self.backend_acumulado = 0.0
+
+    def cronometrar(self, backend):
+        """Retorna o backend envolvido por um BackendCronometrado desta linha do tempo"""
+        self.cronometro = BackendCronometrado(backend)
+        return self.cronometro
+
+    def iniciar(self, inicio):
+        self.inicio = inicio
+        self.registros = []
+
+    def registrar(self, repeticao, op, prazo, atraso, antes):
+        """Guarda a operação que acabou de terminar
+
+        `atraso` é o registrado pelo agendador ao marcar a operação e
+        `antes` o instante em que a espera por ela começou.
+        """
+        fim = time.perf_counter()
+        backend = 0.0
+        if self.cronometro is not None:
+            backend = self.cronometro.tempo - self.backend_acumulado
+            self.backend_acumulado = self.cronometro.tempo
+        inicio = prazo + atraso
+        self.registros.append((repeticao, op, prazo, inicio, fim, inicio - antes, backend))
+
+    def resumo(self):
+        """Atrasos, esperas, tempo no backend e as etapas mais lentas (em segundos)
+
+        Uma etapa é mais lenta quanto mais tarde termina em relação ao fim
+        planejado (prazo + duração da ação), em média. Uma etapa que chama
+        outro macro agrupa todas as operações dele, sob "call <macro>".
+        """
+        registros = self.registros
+        if not registros:
+            return {"nome": self.nome, "operacoes": 0, "atraso_medio": 0.0, "atraso_maximo": 0.0,
+                    "desvio_final": 0.0, "espera_total": 0.0, "backend_total": 0.0, "mais_lentas": []}
+        etapas = {}
+        for _, op, prazo, inicio, fim, _, backend in registros:
+            excesso = fim - (prazo + op.duracao)
+            etapa = etapas.get(op.indice)
+            if etapa is None:
+                etapas[op.indice] = [op, 1, excesso, excesso, backend, inicio - prazo]
+            else:
+                etapa[1] += 1
+                etapa[2] += excesso
+                etapa[3] = max(etapa[3], excesso)
+                etapa[4] += backend
+                etapa[5] = max(etapa[5], inicio - prazo)
+        mais_lentas = sorted(etapas.values(), key=lambda etapa: etapa[2] / etapa[1], reverse=True)
+        atrasos = [inicio - prazo for _, _, prazo, inicio, _, _, _ in registros]
+        return {
+            "nome": self.nome,
+            "operacoes": len(registros),
+            "atraso_medio": sum(atrasos) / len(atrasos),
+            "atraso_maximo": max(atrasos),
+            "desvio_final": atrasos[-1],
+            "espera_total": sum(registro[5] for registro in registros),
+            "backend_total": sum(registro[6] for registro in registros),
+            "mais_lentas": [{
+                "etapa": op.indice + 1,
+                "acao": descrever_etapa(op),
+                "execucoes": n,
+                "excesso_medio": soma / n,
+                "excesso_maximo": maximo,
+                "backend_medio": backend / n,
+                "atraso_maximo": atraso,
+            } for op, n, soma, maximo, backend, atraso in mais_lentas[:LIMITE_MAIS_LENTAS]],
+        }
+
+    def eventos_trace(self, base, tid, pid=1):
+        """Eventos Chrome Trace desta execução (microssegundos a partir de `base`)"""
+        eventos = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": self.nome or f"Run {tid}"}}]
+
+        def us(instante):
+            return (instante - base) * 1e6
+
+        repeticao_atual = None
+        inicio_repeticao = fim_repeticao = 0.0
+        indice_anterior = None
+        repeticao_etapa = 0
+        for repeticao, op, prazo, inicio, fim, espera, backend in self.registros:
+            if repeticao != repeticao_atual:
+                if repeticao_atual is not None:
+                    eventos.append({"name": f"Repetition {repeticao_atual + 1}", "cat": "repetition",
+                                    "ph": "X", "pid": pid, "tid": tid, "ts": us(inicio_repeticao),
+                                    "dur": (fim_repeticao - inicio_repeticao) * 1e6})
+                repeticao_atual = repeticao
+                inicio_repeticao = inicio - espera
+                indice_anterior = None
+            fim_repeticao = fim
+            repeticao_etapa = repeticao_etapa + 1 if op.indice == indice_anterior else 1
+            indice_anterior = op.indice
+
+            if espera > 0:
+                eventos.append({"name": "wait", "cat": "wait", "ph": "X", "pid": pid, "tid": tid,
+                                "ts": us(inicio - espera), "dur": espera * 1e6})
+            eventos.append({
+                "name": f"Step {op.indice + 1}", "cat": "step", "ph": "X", "pid": pid, "tid": tid,
+                "ts": us(inicio), "dur": (fim - inicio) * 1e6,
+                "args": {
+                    "action": descrever_operacao(op),
+                    "call": op.chamada,
+                    "repetition": repeticao + 1,
+                    "step_repeat": repeticao_etapa,
+                    "planned_ms": (prazo - base) * 1000,
+                    "lateness_ms": (inicio - prazo) * 1000,
+                    "wait_ms": espera * 1000,
+                    "backend_ms": backend * 1000,
+                    "planned_action_ms": op.duracao * 1000,
+                },
+            })
+            eventos.append({"name": "lateness", "ph": "C", "pid": pid, "tid": tid, "ts": us(inicio),
+                            "args": {f"{self.nome or tid} ms": (inicio - prazo) * 1000}})
+        if repeticao_atual is not None:
+            eventos.append({"name": f"Repetition {repeticao_atual + 1}", "cat": "repetition",
+                            "ph": "X", "pid": pid, "tid": tid, "ts": us(inicio_repeticao),
+                            "dur": (fim_repeticao - inicio_repeticao) * 1e6})
+        return eventos
+
+
+def exportar_trace(linhas, caminho):
+    """Grava as linhas do tempo (uma por execução) em um arquivo Chrome Trace JSON"""
+    linhas = [linha for linha in linhas if linha.inicio is not None]
+    base = min((linha.inicio for linha in linhas), default=0.0)
+    eventos = []
+    for tid, linha in enumerate(linhas, 1):
+        eventos.extend(linha.eventos_trace(base, tid))
+    dados = {
+        "traceEvents": eventos,
+        "displayTimeUnit": "ms",
+        "otherData": {"resumos": [linha.resumo() for linha in linhas]},
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+
+
+def formatar_linha_tempo(resumo):
+    """Resumo da linha do tempo para o log: atrasos e as etapas mais lentas"""
+    if not resumo["operacoes"]:
+        return "📈 Timeline: no steps executed"
+    linhas = [f"📈 Timeline: {resumo['operacoes']} actions, lateness avg {resumo['atraso_medio'] * 1000:.2f} ms, "
+              f"max {resumo['atraso_maximo'] * 1000:.2f} ms, final drift {resumo['desvio_final'] * 1000:.2f} ms; "
+              f"waiting {resumo['espera_total']:.2f} s, input calls {resumo['backend_total'] * 1000:.1f} ms"]
+    for etapa in resumo["mais_lentas"]:
+        linhas.append(f"   Step {etapa['etapa']} ({etapa['acao']}, x{etapa['execucoes']}): "
+                      f"{etapa['excesso_medio'] * 1000:+.2f} ms over plan avg, "
+                      f"max {etapa['excesso_maximo'] * 1000:+.2f} ms, input {etapa['backend_medio'] * 1000:.2f} ms")
+    return "\n".join(linhas)
@@ -0,0 +1,148 @@
+"""Modelo observável da lista de etapas do macro em edição
+
+Todas as alterações feitas pelo editor passam por aqui e geram eventos
+detalhados (inserção, remoção, movimento, atualização de campos), para que
+a interface atualize apenas as linhas afetadas.
+"""
+
+from collections import namedtuple
+
+from .plano import TIPO_BLOCO, TIPO_FIM_BLOCO
+
+# Tipos de alteração
+INSERCAO = "inserir"
+REMOCAO = "remover"
+MOVIMENTO = "mover"
+ATUALIZACAO = "atualizar"
+REDEFINICAO = "redefinir"
+
+# tipo: um dos tipos acima
+# indice: primeira etapa afetada
+# quantidade: etapas inseridas/removidas (1 para os demais tipos)
+# destino: nova posição (apenas MOVIMENTO)
+# campos: nomes dos campos alterados (apenas ATUALIZACAO)
+Alteracao = namedtuple("Alteracao", ["tipo", "indice", "quantidade", "destino", "campos"])
+
+
+class ModeloEtapas:
+    """Lista de etapas que avisa os observadores a cada alteração
+
+    Trabalha sobre a própria lista `macro["etapas"]`, então o macro continua
+    pronto para ser salvo ou compilado sem conversões.
+    """
+
+    def __init__(self, etapas=None):
+        self.etapas = etapas if etapas is not None else []
+        self.observadores = []
+        self._profundidades = None  # calculadas sob demanda e descartadas a cada mudança de estrutura
+
+    def __len__(self):
+        return len(self.etapas)
+
+    def __getitem__(self, indice):
+        return self.etapas[indice]
+
+    def observar(self, callback):
+        """Registra `callback(alteracao)`, chamado após cada alteração"""
+        self.observadores.append(callback)
+
+    def _notificar(self, tipo, indice, quantidade=1, destino=None, campos=()):
+        alteracao = Alteracao(tipo, indice, quantidade, destino, campos)
+        if tipo != ATUALIZACAO or "tipo" in campos:
+            self._profundidades = None
+        for callback in self.observadores:
+            callback(alteracao)
+
+    def redefinir(self, etapas):
+        """Passa a trabalhar sobre outra lista (novo macro carregado)"""
+        self.etapas = etapas
+        self._notificar(REDEFINICAO, 0, len(etapas))
+
+    def inserir(self, indice, *etapas):
+        """Insere uma ou mais etapas a partir de `indice`"""
+        self.etapas[indice:indice] = etapas
+        self._notificar(INSERCAO, indice, len(etapas))
+
+    def duplicar(self, inicio, fim, copias=1):
+        """Insere `copias` cópias das etapas [inicio, fim] logo depois delas
+
+        Cada cópia é um dicionário novo: editar uma não altera as outras.
+        """
+        self.inserir(fim + 1, *[self.etapas[i].copy() for _ in range(copias) for i in range(inicio, fim + 1)])
+
+    def remover(self, indice):
+        """Remove e retorna a etapa `indice`"""
+        etapa = self.etapas.pop(indice)
+        self._notificar(REMOCAO, indice)
+        return etapa
+
+    def mover(self, indice, destino):
+        """Move a etapa `indice` para a posição `destino`"""
+        if indice == destino:
+            return
+        self.etapas.insert(destino, self.etapas.pop(indice))
+        self._notificar(MOVIMENTO, indice, destino=destino)
+
+    def atualizar(self, indice, **campos):
+        """Altera campos de uma etapa; só notifica se algum valor mudou
+
+        Um campo com valor None é removido da etapa (ex.: um tempo próprio
+        que volta a ser o do macro).
+        """
+        etapa = self.etapas[indice]
+        alterados = tuple(campo for campo, valor in campos.items() if etapa.get(campo) != valor)
+        if alterados:
+            for campo in alterados:
+                if campos[campo] is None:
+                    del etapa[campo]
+                else:
+                    etapa[campo] = campos[campo]
+            self._notificar(ATUALIZACAO, indice, campos=alterados)
+
+    def profundidade(self, indice):
+        """Quantos blocos contêm a etapa (as etapas de abertura e fim ficam no nível de fora)"""
+        if self._profundidades is None:
+            profundidades = []
+            nivel = 0
+            for etapa in self.etapas:
+                tipo = etapa.get("tipo")
+                if tipo == TIPO_FIM_BLOCO:
+                    nivel = max(0, nivel - 1)
+                profundidades.append(nivel)
+                if tipo == TIPO_BLOCO:
+                    nivel += 1
+            self._profundidades = profundidades
+        return self._profundidades[indice]
+
+    def par_bloco(self, indice):
+        """Índice da etapa que fecha (ou abre) o bloco da etapa `indice`; None se não houver"""
+        tipo = self.etapas[indice].get("tipo")
+        if tipo == TIPO_BLOCO:
+            indices = range(indice + 1, len(self.etapas))
+        elif tipo == TIPO_FIM_BLOCO:
+            indices = range(indice - 1, -1, -1)
+        else:
+            return None
+        nivel = 0
+        for i in indices:
+            tipo_i = self.etapas[i].get("tipo")
+            if tipo_i == tipo:
+                nivel += 1
+            elif tipo_i in (TIPO_BLOCO, TIPO_FIM_BLOCO):
+                if nivel == 0:
+                    return i
+                nivel -= 1
+        return None
+
+    def intervalo_equilibrado(self, inicio, fim):
+        """Verdadeiro se as etapas [inicio, fim] podem formar um bloco (não cortam outro bloco)"""
+        nivel = 0
+        for etapa in self.etapas[inicio:fim + 1]:
+            tipo = etapa.get("tipo")
+            if tipo == TIPO_BLOCO:
+                nivel += 1
+            elif tipo == TIPO_FIM_BLOCO:
+                nivel -= 1
+                if nivel < 0:
+                    return False
+        return nivel == 0
@@ -0,0 +1,414 @@
+"""Compilação de macros em planos de execução imutáveis"""
+
+import enum
+from collections import namedtuple
+
+# Pausas padrão usadas na execução (em segundos); cada macro pode alterá-las
+# com a chave de mesmo nome em minúsculas, e cada etapa pode alterar as três
+# primeiras (ex.: "tempo_pressionar": "0.02")
+TEMPO_PRESSIONAR = 0.1          # tempo que a tecla fica pressionada
+TEMPO_MOVIMENTO = 0.1           # duração do movimento do mouse até a posição
+PAUSA_REPETICAO_ETAPA = 0.1     # pausa entre repetições da mesma etapa
+PAUSA_REPETICOES = 0.5          # pausa entre repetições do macro
+
+TEXTO_TECLA_PADRAO = "Click to set key"
+
+# Etapas que delimitam um bloco: a de abertura guarda em "repeticoes" quantas
+# vezes as etapas até o fim do bloco correspondente são executadas. Blocos
+# podem ser aninhados; as etapas ficam gravadas uma única vez.
+TIPO_BLOCO = "block"
+TIPO_FIM_BLOCO = "end_block"
+
+# Etapa que executa outro macro salvo, cujo nome fica em "acao", "repeticoes"
+# vezes. Com "herdar_tempos" (o padrão), o macro chamado usa o modo de tempo
+# e as pausas de quem o chama; sem ele, os seus próprios. A escala de tempo
+# (e a velocidade máxima) da execução vale para todos os macros chamados.
+TIPO_CHAMADA = "call"
+
+
+class AcaoMouse(enum.Enum):
+    """Ações de mouse suportadas (o valor é o nome salvo no JSON)"""
+    MOVER = "move"
+    CLIQUE_ESQUERDO = "left_click"
+    CLIQUE_DIREITO = "right_click"
+    CLIQUE_MEIO = "middle_click"
+    DUPLO_CLIQUE_ESQUERDO = "double_left_click"
+    DUPLO_CLIQUE_DIREITO = "double_right_click"
+
+
+# Nomes antigos (em português) ainda aceitos em arquivos de macro
+ALIASES_ACAO_MOUSE = {
+    "clique_esquerdo": AcaoMouse.CLIQUE_ESQUERDO,
+    "clique_direito": AcaoMouse.CLIQUE_DIREITO,
+    "clique_meio": AcaoMouse.CLIQUE_MEIO,
+    "duplo_clique_esquerdo": AcaoMouse.DUPLO_CLIQUE_ESQUERDO,
+    "duplo_clique_direito": AcaoMouse.DUPLO_CLIQUE_DIREITO,
+}
+
+# Botão e número de cliques de cada ação de mouse
+CLIQUES_MOUSE = {
+    AcaoMouse.MOVER: (None, 0),
+    AcaoMouse.CLIQUE_ESQUERDO: ("left", 1),
+    AcaoMouse.CLIQUE_DIREITO: ("right", 1),
+    AcaoMouse.CLIQUE_MEIO: ("middle", 1),
+    AcaoMouse.DUPLO_CLIQUE_ESQUERDO: ("left", 2),
+    AcaoMouse.DUPLO_CLIQUE_DIREITO: ("right", 2),
+}
+
+
+class TipoOperacao(enum.Enum):
+    TECLADO = "keyboard"
+    MOUSE = "mouse"
+
+
+# Uma operação do plano: uma única execução de uma etapa, já validada.
+# teclas: tupla de teclas em minúsculas (teclado)
+# acao_mouse/botao/cliques/x/y: ação de mouse resolvida
+# duracao: tempo planejado da própria ação (tecla pressionada / movimento)
+# espera/variacao: pausa após a operação (variacao > 0 apenas no modo random)
+# mensagem: linha de log (apenas na primeira repetição da etapa)
+# chamada: nome do macro chamado pela etapa `indice`, se a operação veio dele
+Operacao = namedtuple("Operacao", [
+    "indice", "tipo", "teclas", "acao_mouse", "botao", "cliques",
+    "x", "y", "duracao", "espera", "variacao", "mensagem", "chamada",
+], defaults=(None,))
+
+# Um bloco do plano: `operacoes` (Operacao ou Bloco) executadas `repeticoes` vezes
+Bloco = namedtuple("Bloco", ["repeticoes", "operacoes"])
+
+# operacoes: Operacao e, se `blocos`, também Bloco (ver percorrer_operacoes)
+# chamados: nomes de todos os macros chamados pelo plano (em qualquer nível)
+PlanoExecucao = namedtuple("PlanoExecucao", ["nome", "operacoes", "repeticoes", "pausa_repeticoes", "blocos",
+                                             "chamados"],
+                           defaults=(False, ()))
+
+
+def percorrer_operacoes(operacoes):
+    """Operações na ordem de execução, repetindo os blocos sem criar cópias"""
+    for item in operacoes:
+        if type(item) is Bloco:
+            for _ in range(item.repeticoes):
+                yield from percorrer_operacoes(item.operacoes)
+        else:
+            yield item
+
+
+def operacoes_distintas(operacoes):
+    """Cada operação do plano uma única vez, ignorando as repetições dos blocos"""
+    for item in operacoes:
+        if type(item) is Bloco:
+            yield from operacoes_distintas(item.operacoes)
+        else:
+            yield item
+
+
+def nova_etapa_bloco(repeticoes=2):
+    """Etapas de abertura e de fim de um bloco"""
+    return ({"tipo": TIPO_BLOCO, "acao": "", "repeticoes": repeticoes},
+            {"tipo": TIPO_FIM_BLOCO, "acao": ""})
+
+
+def macros_chamados(macro):
+    """Nomes dos macros chamados pelas etapas de `macro`, sem repetir"""
+    return list(dict.fromkeys(etapa.get("acao", "") for etapa in macro.get("etapas", [])
+                              if etapa.get("tipo") == TIPO_CHAMADA))
+
+
+def encontrar_ciclo(macro, carregar_macro):
+    """Primeiro ciclo de chamadas alcançável a partir de `macro`, ou None
+
+    O ciclo é a lista de nomes com o primeiro repetido no fim (["A", "B",
+    "A"]). Os outros macros vêm de `carregar_macro(nome)`; os que não
+    existem são ignorados (o erro aparece ao compilar).
+    """
+    nome_raiz = macro.get("nome", "")
+    pilha = []
+    concluidos = set()
+
+    def visitar(nome, atual):
+        pilha.append(nome)
+        for chamado in macros_chamados(atual):
+            if chamado in pilha:
+                return pilha[pilha.index(chamado):] + [chamado]
+            if chamado in concluidos:
+                continue
+            seguinte = macro if chamado == nome_raiz else carregar_macro(chamado)
+            if seguinte is not None:
+                ciclo = visitar(chamado, seguinte)
+                if ciclo:
+                    return ciclo
+        pilha.pop()
+        concluidos.add(nome)
+        return None
+
+    return visitar(nome_raiz, macro)
+
+
+def vincular_chamada(operacoes, indice, nome, prefixo):
+    """Operações do macro `nome`, atribuídas à etapa `indice` de quem o chama"""
+    vinculadas = []
+    for item in operacoes:
+        if type(item) is Bloco:
+            vinculadas.append(Bloco(item.repeticoes, vincular_chamada(item.operacoes, indice, nome, prefixo)))
+        else:
+            vinculadas.append(item._replace(
+                indice=indice, chamada=nome,
+                mensagem=None if item.mensagem is None else prefixo + item.mensagem))
+    return tuple(vinculadas)
+
+
+class ResolvedorChamadas:
+    """Macros chamados por etapas "call" durante a compilação de um plano
+
+    Cada macro chamado é lido por `carregar_macro(nome)` e compilado uma
+    única vez por plano (para cada combinação de tempos), mesmo que seja
+    chamado de vários lugares. A pilha das compilações em curso detecta
+    chamadas em ciclo.
+    """
+
+    def __init__(self, carregar_macro, nome_raiz=""):
+        self.carregar_macro = carregar_macro
+        self.macros = {}        # nome -> macro lido
+        self.preparados = {}    # (nome, tempos herdados, parâmetros) -> operações
+        self.pilha = [nome_raiz]
+
+    def preparar(self, nome, herdados, parametros):
+        """Operações do macro `nome` compilado com `parametros` e as pausas `herdados`"""
+        if nome in self.pilha:
+            ciclo = self.pilha[self.pilha.index(nome):] + [nome]
+            raise ValueError(f"call cycle {' → '.join(ciclo)}")
+        chave = (nome, tuple(sorted(herdados.items())), tuple(sorted(parametros.items())))
+        operacoes = self.preparados.get(chave)
+        if operacoes is not None:
+            return operacoes
+
+        macro = self.macros.get(nome)
+        if macro is None:
+            macro = self.carregar_macro(nome) if self.carregar_macro is not None else None
+            if macro is None:
+                raise ValueError(f"macro '{nome}' not found")
+            self.macros[nome] = macro
+        if herdados:
+            macro = dict(macro, **herdados)
+        self.pilha.append(nome)
+        try:
+            operacoes = compilar_macro(macro, repeticoes=1, carregar_macro=self, **parametros).operacoes
+        except ValueError as e:
+            raise ValueError(f"in '{nome}': {e}")
+        finally:
+            self.pilha.pop()
+        self.preparados[chave] = operacoes
+        return operacoes
+
+
+def resolver_acao_mouse(acao):
+    """Converte o nome de uma ação de mouse no enum correspondente"""
+    try:
+        return AcaoMouse(acao)
+    except ValueError:
+        if acao in ALIASES_ACAO_MOUSE:
+            return ALIASES_ACAO_MOUSE[acao]
+        raise
+
+
+def resolver_teclas(acao):
+    """Converte o texto de uma ação de teclado ("Ctrl + C") na tupla de teclas"""
+    teclas = tuple(t.strip().lower() for t in acao.split(" + "))
+    if not all(teclas):
+        raise ValueError(f"invalid key combination '{acao}'")
+    return teclas
+
+
+def ler_tempo(origem, chave, padrao, descricao):
+    """Lê um tempo opcional (em segundos) de um macro ou etapa"""
+    valor = origem.get(chave)
+    if valor is None or valor == "":
+        return padrao
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid {descricao} '{origem.get(chave)}'")
+    if valor < 0:
+        raise ValueError(f"{descricao} cannot be negative")
+    return valor
+
+
+def compilar_macro(macro, repeticoes=None, modo_tempo=None, tempo_fixo=None,
+                   tempo_min=0.3, tempo_max=2.0, escala_tempo=None, velocidade_maxima=None,
+                   carregar_macro=None):
+    """Compila um macro em um plano de execução imutável
+
+    Toda a interpretação das etapas (tipo, teclas, ação de mouse, tempos e
+    repetições por etapa) é feita aqui, uma única vez; o executor apenas
+    percorre o plano. Os parâmetros não informados são lidos do macro.
+    `escala_tempo` multiplica todos os tempos; com `velocidade_maxima`,
+    todos eles são zerados. Os macros chamados por etapas "call" vêm de
+    `carregar_macro(nome)` (ou de um ResolvedorChamadas) e entram no plano
+    já compilados. Lança ValueError indicando a etapa inválida.
+    """
+    if repeticoes is None:
+        repeticoes = macro.get("repeticoes", 1)
+    if modo_tempo is None:
+        modo_tempo = macro.get("modo_tempo", "steady")
+    if tempo_fixo is None:
+        tempo_fixo = macro.get("tempo_fixo", 0.3)
+    if escala_tempo is None:
+        escala_tempo = macro.get("escala_tempo", 1.0)
+    if velocidade_maxima is None:
+        velocidade_maxima = macro.get("velocidade_maxima", False)
+
+    try:
+        repeticoes = int(repeticoes)
+        tempo_fixo = float(tempo_fixo)
+        tempo_min = float(tempo_min)
+        tempo_max = float(tempo_max)
+        escala_tempo = float(escala_tempo)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid repetitions or time settings")
+    if repeticoes < 1:
+        raise ValueError("Repetitions must be at least 1")
+    if escala_tempo < 0:
+        raise ValueError("Time scale cannot be negative")
+    if velocidade_maxima:
+        escala_tempo = 0.0
+
+    # Pausas do macro (ou padrão), usadas pelas etapas que não definem as suas
+    try:
+        tempo_pressionar = ler_tempo(macro, "tempo_pressionar", TEMPO_PRESSIONAR, "hold time")
+        tempo_movimento = ler_tempo(macro, "tempo_movimento", TEMPO_MOVIMENTO, "travel time")
+        pausa_repeticao_etapa = ler_tempo(macro, "pausa_repeticao_etapa", PAUSA_REPETICAO_ETAPA,
+                                          "step repeat gap")
+        pausa_repeticoes = ler_tempo(macro, "pausa_repeticoes", PAUSA_REPETICOES, "repetition gap")
+    except ValueError as e:
+        raise ValueError(f"Macro: {e}")
+    if modo_tempo == "random" and tempo_max < tempo_min:
+        tempo_min, tempo_max = tempo_max, tempo_min
+
+    if isinstance(carregar_macro, ResolvedorChamadas):
+        resolvedor = carregar_macro
+    else:
+        resolvedor = ResolvedorChamadas(carregar_macro, macro.get("nome", ""))
+
+    operacoes = []
+    blocos_abertos = []     # (operações de fora do bloco, repetições, número da etapa de abertura)
+    for i, etapa in enumerate(macro.get("etapas", [])):
+        numero = i + 1
+        tipo = etapa.get("tipo", "keyboard")
+        acao = etapa.get("acao", "")
+
+        if tipo == TIPO_BLOCO:
+            try:
+                repeticoes_bloco = int(etapa.get("repeticoes", 1))
+            except (TypeError, ValueError):
+                raise ValueError(f"Step {numero}: invalid block repetitions")
+            if repeticoes_bloco < 1:
+                raise ValueError(f"Step {numero}: block repetitions must be at least 1")
+            blocos_abertos.append((operacoes, repeticoes_bloco, numero))
+            operacoes = []
+            continue
+        if tipo == TIPO_FIM_BLOCO:
+            if not blocos_abertos:
+                raise ValueError(f"Step {numero}: end of block without a matching block")
+            externas, repeticoes_bloco, _ = blocos_abertos.pop()
+            if operacoes:
+                externas.append(Bloco(repeticoes_bloco, tuple(operacoes)))
+            operacoes = externas
+            continue
+        if tipo == TIPO_CHAMADA:
+            if not acao:
+                raise ValueError(f"Step {numero}: macro to call not set")
+            try:
+                repeticoes_chamada = int(etapa.get("repeticoes", 1))
+            except (TypeError, ValueError):
+                raise ValueError(f"Step {numero}: invalid repetitions")
+            if repeticoes_chamada < 1:
+                raise ValueError(f"Step {numero}: repetitions must be at least 1")
+            # A escala já inclui a velocidade máxima; as pausas herdadas ainda não estão escaladas
+            parametros = {"escala_tempo": escala_tempo, "velocidade_maxima": False}
+            herdados = {}
+            if etapa.get("herdar_tempos", True):
+                parametros.update(modo_tempo=modo_tempo, tempo_fixo=tempo_fixo,
+                                  tempo_min=tempo_min, tempo_max=tempo_max)
+                herdados = {"tempo_pressionar": tempo_pressionar, "tempo_movimento": tempo_movimento,
+                            "pausa_repeticao_etapa": pausa_repeticao_etapa}
+            try:
+                chamadas = resolvedor.preparar(acao, herdados, parametros)
+            except ValueError as e:
+                raise ValueError(f"Step {numero}: {e}")
+            if chamadas:
+                operacoes.append(Bloco(repeticoes_chamada,
+                                       vincular_chamada(chamadas, i, acao, f"Step {numero}: {acao} › ")))
+            continue
+
+        # Tempo de espera após a etapa
+        if modo_tempo == "steady":
+            espera, variacao = tempo_fixo, 0.0
+        elif modo_tempo == "personalized":
+            try:
+                espera, variacao = float(etapa.get("tempo", 0.3)), 0.0
+            except (TypeError, ValueError):
+                raise ValueError(f"Step {numero}: invalid time '{etapa.get('tempo')}'")
+        elif modo_tempo == "random":
+            espera, variacao = tempo_min, tempo_max - tempo_min
+        else:
+            espera, variacao = 0.3, 0.0
+        if espera < 0:
+            raise ValueError(f"Step {numero}: time cannot be negative")
+
+        try:
+            repeticoes_etapa = int(etapa.get("repeticoes", 1))
+        except (TypeError, ValueError):
+            raise ValueError(f"Step {numero}: invalid repetitions")
+        try:
+            pausa_repeticao = ler_tempo(etapa, "pausa_repeticao_etapa", pausa_repeticao_etapa, "repeat gap")
+            if tipo == "mouse":
+                duracao = ler_tempo(etapa, "tempo_movimento", tempo_movimento, "travel time")
+            else:
+                duracao = ler_tempo(etapa, "tempo_pressionar", tempo_pressionar, "hold time")
+        except ValueError as e:
+            raise ValueError(f"Step {numero}: {e}")
+        espera *= escala_tempo
+        variacao *= escala_tempo
+        pausa_repeticao *= escala_tempo
+        duracao *= escala_tempo
+
+        if tipo in ("keyboard", "teclado"):
+            if not acao or acao == TEXTO_TECLA_PADRAO:
+                raise ValueError(f"Step {numero}: key not set")
+            try:
+                teclas = resolver_teclas(acao)
+            except ValueError as e:
+                raise ValueError(f"Step {numero}: {e}")
+            base = Operacao(i, TipoOperacao.TECLADO, teclas, None, None, 0, 0, 0,
+                            duracao, espera, variacao, f"Step {numero}: {acao}")
+        elif tipo == "mouse":
+            try:
+                acao_mouse = resolver_acao_mouse(acao)
+            except ValueError:
+                raise ValueError(f"Step {numero}: unknown mouse action '{acao}'")
+            try:
+                x, y = int(etapa.get("x", 0)), int(etapa.get("y", 0))
+            except (TypeError, ValueError):
+                raise ValueError(f"Step {numero}: invalid coordinates")
+            botao, cliques = CLIQUES_MOUSE[acao_mouse]
+            base = Operacao(i, TipoOperacao.MOUSE, (), acao_mouse, botao, cliques, x, y,
+                            duracao, espera, variacao, f"Step {numero}: 🖱️ {acao} em ({x},{y})")
+        else:
+            raise ValueError(f"Step {numero}: unknown step type '{tipo}'")
+
+        # Expandir repetições da etapa: pausa curta entre elas, tempo da etapa na última
+        for rep in range(repeticoes_etapa):
+            ultima = rep == repeticoes_etapa - 1
+            operacoes.append(base._replace(
+                espera=espera if ultima else pausa_repeticao,
+                variacao=variacao if ultima else 0.0,
+                mensagem=base.mensagem if rep == 0 else None,
+            ))
+
+    if blocos_abertos:
+        raise ValueError(f"Step {blocos_abertos[-1][2]}: block is not closed")
+
+    return PlanoExecucao(macro.get("nome", ""), tuple(operacoes), repeticoes,
+                         pausa_repeticoes * escala_tempo,
+                         any(type(item) is Bloco for item in operacoes),
+                         tuple(sorted(resolvedor.macros)))
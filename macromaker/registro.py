@@ -0,0 +1,97 @@
+"""Log de execução com limite de linhas e entrega em lotes
+
+A thread de execução só acrescenta mensagens a um buffer; quem exibe o log
+(o editor, em um timer do Tk) coleta as mensagens pendentes de uma vez.
+Opcionalmente, cada mensagem também vai, no momento em que é registrada,
+para uma fila gravada por uma thread própria em um arquivo com rotação por
+tamanho: o disco fica fora da thread da interface, e o arquivo recebe todas
+as mensagens, mesmo as que o buffer da tela descarta.
+"""
+
+import threading
+from collections import deque
+
+from .plano import operacoes_distintas
+
+# Níveis de detalhe: cada nível inclui os anteriores
+NIVEL_ERRO = 0      # apenas erros
+NIVEL_RESUMO = 1    # início de repetições, conclusão e resumo de tempos
+NIVEL_ETAPA = 2     # uma linha por etapa executada
+
+NIVEIS_LOG = {"errors": NIVEL_ERRO, "summary": NIVEL_RESUMO, "steps": NIVEL_ETAPA}
+
+# No modo "auto", as linhas por etapa só são registradas se as etapas
+# ficarem ao menos este intervalo (em segundos) separadas
+INTERVALO_MINIMO_ETAPAS = 0.05
+
+LIMITE_LINHAS = 1000
+TAMANHO_ARQUIVO_LOG = 1_000_000     # bytes por arquivo antes da rotação
+COPIAS_ARQUIVO_LOG = 3
+
+
+def resolver_nivel_log(nome, plano):
+    """Converte o nome do nível ("auto" ou um de NIVEIS_LOG) para o nível numérico"""
+    if nome != "auto":
+        return NIVEIS_LOG[nome]
+    intervalos = [op.duracao + op.espera for op in operacoes_distintas(plano.operacoes)]
+    if intervalos and min(intervalos) < INTERVALO_MINIMO_ETAPAS:
+        return NIVEL_RESUMO
+    return NIVEL_ETAPA
+
+
+class RegistroExecucao:
+    """Buffer circular das últimas `limite` mensagens, seguro entre threads
+
+    registrar() pode ser chamado de qualquer thread e não toca na interface;
+    coletar() devolve as mensagens ainda não exibidas. Se chegarem mais de
+    `limite` mensagens entre duas coletas, as mais antigas são descartadas
+    da tela (não do arquivo). Com `arquivo`, fechar() grava o que ainda
+    estiver na fila e fecha o arquivo.
+    """
+
+    def __init__(self, limite=LIMITE_LINHAS, arquivo=None):
+        self.limite = limite
+        self.pendentes = deque(maxlen=limite)
+        self.trava = threading.Lock()
+        self.fila_arquivo = None
+        self.gravador = None
+        if arquivo:
+            # Importados só aqui: sem arquivo de log, a partida não paga por logging
+            import logging.handlers
+            import queue
+
+            # Um manipulador por registro, sem logger global: cada instância grava só no seu arquivo
+            manipulador = logging.handlers.RotatingFileHandler(
+                arquivo, maxBytes=TAMANHO_ARQUIVO_LOG, backupCount=COPIAS_ARQUIVO_LOG, encoding="utf-8")
+            manipulador.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.fila_arquivo = queue.SimpleQueue()
+            self.gravador = logging.handlers.QueueListener(self.fila_arquivo, manipulador)
+            self.gravador.start()
+
+    def registrar(self, mensagem):
+        """Acrescenta uma mensagem (chamado pela thread de execução)"""
+        with self.trava:
+            self.pendentes.append(mensagem)
+        fila = self.fila_arquivo
+        if fila is not None:
+            import logging  # já carregado por __init__; aqui é só uma consulta a sys.modules
+
+            fila.put(logging.makeLogRecord(
+                {"msg": mensagem, "levelno": logging.INFO, "levelname": "INFO"}))
+
+    def coletar(self):
+        """Retorna e esvazia a lista de mensagens pendentes"""
+        with self.trava:
+            if not self.pendentes:
+                return []
+            lote = list(self.pendentes)
+            self.pendentes.clear()
+        return lote
+
+    def fechar(self):
+        if self.gravador is not None:
+            self.gravador.stop()
+            for manipulador in self.gravador.handlers:
+                manipulador.close()
+            self.gravador = None
+            self.fila_arquivo = None
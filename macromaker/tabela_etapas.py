@@ -0,0 +1,416 @@
+"""Tabela virtualizada de etapas do editor
+
+Só existem widgets para as linhas que cabem na área visível. Ao rolar, as
+mesmas linhas são reaproveitadas para exibir outras etapas, então o custo
+de atualizar a tabela é o mesmo para 10 ou 50 mil etapas.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from .modelo import ATUALIZACAO, INSERCAO, MOVIMENTO, REMOCAO
+from .plano import TEXTO_TECLA_PADRAO, TIPO_BLOCO, TIPO_CHAMADA, TIPO_FIM_BLOCO
+
+ALTURA_LINHA = 32       # altura fixa de cada linha, em pixels
+LINHAS_POR_GIRO = 3     # linhas roladas por passo da roda do mouse
+INTERVALO_REDESENHO = 16  # ms: alterações em rajada viram um redesenho por quadro
+RECUO_BLOCO = "│ "        # prefixo da ação por nível de bloco
+TEXTO_CHAMADA_PADRAO = "Click to choose macro"
+
+# Texto amigável para ações de mouse
+TEXTOS_ACAO_MOUSE = {
+    "move": "🖱️ Move",
+    "left_click": "🖱️ Left Click",
+    "right_click": "🖱️ Right Click",
+    "middle_click": "🖱️ Middle Click",
+    "double_left_click": "🖱️ Double Left Click",
+    "double_right_click": "🖱️ Double Right Click",
+}
+
+# Colunas da tabela (cabeçalho e linhas usam o mesmo grid)
+COLUNA_NUMERO, COLUNA_TIPO, COLUNA_ACAO, COLUNA_TEMPO, COLUNA_COORDS, COLUNA_REPETICOES, COLUNA_CONTROLES = range(7)
+
+
+def definir_texto(entry, texto):
+    """Altera o texto de um Entry apenas se mudou (preserva cursor e seleção)"""
+    texto = str(texto)
+    if entry.get() != texto:
+        entry.delete(0, tk.END)
+        entry.insert(0, texto)
+
+
+class LinhaEtapa:
+    """Widgets de uma linha da tabela, reaproveitados para qualquer etapa
+
+    Os callbacks leem `self.indice` no momento do evento, então a linha
+    sempre age sobre a etapa que está exibindo.
+    """
+
+    def __init__(self, parent, editor, tag_rolagem, var_texto_tempo):
+        self.editor = editor
+        self.indice = None
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(COLUNA_ACAO, weight=1)
+
+        # Número
+        self.lbl_numero = ttk.Label(self.frame, width=4)
+        self.lbl_numero.grid(row=0, column=COLUNA_NUMERO, padx=2)
+
+        # Dropdown Tipo (Teclado/Mouse)
+        self.combo_tipo = ttk.Combobox(self.frame, values=["keyboard", "mouse", TIPO_CHAMADA], width=6, state="readonly")
+        self.combo_tipo.grid(row=0, column=COLUNA_TIPO, padx=2)
+        self.combo_tipo.bind('<<ComboboxSelected>>',
+                             lambda e: self.acionar(editor.atualizar_tipo_etapa, self.combo_tipo.get()))
+
+        # Ação - Botão que muda conforme o tipo
+        self.btn_acao = ttk.Button(self.frame, width=22, command=self.configurar_acao)
+        self.btn_acao.grid(row=0, column=COLUNA_ACAO, padx=2, sticky="ew")
+
+        # Tempo - campo editável (personalized) ou texto informativo (demais modos)
+        self.entry_tempo = ttk.Entry(self.frame, width=8, validate="key")
+        self.entry_tempo.configure(validatecommand=(self.entry_tempo.register(editor.validar_numero), '%P'))
+        self.entry_tempo.grid(row=0, column=COLUNA_TEMPO, padx=2)
+        for evento in ('<KeyRelease>', '<FocusOut>'):
+            self.entry_tempo.bind(evento, lambda e: self.acionar(editor.atualizar_tempo_etapa, self.entry_tempo.get()))
+        self.lbl_tempo = ttk.Label(self.frame, width=8, textvariable=var_texto_tempo)
+        self.lbl_tempo.grid(row=0, column=COLUNA_TEMPO, padx=2)
+
+        # Campos X,Y (só mostra se for mouse)
+        self.frame_coords = ttk.Frame(self.frame)
+        self.frame_coords.grid(row=0, column=COLUNA_COORDS, padx=1)
+        ttk.Label(self.frame_coords, text="X:").pack(side=tk.LEFT)
+        self.entry_x = ttk.Entry(self.frame_coords, width=4, validate="key")
+        self.entry_x.configure(validatecommand=(self.entry_x.register(editor.validar_numero), '%P'))
+        self.entry_x.pack(side=tk.LEFT, padx=2)
+        ttk.Label(self.frame_coords, text="Y:").pack(side=tk.LEFT)
+        self.entry_y = ttk.Entry(self.frame_coords, width=4, validate="key")
+        self.entry_y.configure(validatecommand=(self.entry_y.register(editor.validar_numero), '%P'))
+        self.entry_y.pack(side=tk.LEFT, padx=2)
+        for evento in ('<KeyRelease>', '<FocusOut>'):
+            self.entry_x.bind(evento, lambda e: self.acionar(editor.atualizar_coordenada_x, self.entry_x.get()))
+            self.entry_y.bind(evento, lambda e: self.acionar(editor.atualizar_coordenada_y, self.entry_y.get()))
+        ttk.Button(self.frame_coords, text="📐", width=3,
+                   command=lambda: self.acionar(editor.capturar_posicao_mouse)).pack(side=tk.LEFT, padx=2)
+
+        # Campo de repetições (só mostra se o checkbox estiver ativo)
+        self.spin_repeticao = ttk.Spinbox(self.frame, from_=1, to=100, width=6, validate="key",
+                                          command=self.atualizar_repeticao_etapa)
+        self.spin_repeticao.configure(validatecommand=(self.spin_repeticao.register(editor.validar_numero), '%P'))
+        self.spin_repeticao.grid(row=0, column=COLUNA_REPETICOES, padx=2)
+        for evento in ('<KeyRelease>', '<FocusOut>'):
+            self.spin_repeticao.bind(evento, lambda e: self.atualizar_repeticao_etapa())
+
+        # Controles
+        controles_frame = ttk.Frame(self.frame)
+        controles_frame.grid(row=0, column=COLUNA_CONTROLES, padx=2)
+        controles = [
+            ("⎘", lambda: self.acionar(editor.copiar_etapa)),
+            ("▲", lambda: self.acionar(editor.mover_etapa, -1)),
+            ("▼", lambda: self.acionar(editor.mover_etapa, 1)),
+            ("✏️", lambda: self.acionar(editor.editar_etapa)),
+            ("🗑️", lambda: self.acionar(editor.remover_etapa)),
+        ]
+        for texto, comando in controles:
+            ttk.Button(controles_frame, text=texto, width=2, command=comando).pack(side=tk.LEFT, padx=1)
+
+        # Partes opcionais começam ocultas (grid() sem argumentos as restaura)
+        self.lbl_tempo.grid_remove()
+        self.frame_coords.grid_remove()
+        self.spin_repeticao.grid_remove()
+
+        # Roda do mouse sobre qualquer widget da linha rola a tabela
+        pendentes = [self.frame]
+        while pendentes:
+            widget = pendentes.pop()
+            widget.bindtags((tag_rolagem,) + widget.bindtags())
+            pendentes.extend(widget.winfo_children())
+
+    def acionar(self, metodo, *args):
+        """Chama um método do editor para a etapa exibida (ignorado se a linha está oculta)"""
+        if self.indice is not None:
+            metodo(self.indice, *args)
+
+    def configurar_acao(self):
+        if self.indice is None:
+            return
+        etapa = self.editor.modelo[self.indice]
+        tipo = etapa.get("tipo", "keyboard")
+        if tipo in (TIPO_BLOCO, TIPO_FIM_BLOCO):
+            self.editor.configurar_bloco(self.indice)
+        elif tipo == TIPO_CHAMADA:
+            self.editor.configurar_chamada(self.indice)
+        elif tipo == "keyboard":
+            self.editor.configurar_tecla(self.indice)
+        else:
+            self.editor.configurar_acao_mouse(self.indice)
+
+    def atualizar_repeticao_etapa(self):
+        self.acionar(self.editor.atualizar_repeticao_etapa, self.spin_repeticao.get())
+
+    def vincular(self, indice, etapa, modo_tempo, mostrar_repeticoes, profundidade=0):
+        """Exibe a etapa `indice` nesta linha (recuada `profundidade` níveis de bloco)"""
+        self.indice = indice
+        self.lbl_numero.config(text=str(indice + 1))
+
+        tipo_etapa = etapa.get("tipo", "keyboard")
+        self.combo_tipo.set(tipo_etapa)
+
+        if tipo_etapa in (TIPO_BLOCO, TIPO_FIM_BLOCO):
+            self.vincular_bloco(etapa, tipo_etapa, profundidade)
+            return
+        self.combo_tipo.config(state="readonly")
+
+        texto_acao = etapa["acao"]
+        if tipo_etapa == "mouse" and texto_acao != TEXTO_TECLA_PADRAO:
+            texto_acao = TEXTOS_ACAO_MOUSE.get(texto_acao, texto_acao)
+        elif tipo_etapa == TIPO_CHAMADA:
+            texto_acao = f"↪️ {texto_acao}" if texto_acao else TEXTO_CHAMADA_PADRAO
+        self.btn_acao.config(text=RECUO_BLOCO * profundidade + texto_acao)
+
+        if tipo_etapa == TIPO_CHAMADA:
+            # O macro chamado usa os tempos das próprias etapas
+            self.entry_tempo.grid_remove()
+            self.lbl_tempo.grid_remove()
+        elif modo_tempo == "personalized":
+            self.lbl_tempo.grid_remove()
+            definir_texto(self.entry_tempo, etapa["tempo"])
+            self.entry_tempo.grid()
+        else:
+            # Texto compartilhado por todas as linhas (var_texto_tempo)
+            self.entry_tempo.grid_remove()
+            self.lbl_tempo.grid()
+
+        if tipo_etapa == "mouse":
+            definir_texto(self.entry_x, etapa.get("x", 0))
+            definir_texto(self.entry_y, etapa.get("y", 0))
+            self.frame_coords.grid()
+        else:
+            self.frame_coords.grid_remove()
+
+        if mostrar_repeticoes:
+            definir_texto(self.spin_repeticao, etapa.get("repeticoes", 1))
+            self.spin_repeticao.grid()
+        else:
+            self.spin_repeticao.grid_remove()
+
+    def vincular_bloco(self, etapa, tipo_etapa, profundidade):
+        """Linha de abertura ou fim de bloco: só o tipo e a ação (que edita as repetições)"""
+        self.combo_tipo.config(state="disabled")
+        if tipo_etapa == TIPO_BLOCO:
+            texto_acao = f"🔁 Repeat ×{etapa.get('repeticoes', 1)}"
+        else:
+            texto_acao = "⤴️ End of block"
+        self.btn_acao.config(text=RECUO_BLOCO * profundidade + texto_acao)
+        self.entry_tempo.grid_remove()
+        self.lbl_tempo.grid_remove()
+        self.frame_coords.grid_remove()
+        self.spin_repeticao.grid_remove()
+
+
+class TabelaEtapas:
+    """Lista de etapas com rolagem virtual e linhas reaproveitadas
+
+    Observa o ModeloEtapas do editor: cada alteração marca apenas as linhas
+    visíveis afetadas, e todas as marcações feitas no mesmo quadro são
+    aplicadas juntas em um único redesenho.
+    """
+
+    def __init__(self, parent, editor):
+        self.editor = editor
+        self.modelo = editor.modelo
+        self.topo = 0           # índice da etapa exibida na primeira linha
+        self.linhas = []        # (LinhaEtapa, id da janela no canvas)
+        self.tag_rolagem = f"RolagemEtapas{id(self)}"
+
+        # Redesenho pendente: posições (relativas ao topo) a atualizar, ou tudo
+        self.posicoes_sujas = set()
+        self.tudo_sujo = False
+        self.redesenho_agendado = None
+
+        # Texto de tempo dos modos steady/random, compartilhado por todas as linhas
+        self.var_texto_tempo = tk.StringVar()
+
+        # Cabeçalho da tabela
+        self.cabecalho = ttk.Frame(parent)
+        self.cabecalho.pack(fill=tk.X)
+        self.cabecalho.columnconfigure(COLUNA_ACAO, weight=1)
+        ttk.Label(self.cabecalho, text="#", width=4).grid(row=0, column=COLUNA_NUMERO, padx=2)
+        ttk.Label(self.cabecalho, text="Type", width=8).grid(row=0, column=COLUNA_TIPO, padx=2)
+        ttk.Label(self.cabecalho, text="Action", width=22).grid(row=0, column=COLUNA_ACAO, padx=2, sticky="ew")
+        ttk.Label(self.cabecalho, text="Time (s)", width=10).grid(row=0, column=COLUNA_TEMPO, padx=2)
+        self.lbl_repeticoes = ttk.Label(self.cabecalho, text="Repeats", width=8)
+        self.lbl_repeticoes.grid(row=0, column=COLUNA_REPETICOES, padx=2)
+        self.lbl_repeticoes.grid_remove()
+        ttk.Label(self.cabecalho, text="Controls", width=15).grid(row=0, column=COLUNA_CONTROLES, padx=2)
+
+        # Área rolável: o canvas só contém as linhas visíveis
+        container = ttk.Frame(parent)
+        container.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(container, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(container, orient="vertical", command=self.rolar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind('<Configure>', self.ao_redimensionar)
+        self.canvas.bindtags((self.tag_rolagem,) + self.canvas.bindtags())
+        self.canvas.bind_class(self.tag_rolagem, '<MouseWheel>', self.ao_girar_roda)
+        self.canvas.bind_class(self.tag_rolagem, '<Button-4>', lambda e: self.ao_girar_roda(e, -1))
+        self.canvas.bind_class(self.tag_rolagem, '<Button-5>', lambda e: self.ao_girar_roda(e, 1))
+
+        self.largura = 1
+        self.capacidade = 0     # linhas que cabem inteiras na área visível
+        self.ajustar_linhas(self.canvas.winfo_reqheight())
+
+        self.modelo.observar(self.ao_alterar_modelo)
+
+    def ajustar_linhas(self, altura):
+        """Garante linhas suficientes para a altura visível (nunca destrói linhas)"""
+        self.capacidade = max(1, altura // ALTURA_LINHA)
+        necessarias = self.capacidade + 1   # uma a mais para a linha parcialmente visível
+        while len(self.linhas) < necessarias:
+            linha = LinhaEtapa(self.canvas, self.editor, self.tag_rolagem, self.var_texto_tempo)
+            item = self.canvas.create_window(0, len(self.linhas) * ALTURA_LINHA, window=linha.frame,
+                                             anchor="nw", width=self.largura, height=ALTURA_LINHA)
+            self.linhas.append((linha, item))
+
+    def ao_redimensionar(self, event):
+        if event.width != self.largura:
+            self.largura = event.width
+            for _, item in self.linhas:
+                self.canvas.itemconfigure(item, width=self.largura)
+        self.ajustar_linhas(event.height)
+        self.atualizar()
+
+    def ao_girar_roda(self, event, passos=None):
+        if passos is None:
+            # Windows/macOS: delta em múltiplos de 120 (ou pequenos valores no macOS)
+            passos = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        if passos:
+            self.rolar("scroll", passos * LINHAS_POR_GIRO, "units")
+        # Impede que Combobox/Spinbox da linha mudem de valor com a roda
+        return "break"
+
+    def rolar(self, *args):
+        """Comando da scrollbar ("moveto", fração) ou ("scroll", n, "units"/"pages")"""
+        total = len(self.modelo)
+        if args[0] == "moveto":
+            topo = int(round(float(args[1]) * total))
+        else:
+            passos = int(args[1])
+            if args[2] == "pages":
+                passos *= self.capacidade
+            topo = self.topo + passos
+        topo = max(0, min(topo, total - self.capacidade))
+        if topo != self.topo:
+            self.topo = topo
+            self.atualizar()
+
+    def mostrar_etapa(self, indice):
+        """Rola a tabela, se necessário, para que a etapa fique visível"""
+        if indice < self.topo:
+            self.topo = indice
+        elif indice >= self.topo + self.capacidade:
+            self.topo = indice - self.capacidade + 1
+        self.atualizar()
+
+    def ao_alterar_modelo(self, alteracao):
+        """Marca as linhas visíveis afetadas por uma alteração do modelo"""
+        if alteracao.tipo == ATUALIZACAO:
+            self.marcar(alteracao.indice, alteracao.indice + 1)
+        elif alteracao.tipo in (INSERCAO, REMOCAO):
+            # As etapas seguintes mudam de posição
+            self.marcar(alteracao.indice, None)
+        elif alteracao.tipo == MOVIMENTO:
+            self.marcar(min(alteracao.indice, alteracao.destino), max(alteracao.indice, alteracao.destino) + 1)
+        else:
+            self.topo = 0
+            self.invalidar()
+            return
+        if alteracao.tipo != ATUALIZACAO:
+            self.atualizar_scrollbar()
+
+    def marcar(self, inicio, fim):
+        """Marca para redesenho as etapas [inicio, fim) que estão visíveis (fim None = até o final)"""
+        fim_visivel = self.topo + len(self.linhas)
+        inicio = max(inicio, self.topo)
+        fim = fim_visivel if fim is None else min(fim, fim_visivel)
+        if inicio < fim:
+            self.posicoes_sujas.update(range(inicio - self.topo, fim - self.topo))
+            self.agendar_redesenho()
+
+    def invalidar(self):
+        """Marca todas as linhas visíveis para redesenho"""
+        self.tudo_sujo = True
+        self.agendar_redesenho()
+
+    def agendar_redesenho(self):
+        if self.redesenho_agendado is None:
+            self.redesenho_agendado = self.canvas.after(INTERVALO_REDESENHO, self.redesenhar)
+
+    def redesenhar(self):
+        """Aplica as marcações acumuladas desde o último redesenho"""
+        self.redesenho_agendado = None
+        if self.tudo_sujo:
+            self.atualizar()
+            return
+        total = len(self.modelo)
+        if self.topo > max(0, total - self.capacidade):
+            # Remoções no fim da lista deslocaram a janela visível
+            self.atualizar()
+            return
+        modo_tempo = self.editor.combo_modo_tempo.get()
+        mostrar_repeticoes = self.editor.var_repetir_acoes.get()
+        for posicao in self.posicoes_sujas:
+            self.vincular_posicao(posicao, total, modo_tempo, mostrar_repeticoes)
+        self.posicoes_sujas.clear()
+
+    def vincular_posicao(self, posicao, total, modo_tempo, mostrar_repeticoes):
+        linha, item = self.linhas[posicao]
+        indice = self.topo + posicao
+        if indice < total:
+            linha.vincular(indice, self.modelo[indice], modo_tempo, mostrar_repeticoes,
+                           self.modelo.profundidade(indice))
+            self.canvas.itemconfigure(item, state="normal")
+        else:
+            linha.indice = None
+            self.canvas.itemconfigure(item, state="hidden")
+
+    def atualizar_texto_tempo(self):
+        """Atualiza o tempo exibido nos modos steady/random (custo O(1))"""
+        editor = self.editor
+        if editor.combo_modo_tempo.get() == "steady":
+            self.var_texto_tempo.set(editor.entry_tempo_fixo.get())
+        else:  # aleatório
+            self.var_texto_tempo.set(f"{editor.entry_tempo_min.get()}-{editor.entry_tempo_max.get()}s")
+
+    def atualizar_scrollbar(self):
+        total = len(self.modelo)
+        if total > self.capacidade:
+            self.scrollbar.set(self.topo / total, (self.topo + self.capacidade) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def atualizar(self):
+        """Redesenha imediatamente todas as linhas visíveis (custo constante)"""
+        if self.redesenho_agendado is not None:
+            self.canvas.after_cancel(self.redesenho_agendado)
+            self.redesenho_agendado = None
+        self.tudo_sujo = False
+        self.posicoes_sujas.clear()
+
+        editor = self.editor
+        total = len(self.modelo)
+        self.topo = max(0, min(self.topo, total - self.capacidade))
+
+        # Informações comuns a todas as linhas, lidas uma única vez
+        self.atualizar_texto_tempo()
+        modo_tempo = editor.combo_modo_tempo.get()
+        mostrar_repeticoes = editor.var_repetir_acoes.get()
+        if mostrar_repeticoes:
+            self.lbl_repeticoes.grid()
+        else:
+            self.lbl_repeticoes.grid_remove()
+
+        for posicao in range(len(self.linhas)):
+            self.vincular_posicao(posicao, total, modo_tempo, mostrar_repeticoes)
+        self.atualizar_scrollbar()
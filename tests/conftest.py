@@ -0,0 +1,33 @@
+"""Configuração comum dos testes: o pacote é importado a partir da raiz do repositório
+
+Também reúne as fábricas de etapas e planos usadas por vários arquivos de
+teste (importadas com `from conftest import ...`).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from macromaker.plano import compilar_macro
+
+
+def tecla(acao, **extras):
+    return {"tipo": "keyboard", "acao": acao, "repeticoes": 1, **extras}
+
+
+def clique(x, y):
+    return {"tipo": "mouse", "acao": "left_click", "x": x, "y": y, "repeticoes": 1}
+
+
+def bloco(repeticoes):
+    return {"tipo": "block", "acao": "", "repeticoes": repeticoes}
+
+
+def fim_bloco():
+    return {"tipo": "end_block", "acao": ""}
+
+
+def plano(nome, *teclas, **opcoes):
+    """Compila um macro `nome` com uma etapa de teclado por combinação em `teclas`"""
+    return compilar_macro({"nome": nome, "etapas": [tecla(t) for t in teclas]}, **opcoes)
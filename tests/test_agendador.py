@@ -0,0 +1,94 @@
+"""Prazos absolutos: o tempo gasto nas ações não se acumula"""
+
+import threading
+import time
+
+import pytest
+
+from macromaker.agendador import Agendador
+
+
+class Relogio:
+    """Relógio simulado: só anda quando o teste manda"""
+
+    def __init__(self, agora=100.0):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+
+def test_tempo_das_acoes_nao_acumula_desvio():
+    relogio = Relogio()
+    agendador = Agendador(relogio=relogio)
+    agendador.iniciar()
+    for indice in range(20):
+        relogio.agora = max(relogio.agora, agendador.prazo)   # a espera termina no prazo
+        agendador.marcar(indice)
+        relogio.agora += 0.004      # a ação consome quase metade do intervalo
+        agendador.avancar(0.01)
+
+    # Os prazos contam do início: 20 × 10 ms, e não 20 × (10 ms + 4 ms)
+    assert agendador.prazo == pytest.approx(100.2)
+    resumo = agendador.resumo()
+    assert resumo["operacoes"] == 20
+    assert resumo["atraso_medio"] == resumo["atraso_maximo"] == 0.0
+    assert resumo["desvio_final"] == 0.0
+
+
+def test_totais_dos_atrasos():
+    relogio = Relogio()
+    agendador = Agendador(relogio=relogio)
+    agendador.iniciar()
+    for indice, atraso in enumerate([0.001, 0.030, 0.002, 0.030, 0.0]):
+        relogio.agora = agendador.prazo + atraso
+        agendador.marcar(indice)
+        agendador.avancar(0.1)
+    relogio.agora = agendador.prazo + 0.5
+
+    resumo = agendador.resumo()
+    assert resumo["operacoes"] == 5
+    assert resumo["atraso_medio"] == pytest.approx(0.063 / 5)
+    assert resumo["atraso_maximo"] == pytest.approx(0.03)
+    assert resumo["etapa_mais_atrasada"] == 2      # o primeiro dos dois maiores
+    assert resumo["desvio_final"] == pytest.approx(0.5)
+    assert resumo["duracao"] == pytest.approx(1.0)
+    assert resumo["acoes_por_segundo"] == pytest.approx(5.0)
+    assert agendador.ultimo_atraso == 0.0
+
+    agendador.iniciar()
+    assert agendador.resumo()["operacoes"] == 0
+
+
+def test_deslocar_adia_o_prazo_sem_contar_atraso():
+    relogio = Relogio()
+    agendador = Agendador(relogio=relogio)
+    agendador.iniciar()
+    relogio.agora += 2.0        # em pausa
+    agendador.deslocar(2.0)
+    agendador.marcar(0)
+
+    assert agendador.inicio == 102.0
+    assert agendador.resumo()["atraso_maximo"] == 0.0
+
+
+def test_interrupcao_encerra_a_espera():
+    agendador = Agendador()
+    agendador.iniciar()
+    interrupcao = threading.Event()
+    threading.Timer(0.05, interrupcao.set).start()
+
+    antes = time.perf_counter()
+    assert agendador.aguardar(agendador.prazo + 30, interrupcao) is False
+    assert time.perf_counter() - antes < 10
+
+
+def test_espera_termina_no_prazo_e_nao_antes():
+    agendador = Agendador()
+    agendador.iniciar()
+    prazo = agendador.prazo + 0.02
+    assert agendador.aguardar(prazo, threading.Event()) is True
+    assert time.perf_counter() >= prazo
+    prazo = time.perf_counter() + 0.02
+    assert agendador.aguardar(prazo) is True
+    assert time.perf_counter() >= prazo
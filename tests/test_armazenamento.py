@@ -0,0 +1,148 @@
+"""Biblioteca de macros: conversão sem perdas entre os formatos e a biblioteca SQLite"""
+
+import json
+
+import pytest
+
+from macromaker.armazenamento import carregar_macros, salvar_macros
+from macromaker.biblioteca import BibliotecaMacros
+from macromaker.binario import EtapasColunares
+from macromaker.plano import compilar_macro
+
+
+def biblioteca_exemplo():
+    """Macros com os casos difíceis: formatos de tempo, campos ausentes e chaves extras"""
+    return {
+        "Login ✓": {
+            "nome": "Login ✓", "modo_tempo": "personalized", "repeticoes": 2, "tempo_fixo": 0.3,
+            "etapas": [
+                {"tipo": "keyboard", "acao": "ctrl + a", "tempo": "0.300", "repeticoes": 1},
+                {"tipo": "keyboard", "acao": "enter", "tempo": "0.25", "tempo_pressionar": 0.05, "repeticoes": 3},
+                {"tipo": "mouse", "acao": "left_click", "x": -20, "y": 1079, "tempo": 1, "repeticoes": 1},
+                {"tipo": "mouse", "acao": "move", "x": 5, "y": 6, "tempo": "2", "tempo_movimento": "0.125"},
+                {"tipo": "keyboard", "acao": "a", "tempo": "soon", "nota": {"autor": "ana"}, "repeticoes": True},
+                {"acao": "b", "x": 2 ** 40},
+                {},
+            ],
+        },
+        "Vazio": {"nome": "Vazio", "etapas": []},
+        "Sem etapas": {"nome": "Sem etapas", "modo_tempo": "steady"},
+    }
+
+
+def como_texto(macros):
+    """JSON canônico: distingue 1, 1.0 e true, que são iguais em Python"""
+    return json.dumps(macros, sort_keys=True, default=list)
+
+
+@pytest.fixture
+def origem():
+    return biblioteca_exemplo()
+
+
+def test_json_binario_json_sem_perdas(tmp_path, origem):
+    salvar_macros(origem, tmp_path / "a.json")
+    salvar_macros(carregar_macros(tmp_path / "a.json"), tmp_path / "b.mmb")
+    binario = carregar_macros(tmp_path / "b.mmb")
+    salvar_macros(binario, tmp_path / "c.json")
+
+    assert isinstance(binario["Login ✓"]["etapas"], EtapasColunares)
+    assert "etapas" not in binario["Sem etapas"]
+    # Mesmos valores e tipos: "0.300", "0.25", 1, 0.05 e True voltam como estavam
+    assert como_texto(carregar_macros(tmp_path / "c.json")) == como_texto(origem)
+
+
+def test_etapas_binarias_sao_lidas_sob_demanda(tmp_path, origem):
+    salvar_macros(origem, tmp_path / "m.mmb")
+    etapas = carregar_macros(tmp_path / "m.mmb")["Login ✓"]["etapas"]
+    esperadas = origem["Login ✓"]["etapas"]
+
+    assert len(etapas) == len(esperadas)
+    assert etapas[2] == esperadas[2]
+    assert etapas[-1] == esperadas[-1]
+    assert etapas[1:3] == esperadas[1:3]
+    with pytest.raises(IndexError):
+        etapas[len(esperadas)]
+
+
+def test_plano_do_binario_igual_ao_do_json(tmp_path, origem):
+    origem["Login ✓"]["etapas"] = origem["Login ✓"]["etapas"][:4]
+    salvar_macros(origem, tmp_path / "m.mmb")
+    binario = carregar_macros(tmp_path / "m.mmb")["Login ✓"]
+    assert compilar_macro(binario) == compilar_macro(origem["Login ✓"])
+
+
+def test_arquivo_inexistente_e_biblioteca_vazia(tmp_path):
+    assert carregar_macros(tmp_path / "nada.json") == {}
+    assert carregar_macros(tmp_path / "nada.mmb") == {}
+    salvar_macros({}, tmp_path / "vazia.mmb")
+    assert carregar_macros(tmp_path / "vazia.mmb") == {}
+
+
+def test_arquivo_que_nao_e_biblioteca_binaria(tmp_path):
+    (tmp_path / "outro.mmb").write_bytes(b"not a library at all, just some bytes")
+    with pytest.raises(ValueError, match="is not a MacroMaker binary library"):
+        carregar_macros(tmp_path / "outro.mmb")
+
+
+def test_json_binario_sqlite_json_sem_perdas(tmp_path, origem):
+    salvar_macros(origem, tmp_path / "a.mmb")
+    salvar_macros(carregar_macros(tmp_path / "a.mmb"), tmp_path / "b.db")
+    salvar_macros(carregar_macros(tmp_path / "b.db"), tmp_path / "c.json")
+
+    # A biblioteca SQLite sempre guarda a lista de etapas, mesmo vazia
+    origem["Sem etapas"]["etapas"] = []
+    assert como_texto(carregar_macros(tmp_path / "b.db")) == como_texto(origem)
+    assert como_texto(carregar_macros(tmp_path / "c.json")) == como_texto(origem)
+
+
+def test_sqlite_grava_por_macro_e_mantem_os_outros(tmp_path, origem):
+    caminho = tmp_path / "macros.db"
+    salvar_macros(origem, caminho)
+    alterado = dict(origem["Vazio"], repeticoes=4)
+    salvar_macros({"Vazio": alterado}, caminho)
+
+    macros = carregar_macros(caminho)
+    assert set(macros) == set(origem)
+    assert macros["Vazio"]["repeticoes"] == 4
+    assert carregar_macros(caminho, nomes=["Vazio"]) == {"Vazio": alterado}
+
+
+def test_sqlite_falha_no_meio_nao_grava_nada(tmp_path, origem):
+    caminho = tmp_path / "macros.db"
+    salvar_macros(origem, caminho)
+    with pytest.raises(TypeError):
+        # O segundo macro não é serializável: a transação inteira é desfeita
+        salvar_macros({"Novo": {"nome": "Novo", "etapas": []}, "Ruim": {"nome": "Ruim", "etapas": [object()]}},
+                      caminho)
+    assert set(carregar_macros(caminho)) == set(origem)
+
+
+def test_busca_por_prefixo_e_por_trecho(tmp_path):
+    biblioteca = BibliotecaMacros(tmp_path / "macros.db")
+    try:
+        biblioteca.salvar_todos({nome: {"nome": nome, "etapas": []}
+                                 for nome in ("Login admin", "login rápido", "Farm 100%", "Logout", "Blogging")})
+        assert biblioteca.buscar("log") == ["Login admin", "login rápido", "Logout", "Blogging"]
+        assert biblioteca.buscar("0%") == ["Farm 100%"]
+        assert biblioteca.buscar("ggi") == ["Blogging"]
+        assert biblioteca.buscar("lo", limite=2) == ["Login admin", "login rápido"]
+        assert biblioteca.nomes(limite=2) == ["Blogging", "Farm 100%"]
+        assert len(biblioteca) == 5 and "Logout" in biblioteca
+        biblioteca.excluir("Logout")
+        assert "Logout" not in biblioteca and biblioteca.carregar("Logout") is None
+    finally:
+        biblioteca.fechar()
+
+
+def test_importa_o_json_uma_unica_vez(tmp_path, origem):
+    salvar_macros(origem, tmp_path / "macros.json")
+    biblioteca = BibliotecaMacros(tmp_path / "macros.db")
+    try:
+        biblioteca.salvar("Vazio", {"nome": "Vazio", "etapas": [], "repeticoes": 9})
+        assert biblioteca.importar_json(tmp_path / "macros.json") == 2
+        assert biblioteca.importar_json(tmp_path / "macros.json") == 0
+        # O macro que já estava no banco tem prioridade
+        assert biblioteca.carregar("Vazio")["repeticoes"] == 9
+    finally:
+        biblioteca.fechar()
@@ -0,0 +1,47 @@
+"""Motor asyncio: desistência no árbitro e muitas execuções em um único loop
+
+A ordem de atendimento e a não intercalação ficam em test_gerenciador.py,
+verificadas nos dois motores.
+"""
+
+import asyncio
+import threading
+
+from conftest import plano
+
+from macromaker.assincrono import ArbitroAssincrono, MotorAssincrono
+from macromaker.entrada import BackendMemoria
+from macromaker.registro import NIVEL_ERRO
+
+
+def test_arbitro_pula_pedido_desistido():
+    async def cenario():
+        loop = asyncio.get_running_loop()
+        arbitro = ArbitroAssincrono()
+        concedido = arbitro.pedir(0, loop)
+        desistente = arbitro.pedir(9, loop)
+        seguinte = arbitro.pedir(1, loop)
+        arbitro.desistir(desistente)
+        arbitro.liberar()
+        atendidos = (desistente.done(), seguinte.done())
+        arbitro.desistir(seguinte)      # já concedido: desistir devolve a entrada
+        return concedido.result(), atendidos, arbitro.ocupado
+
+    assert asyncio.run(cenario()) == (True, (False, True), False)
+
+
+def test_parar_todos_de_outra_thread():
+    # Sem árbitro: as 50 execuções pressionam "a" ao mesmo tempo
+    motor = MotorAssincrono(arbitrar=False)
+    backend = BackendMemoria()
+    try:
+        executores = [motor.criar(plano(str(i), "a", "b", tempo_fixo=5), backend=backend, nivel_log=NIVEL_ERRO)
+                      for i in range(50)]
+        threading.Timer(0.1, motor.parar_todos).start()
+        resumos = asyncio.run(asyncio.wait_for(motor.executar_todos(executores), 2))
+    finally:
+        motor.fechar()
+
+    assert all(resumo["concluido"] is False for resumo in resumos)
+    assert backend.eventos.count(("pressionar", "a")) == 50
+    assert ("pressionar", "b") not in backend.eventos
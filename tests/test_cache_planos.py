@@ -0,0 +1,91 @@
+"""Cache de planos: acertos, versões por parâmetros, descarte LRU e invalidação"""
+
+import pytest
+
+from macromaker.cache_planos import CachePlanos, estimar_tamanho
+from macromaker.plano import compilar_macro
+
+
+def macro(nome, *teclas):
+    return {"nome": nome, "etapas": [{"tipo": "keyboard", "acao": t, "repeticoes": 1} for t in teclas]}
+
+
+def test_mesmo_conteudo_reutiliza_o_plano():
+    cache = CachePlanos()
+    plano = cache.obter(macro("A", "a", "b"), repeticoes=2)
+
+    assert cache.obter(macro("A", "a", "b"), repeticoes=2) is plano
+    assert plano == compilar_macro(macro("A", "a", "b"), repeticoes=2)
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos"], estatisticas["falhas"], estatisticas["entradas"]) == (1, 1, 1)
+    assert estatisticas["ocupado"] == estimar_tamanho(plano)
+
+
+def test_macro_alterado_substitui_a_versao_anterior():
+    cache = CachePlanos()
+    antigo = cache.obter(macro("A", "a"))
+    novo = cache.obter(macro("A", "a", "b"))
+
+    assert novo is not antigo and len(cache) == 1
+    assert cache.obter(macro("A", "a", "b")) is novo
+    assert cache.estatisticas()["ocupado"] == estimar_tamanho(novo)
+
+
+def test_versoes_com_parametros_diferentes_convivem():
+    cache = CachePlanos()
+    editor = cache.obter(macro("A", "a"), repeticoes=3)
+    hotkey = cache.obter(macro("A", "a"))
+
+    assert len(cache) == 2
+    assert cache.obter(macro("A", "a"), repeticoes=3) is editor
+    # Alterar o macro na hotkey substitui só a versão dela
+    cache.obter(macro("A", "b"))
+    assert len(cache) == 2
+    assert cache.obter(macro("A", "a"), repeticoes=3) is editor
+    assert cache.obter(macro("A", "a")) is not hotkey
+
+
+def test_descarta_o_menos_usado_ao_passar_do_orcamento():
+    tamanho = estimar_tamanho(compilar_macro(macro("A", "a")))
+    cache = CachePlanos(orcamento=int(tamanho * 2.5))
+    a = cache.obter(macro("A", "a"))
+    cache.obter(macro("B", "a"))
+    assert cache.obter(macro("A", "a")) is a   # A passa a ser o mais recente
+    cache.obter(macro("C", "a"))
+
+    assert len(cache) == 2
+    assert cache.estatisticas()["descartes"] == 1
+    assert cache.obter(macro("A", "a")) is a
+    falhas = cache.estatisticas()["falhas"]
+    cache.obter(macro("B", "a"))
+    assert cache.estatisticas()["falhas"] == falhas + 1
+
+
+def test_plano_maior_que_o_orcamento_nao_e_guardado():
+    cache = CachePlanos(orcamento=10)
+    cache.obter(macro("A", "a"))
+    assert len(cache) == 0 and cache.estatisticas()["ocupado"] == 0
+
+
+def test_erro_de_validacao_nao_e_guardado():
+    cache = CachePlanos()
+    with pytest.raises(ValueError):
+        cache.obter(macro("A", ""))
+    assert len(cache) == 0
+
+
+def test_invalidar_descarta_o_macro_e_quem_o_chama():
+    biblioteca = {"Login": macro("Login", "a"), "Outro": macro("Outro", "b")}
+    chamador = {"nome": "Main", "etapas": [{"tipo": "call", "acao": "Login", "repeticoes": 2}]}
+    cache = CachePlanos()
+    cache.obter(biblioteca["Login"])
+    cache.obter(biblioteca["Login"], repeticoes=5)
+    principal = cache.obter(chamador, carregar_macro=biblioteca.get)
+    outro = cache.obter(biblioteca["Outro"])
+    assert len(cache) == 4
+
+    cache.invalidar("Login")
+    assert len(cache) == 1
+    assert cache.obter(biblioteca["Outro"]) is outro
+    assert cache.obter(chamador, carregar_macro=biblioteca.get) is not principal
+    assert cache.estatisticas()["ocupado"] == sum(entrada[1] for entrada in cache.entradas.values())
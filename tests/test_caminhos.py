@@ -0,0 +1,101 @@
+"""Simplificação de caminhos do mouse: tolerância e envelope de tempo"""
+
+import math
+import random
+
+import pytest
+
+from macromaker import caminhos
+from macromaker.caminhos import simplificar_caminho, simplificar_movimentos
+
+
+@pytest.fixture(params=["numpy", "python"])
+def implementacao(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(caminhos, "_numpy", False)
+    return request.param
+
+
+def distancia_segmento(ponto, a, b):
+    (px, py), (ax, ay), (bx, by) = ponto, a, b
+    dx, dy = bx - ax, by - ay
+    if dx == dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+
+def gesto(quantidade=400, semente=7):
+    """Curva suave com tremor, como um movimento gravado"""
+    sorteio = random.Random(semente)
+    return [(int(300 + 200 * math.cos(i / 60) + sorteio.uniform(-1, 1)),
+             int(300 + 150 * math.sin(i / 45) + sorteio.uniform(-1, 1))) for i in range(quantidade)]
+
+
+def movimento(x, y, tempo="0.000", tempo_movimento=0.01):
+    return {"tipo": "mouse", "acao": "move", "x": x, "y": y, "repeticoes": 1,
+            "tempo": tempo, "tempo_movimento": tempo_movimento}
+
+
+@pytest.mark.parametrize("tolerancia", [0.5, 2.0, 10.0])
+def test_pontos_descartados_ficam_dentro_da_tolerancia(implementacao, tolerancia):
+    pontos = gesto()
+    mantidos = simplificar_caminho(pontos, tolerancia)
+
+    assert mantidos[0] == 0 and mantidos[-1] == len(pontos) - 1
+    assert mantidos == sorted(set(mantidos))
+    assert len(mantidos) < len(pontos)
+    for inicio, fim in zip(mantidos, mantidos[1:]):
+        for i in range(inicio + 1, fim):
+            assert distancia_segmento(pontos[i], pontos[inicio], pontos[fim]) <= tolerancia + 1e-9
+
+
+def test_tolerancia_maior_mantem_menos_pontos(implementacao):
+    pontos = gesto()
+    quantidades = [len(simplificar_caminho(pontos, t)) for t in (0.5, 2.0, 10.0)]
+    assert quantidades == sorted(quantidades, reverse=True)
+    assert quantidades[0] > quantidades[-1]
+
+
+def test_numpy_e_python_mantem_os_mesmos_pontos(monkeypatch):
+    pytest.importorskip("numpy")
+    pontos = gesto(semente=3)
+    vetorizado = simplificar_caminho(pontos, 2.0)
+    monkeypatch.setattr(caminhos, "_numpy", False)
+    assert simplificar_caminho(pontos, 2.0) == vetorizado
+
+
+def test_linha_reta_fica_com_as_pontas(implementacao):
+    assert simplificar_caminho([(i, 2 * i) for i in range(50)], 0.5) == [0, 49]
+    assert simplificar_caminho([(0, 0), (5, 5)], 0.5) == [0, 1]
+
+
+def test_tempo_total_e_chegadas_preservados():
+    # x distinto em cada ponto, para achar a etapa gravada de cada ponto mantido
+    etapas = [movimento(i, y) for i, (_, y) in enumerate(gesto(200))]
+    simplificadas = simplificar_movimentos(etapas, tolerancia=2.0)
+
+    assert len(simplificadas) < len(etapas)
+    total = sum(e["tempo_movimento"] + float(e["tempo"]) for e in simplificadas)
+    assert total == pytest.approx(len(etapas) * 0.01, abs=1e-3)
+    # Cada ponto mantido é alcançado no instante da gravação
+    instante = 0.0
+    for etapa in simplificadas:
+        instante += etapa["tempo_movimento"]
+        assert instante == pytest.approx((etapa["x"] + 1) * 0.01, abs=1e-3)
+        instante += float(etapa["tempo"])
+
+
+def test_outras_etapas_e_paradas_separam_as_sequencias():
+    clique = {"tipo": "mouse", "acao": "left_click", "x": 9, "y": 9, "repeticoes": 1}
+    etapas = ([movimento(i, 0) for i in range(10)] + [clique]
+              + [movimento(i, 0) for i in range(10, 20)]
+              + [movimento(20, 0, tempo="0.500")] + [movimento(i, 0) for i in range(21, 30)])
+    simplificadas = simplificar_movimentos(etapas, tolerancia=1.0)
+
+    assert clique in simplificadas
+    # Pontas de cada sequência: 0-9, 10-20 (termina na parada) e 21-29
+    assert [(e["x"], e["acao"]) for e in simplificadas] == [
+        (0, "move"), (9, "move"), (9, "left_click"), (10, "move"), (20, "move"), (21, "move"), (29, "move")]
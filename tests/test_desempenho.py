@@ -0,0 +1,65 @@
+"""Comparação de resultados de benchmark: sentido da métrica, ruído e base zero"""
+
+import pytest
+
+from macromaker.desempenho import MAIOR, MENOR, comparar, metrica
+
+
+def resultado(**medidas):
+    """{"metricas": ...} a partir de nome=(valor, melhor[, ruido])"""
+    return {"metricas": {nome: {"valor": valores[0], "unidade": "x", "melhor": valores[1],
+                                "ruido": valores[2] if len(valores) > 2 else 0.0}
+                         for nome, valores in medidas.items()}}
+
+
+def regressoes(base, atual, **opcoes):
+    return {nome: regressao for nome, _, _, _, regressao in comparar(base, atual, **opcoes)}
+
+
+def test_sentido_da_metrica():
+    base = resultado(tempo_pior=(10.0, MENOR), tempo_melhor=(10.0, MENOR),
+                     vazao_pior=(1000.0, MAIOR), vazao_melhor=(1000.0, MAIOR))
+    atual = resultado(tempo_pior=(12.0, MENOR), tempo_melhor=(8.0, MENOR),
+                      vazao_pior=(850.0, MAIOR), vazao_melhor=(1200.0, MAIOR))
+    comparacao = comparar(base, atual)
+
+    assert [(nome, variacao) for nome, _, _, variacao, _ in comparacao] == [
+        ("tempo_pior", pytest.approx(0.2)), ("tempo_melhor", pytest.approx(-0.2)),
+        ("vazao_pior", pytest.approx(-0.15)), ("vazao_melhor", pytest.approx(0.2))]
+    assert regressoes(base, atual) == {"tempo_pior": True, "tempo_melhor": False,
+                                       "vazao_pior": True, "vazao_melhor": False}
+
+
+def test_limite_relativo():
+    base = resultado(tempo=(10.0, MENOR))
+    atual = resultado(tempo=(10.5, MENOR))
+
+    assert regressoes(base, atual) == {"tempo": False}
+    assert regressoes(base, atual, limite=0.01) == {"tempo": True}
+
+
+def test_piora_dentro_do_ruido_nao_e_regressao():
+    base = resultado(tempo=(10.0, MENOR))
+    # O ruído vale de qualquer um dos lados (o maior dos dois)
+    assert regressoes(base, resultado(tempo=(12.0, MENOR, 3.0))) == {"tempo": False}
+    assert regressoes(resultado(tempo=(10.0, MENOR, 3.0)), resultado(tempo=(12.0, MENOR))) == {"tempo": False}
+    assert regressoes(base, resultado(tempo=(14.0, MENOR, 3.0))) == {"tempo": True}
+
+
+def test_base_zero():
+    base = resultado(erros=(0.0, MENOR), acertos=(0.0, MAIOR))
+    comparacao = comparar(base, resultado(erros=(5.0, MENOR), acertos=(5.0, MAIOR)))
+
+    assert comparacao == [("erros", 0.0, 5.0, 0.0, True), ("acertos", 0.0, 5.0, 0.0, False)]
+
+
+def test_metricas_sem_base_sao_ignoradas():
+    atual = resultado(nova=(1.0, MENOR), antiga=(1.0, MENOR))
+
+    assert [item[0] for item in comparar(resultado(antiga=(1.0, MENOR)), atual)] == ["antiga"]
+    assert comparar({}, atual) == []
+
+
+def test_ruido_da_metrica_inclui_a_dispersao():
+    assert metrica([3.0, 1.0, 2.0], "ms") == {"valor": 2.0, "unidade": "ms", "melhor": MENOR, "ruido": 2.0}
+    assert metrica([100.0, 101.0], "ops/s", MAIOR, ruido=15.0)["ruido"] == 15.0
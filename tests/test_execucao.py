@@ -0,0 +1,115 @@
+"""Os dois motores de execução (threads e asyncio) conduzem o mesmo laço"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from conftest import clique, tecla
+
+from macromaker.assincrono import ExecutorAssincrono
+from macromaker.entrada import BackendMemoria
+from macromaker.execucao import Executor
+from macromaker.plano import compilar_macro
+from macromaker.registro import NIVEL_ERRO
+
+
+class BackendFalho(BackendMemoria):
+    """Falha ao pressionar "b" e ao clicar, gravando o resto normalmente"""
+
+    def pressionar(self, tecla):
+        super().pressionar(tecla)
+        if tecla == "b":
+            raise OSError("key refused")
+
+    def clicar(self, botao, cliques=1):
+        raise OSError("click refused")
+
+
+def executar_em_thread(executor):
+    """Inicia a execução em outra thread; retorna a função que espera o resumo"""
+    resultado = {}
+
+    def alvo():
+        if isinstance(executor, ExecutorAssincrono):
+            resultado["resumo"] = asyncio.run(executor.executar())
+        else:
+            resultado["resumo"] = executor.executar()
+
+    thread = threading.Thread(target=alvo)
+    thread.start()
+
+    def esperar():
+        thread.join(5)
+        assert not thread.is_alive()
+        return resultado["resumo"]
+    return esperar
+
+
+@pytest.fixture(params=[Executor, ExecutorAssincrono], ids=["threads", "asyncio"])
+def motor(request):
+    return request.param
+
+
+def test_envia_os_mesmos_eventos_em_ordem(motor):
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("ctrl + c"), clique(10, 20), tecla("a")]},
+                           repeticoes=2, velocidade_maxima=True)
+    backend = BackendMemoria()
+    resumo = executar_em_thread(motor(plano, backend=backend, nivel_log=NIVEL_ERRO))()
+
+    uma_vez = [("pressionar", "ctrl"), ("pressionar", "c"), ("soltar", "c"), ("soltar", "ctrl"),
+               ("mover", 10, 20), ("clicar", "left", 1),
+               ("pressionar", "a"), ("soltar", "a")]
+    assert backend.eventos == uma_vez * 2
+    assert resumo["concluido"] is True
+    assert resumo["operacoes"] == 6
+
+
+def test_erro_do_backend_e_registrado_e_solta_as_teclas(motor):
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("a + b"), clique(1, 2), tecla("c")]},
+                           velocidade_maxima=True)
+    backend = BackendFalho()
+    mensagens = []
+    resumo = executar_em_thread(motor(plano, backend=backend, ao_registrar=mensagens.append,
+                                      nivel_log=NIVEL_ERRO))()
+
+    assert backend.eventos == [("pressionar", "a"), ("pressionar", "b"), ("soltar", "b"), ("soltar", "a"),
+                               ("mover", 1, 2), ("pressionar", "c"), ("soltar", "c")]
+    assert mensagens == ["❌ Error executing keyboard action 'a + b': key refused",
+                         "❌ Error executing mouse action 'left_click' at (1,2): click refused"]
+    assert resumo["concluido"] is True
+
+
+def test_parada_interrompe_a_tecla_segurada(motor):
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("a", tempo_pressionar="5"), tecla("b")]},
+                           tempo_fixo=0)
+    backend = BackendMemoria()
+    executor = motor(plano, backend=backend, nivel_log=NIVEL_ERRO)
+    inicio = time.perf_counter()
+    esperar = executar_em_thread(executor)
+    time.sleep(0.1)
+    executor.parar()
+    resumo = esperar()
+
+    assert time.perf_counter() - inicio < 1
+    assert backend.eventos == [("pressionar", "a"), ("soltar", "a")]
+    assert resumo["concluido"] is False
+
+
+def test_pausa_nao_conta_como_atraso(motor):
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("a"), tecla("b")]},
+                           tempo_fixo=0.3, velocidade_maxima=False)
+    backend = BackendMemoria(com_tempo=True)
+    executor = motor(plano, backend=backend, nivel_log=NIVEL_ERRO)
+    esperar = executar_em_thread(executor)
+    time.sleep(0.1)
+    executor.pausar()
+    time.sleep(0.4)
+    executor.retomar()
+    resumo = esperar()
+
+    pressionados = [evento[2] for evento in backend.eventos if evento[0] == "pressionar"]
+    # Intervalo planejado (~0.3 s) somado ao tempo em pausa (0.4 s)
+    assert pressionados[1] - pressionados[0] > 0.6
+    assert resumo["concluido"] is True
+    assert resumo["atraso_maximo"] < 0.2
@@ -0,0 +1,149 @@
+"""Execuções simultâneas: ordem do árbitro, fila por prioridade e operações não intercaladas
+
+A ordem de atendimento e a não intercalação valem para os dois motores
+(threads com GerenciadorExecucoes e asyncio com MotorAssincrono).
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from conftest import plano
+
+from macromaker.assincrono import ArbitroAssincrono, MotorAssincrono
+from macromaker.entrada import BackendMemoria
+from macromaker.gerenciador import CONCLUIDA, PARADA, ArbitroEntrada, GerenciadorExecucoes, ler_prioridade
+from macromaker.registro import NIVEL_ERRO
+
+PEDIDOS = [("baixa", 1), ("alta 1", 5), ("media", 3), ("alta 2", 5)]
+
+
+def esperar_ate(condicao, limite=2.0):
+    fim = time.perf_counter() + limite
+    while not condicao():
+        assert time.perf_counter() < fim, "timed out"
+        time.sleep(0.001)
+
+
+def atender_com_threads(pedidos):
+    """Uma thread por pedido, todas na fila enquanto a entrada está ocupada; retorna (ordem, livre ao fim)"""
+    arbitro = ArbitroEntrada()
+    assert arbitro.adquirir("dono")
+    ordem = []
+
+    def pedir(nome, prioridade):
+        assert arbitro.adquirir(nome, prioridade)
+        ordem.append(nome)
+        arbitro.liberar()
+
+    threads = []
+    for nome, prioridade in pedidos:
+        thread = threading.Thread(target=pedir, args=(nome, prioridade))
+        thread.start()
+        threads.append(thread)
+        esperar_ate(lambda: len(arbitro.fila) == len(threads))
+    arbitro.liberar()
+    for thread in threads:
+        thread.join(2)
+    return ordem, arbitro.dono is None and arbitro.fila == []
+
+
+def atender_com_asyncio(pedidos):
+    """Os mesmos pedidos como futuros no loop; cada liberação deve atender exatamente um"""
+    async def cenario():
+        loop = asyncio.get_running_loop()
+        arbitro = ArbitroAssincrono()
+        assert arbitro.pedir(0, loop).result() is True
+        futuros = {nome: arbitro.pedir(prioridade, loop) for nome, prioridade in pedidos}
+        ordem = []
+        while True:
+            arbitro.liberar()
+            atendidos = [nome for nome, futuro in futuros.items() if futuro.done() and nome not in ordem]
+            if not atendidos:
+                break
+            assert len(atendidos) == 1
+            ordem.extend(atendidos)
+        return ordem, not arbitro.ocupado
+
+    return asyncio.run(cenario())
+
+
+def executar_com_gerenciador(planos, backend):
+    gerenciador = GerenciadorExecucoes()
+    execucoes = [gerenciador.iniciar(p, backend=backend, nivel_log=NIVEL_ERRO) for p in planos]
+    gerenciador.aguardar_todas()
+    return [execucao.resumo for execucao in execucoes]
+
+
+def executar_no_loop(planos, backend):
+    motor = MotorAssincrono()
+    try:
+        executores = [motor.criar(p, backend=backend, nivel_log=NIVEL_ERRO) for p in planos]
+        return asyncio.run(motor.executar_todos(executores))
+    finally:
+        motor.fechar()
+
+
+@pytest.mark.parametrize("atender", [atender_com_threads, atender_com_asyncio], ids=["threads", "asyncio"])
+def test_arbitro_atende_maior_prioridade_e_depois_ordem_de_chegada(atender):
+    ordem, livre = atender(PEDIDOS)
+
+    assert ordem == ["alta 1", "alta 2", "media", "baixa"]
+    assert livre
+
+
+def test_arbitro_desiste_quando_nao_pode_continuar():
+    arbitro = ArbitroEntrada()
+    assert arbitro.adquirir("dono")
+    continuar = threading.Event()
+    continuar.set()
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(arbitro.adquirir("outro", 9, continuar.is_set)))
+    thread.start()
+    esperar_ate(lambda: arbitro.fila)
+    continuar.clear()
+    arbitro.acordar()
+    thread.join(2)
+
+    assert resultado == [False]
+    assert arbitro.fila == [] and arbitro.dono == "dono"
+
+
+@pytest.mark.parametrize("executar", [executar_com_gerenciador, executar_no_loop], ids=["threads", "asyncio"])
+def test_combinacoes_de_execucoes_simultaneas_nao_se_intercalam(executar):
+    backend = BackendMemoria()
+    resumos = executar([plano(nome, teclas, teclas, tempo_fixo=0, escala_tempo=0.05)
+                        for nome, teclas in [("A", "ctrl + a"), ("B", "shift + b"), ("C", "alt + c")]], backend)
+
+    assert [resumo["concluido"] for resumo in resumos] == [True, True, True]
+    assert len(backend.eventos) == 24
+    for i in range(0, 24, 4):
+        pressionar_1, pressionar_2, soltar_2, soltar_1 = backend.eventos[i:i + 4]
+        assert pressionar_1[0] == pressionar_2[0] == "pressionar"
+        assert (soltar_2, soltar_1) == (("soltar", pressionar_2[1]), ("soltar", pressionar_1[1]))
+
+
+def test_fila_alem_do_limite_por_prioridade():
+    concluidas = []
+    gerenciador = GerenciadorExecucoes(limite=1, ao_concluir=lambda execucao: concluidas.append(execucao.nome))
+    backend = BackendMemoria()
+    primeira = gerenciador.iniciar(plano("primeira", "a", tempo_fixo=0.05), backend=backend, nivel_log=NIVEL_ERRO)
+    gerenciador.iniciar(plano("baixa", "b", velocidade_maxima=True), backend=backend, nivel_log=NIVEL_ERRO)
+    gerenciador.iniciar(plano("alta", "c", velocidade_maxima=True), prioridade=9, backend=backend,
+                        nivel_log=NIVEL_ERRO)
+    descartada = gerenciador.iniciar(plano("descartada", "d"), prioridade=5, backend=backend, nivel_log=NIVEL_ERRO)
+    gerenciador.parar(descartada)
+    gerenciador.aguardar_todas()
+
+    assert concluidas == ["descartada", "primeira", "alta", "baixa"]
+    assert primeira.estado == CONCLUIDA
+    assert descartada.estado == PARADA and descartada.resumo["concluido"] is False
+    assert ("pressionar", "d") not in backend.eventos
+
+
+def test_ler_prioridade():
+    assert ler_prioridade({}) == 0
+    assert ler_prioridade({"prioridade": "3"}) == 3
+    with pytest.raises(ValueError, match="invalid priority 'max'"):
+        ler_prioridade({"prioridade": "max"})
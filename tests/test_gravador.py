@@ -0,0 +1,122 @@
+"""Conversão da gravação em etapas, a partir de eventos sintéticos (sem ganchos reais)"""
+
+from collections import namedtuple
+
+import pytest
+
+from macromaker.gravador import MOUSE, TECLADO, BufferEventos, Gravador, _descartar_final, converter_gravacao
+
+# Os mesmos campos usados dos eventos das bibliotecas keyboard e mouse
+EventoTecla = namedtuple("EventoTecla", ["event_type", "name", "time"])
+EventoBotao = namedtuple("EventoBotao", ["event_type", "button", "time"])
+EventoMovimento = namedtuple("EventoMovimento", ["x", "y", "time"])
+
+
+def teclas(*eventos):
+    """(tipo, nome, instante) -> itens (instante, fonte, evento) como os de Gravador.parar()"""
+    return [(t, TECLADO, EventoTecla(tipo, nome, t)) for tipo, nome, t in eventos]
+
+
+def botao(tipo, nome, t):
+    return (t, MOUSE, EventoBotao(tipo, nome, t))
+
+
+def movimento(x, y, t):
+    return (t, MOUSE, EventoMovimento(x, y, t))
+
+
+def test_combinacoes_repeticao_automatica_e_modificador_sozinho():
+    eventos = teclas(("down", "left ctrl", 0.0), ("down", "c", 0.1),
+                     ("down", "c", 0.15), ("down", "c", 0.2),   # repetição automática
+                     ("up", "c", 0.3), ("up", "left ctrl", 0.35),
+                     ("down", "a", 1.0), ("up", "a", 1.2),
+                     ("down", "shift", 2.0), ("up", "shift", 2.5))
+    etapas = converter_gravacao(eventos)
+
+    assert [etapa["acao"] for etapa in etapas] == ["Ctrl + c", "a", "Shift"]
+    # Tempo pressionada e, em "tempo", o intervalo real até a próxima etapa menos esse tempo
+    assert [etapa["tempo_pressionar"] for etapa in etapas] == [0.2, 0.2, 0.5]
+    assert [etapa["tempo"] for etapa in etapas] == ["0.700", "0.800", "0.000"]
+    assert all(etapa["tipo"] == "keyboard" and etapa["repeticoes"] == 1 for etapa in etapas)
+
+
+def test_teclas_sobrepostas_sao_soltas_antes_da_proxima():
+    etapas = converter_gravacao(teclas(("down", "a", 0.0), ("down", "b", 0.1), ("up", "a", 0.25), ("up", "b", 0.3)))
+
+    assert [(etapa["acao"], etapa["tempo_pressionar"], etapa["tempo"]) for etapa in etapas] == [
+        ("a", 0.1, "0.000"), ("b", 0.2, "0.000")]
+
+
+def test_cliques_duplos_e_posicao_do_cursor():
+    eventos = [movimento(5, 6, 0.0),
+               botao("down", "left", 0.1), botao("up", "left", 0.15),
+               botao("down", "left", 0.3), botao("up", "left", 0.35),   # junta-se ao anterior
+               botao("down", "left", 1.0), botao("up", "left", 1.05),   # longe demais no tempo
+               movimento(7, 8, 1.1),
+               botao("down", "left", 1.2),                              # outra posição
+               botao("down", "middle", 1.3), botao("down", "middle", 1.4),
+               botao("down", "x", 1.5)]                                 # botão ignorado
+    etapas = converter_gravacao(eventos, posicao_inicial=(1, 1))
+
+    assert [(etapa["acao"], etapa["x"], etapa["y"]) for etapa in etapas] == [
+        ("double_left_click", 5, 6), ("left_click", 5, 6), ("left_click", 7, 8),
+        ("middle_click", 7, 8), ("middle_click", 7, 8)]
+    assert [etapa["tempo"] for etapa in etapas] == ["0.900", "0.200", "0.100", "0.100", "0.000"]
+    assert all(etapa["tempo_movimento"] == 0.0 for etapa in etapas)
+
+
+def test_movimentos_viram_etapas_so_quando_pedido():
+    eventos = [movimento(1, 2, 0.0), botao("down", "right", 0.5), movimento(3, 4, 1.0), botao("down", "left", 1.5)]
+
+    etapas = converter_gravacao(eventos)
+    assert [(etapa["acao"], etapa["x"], etapa["y"]) for etapa in etapas] == [("right_click", 1, 2), ("left_click", 3, 4)]
+    etapas = converter_gravacao(eventos, movimentos=True)
+    assert [(etapa["acao"], etapa["x"], etapa["y"]) for etapa in etapas] == [
+        ("move", 1, 2), ("right_click", 1, 2), ("move", 3, 4), ("left_click", 3, 4)]
+
+
+def test_descarta_a_hotkey_final_e_os_movimentos_ate_ela():
+    eventos = teclas(("down", "a", 0.0), ("up", "a", 0.1))
+    eventos += [movimento(1, 1, 0.2), movimento(2, 2, 0.3)]
+    eventos += teclas(("down", "right ctrl", 0.4), ("down", "f9", 0.5))
+    _descartar_final(eventos, " ctrl + F9".split("+"), descartar_clique=False)
+
+    assert [evento.time for _, _, evento in eventos] == [0.0, 0.1]
+
+
+def test_descarta_so_o_ultimo_clique():
+    eventos = [botao("down", "left", 0.0), botao("up", "left", 0.1),
+               botao("down", "left", 1.0), botao("up", "left", 1.1), movimento(9, 9, 1.2)]
+    _descartar_final(eventos, (), descartar_clique=True)
+    assert [evento.time for _, _, evento in eventos] == [0.0, 0.1]
+
+    # Sem descartar o clique, só os movimentos finais saem
+    eventos = [botao("down", "left", 0.0), movimento(9, 9, 1.2)]
+    _descartar_final(eventos, (), descartar_clique=False)
+    assert [evento.time for _, _, evento in eventos] == [0.0]
+
+
+@pytest.mark.parametrize("capacidade, eventos, esperado, perdidos", [
+    (5, 3, [0, 1, 2], 0),               # capacidade arredondada para 8
+    (8, 8, list(range(8)), 0),
+    (5, 11, list(range(3, 11)), 3),     # os 3 mais antigos sobrescritos
+    (4, 10, [6, 7, 8, 9], 6),
+])
+def test_buffer_circular(capacidade, eventos, esperado, perdidos):
+    buffer = BufferEventos(capacidade)
+    for i in range(eventos):
+        buffer.acrescentar(i)
+    assert buffer.conteudo() == (esperado, perdidos)
+
+
+def test_parar_intercala_as_fontes_por_tempo():
+    gravador = Gravador(capacidade=2)
+    for t in (0.1, 0.3, 0.5):
+        gravador.teclado.acrescentar(EventoTecla("down", "a", t))
+    for t in (0.2, 0.4):
+        gravador.mouse.acrescentar(EventoMovimento(0, 0, t))
+    eventos = gravador.parar()
+
+    assert [(instante, fonte) for instante, fonte, _ in eventos] == [
+        (0.2, MOUSE), (0.3, TECLADO), (0.4, MOUSE), (0.5, TECLADO)]
+    assert gravador.descartados == 1
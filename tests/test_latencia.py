@@ -0,0 +1,78 @@
+"""Latência do gatilho à primeira ação: percentis, histograma e arquivo de amostras"""
+
+import pytest
+
+from macromaker.latencia import (ATENDIDO, GATILHO, INICIO, PLANO, PRIMEIRA_ACAO, MedicaoLatencia, RegistroLatencias,
+                                 percentil)
+
+
+def medicao(*marcas_ns):
+    """Medição com as marcas dadas (gatilho, atendido, plano, inicio, primeira_acao), em ns"""
+    resultado = MedicaoLatencia()
+    resultado.marcas = dict(zip((GATILHO, ATENDIDO, PLANO, INICIO, PRIMEIRA_ACAO), marcas_ns))
+    return resultado
+
+
+def registro_com(totais_ns, janela=1000):
+    registro = RegistroLatencias(janela)
+    for total in totais_ns:
+        registro.registrar(medicao(0, 0, 0, 0, total))
+    return registro
+
+
+@pytest.mark.parametrize("valores, p, esperado", [
+    (list(range(1, 101)), 50, 50),
+    (list(range(1, 101)), 95, 95),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 101)), 100, 100),
+    ([10, 20, 30], 50, 20),     # posto 1.5 arredondado para cima
+    ([10, 20, 30], 0, 10),
+    ([7], 99, 7),
+    ([], 50, None),
+])
+def test_percentil_pelo_posto_mais_proximo(valores, p, esperado):
+    assert percentil(valores, p) == esperado
+
+
+def test_trechos_da_medicao():
+    assert medicao(0, 100, 300, 600, 1000).trechos() == {
+        "fila": 100, "preparo": 200, "despacho": 300, "primeira_acao": 400, "total": 1000}
+    # Sem marcas intermediárias (ex.: execução pela linha de comando) só os trechos completos
+    assert medicao(0).trechos() == {}
+
+
+def test_resumo_em_milissegundos_e_janela_movel():
+    registro = registro_com([i * 1_000_000 for i in range(1, 101)], janela=50)
+    total = registro.resumo()["total"]
+
+    # Só as 50 últimas amostras (51 a 100 ms) ficam na janela
+    assert total == {"n": 50, "p50": 75.0, "p95": 98.0, "p99": 100.0, "max": 100.0}
+    assert registro.versao == 100
+
+
+def test_histograma_por_potencias_de_2_de_microssegundos():
+    registro = registro_com([500, 1_000, 1_500, 3_000, 1_000_000])
+
+    assert registro.histograma() == {1: 1, 2: 2, 4: 1, 1024: 1}
+    assert registro.histograma("fila") == {1: 5}
+    assert registro.histograma("inexistente") == {}
+
+
+def test_salvar_e_carregar(tmp_path):
+    caminho = str(tmp_path / "latencias.json")
+    original = registro_com([1_000_000, 2_000_000, 3_000_000])
+    original.salvar(caminho)
+
+    lido = RegistroLatencias()
+    lido.carregar(caminho)
+    assert lido.resumo() == original.resumo()
+    assert list(lido.amostras["total"]) == [1_000_000, 2_000_000, 3_000_000]
+
+    # Carregar acrescenta às amostras já existentes, respeitando a janela
+    pequeno = registro_com([9_000_000], janela=2)
+    pequeno.carregar(caminho)
+    assert list(pequeno.amostras["total"]) == [2_000_000, 3_000_000]
+
+    ausente = RegistroLatencias()
+    ausente.carregar(str(tmp_path / "nao_existe.json"))
+    assert ausente.resumo() == {} and ausente.versao == 0
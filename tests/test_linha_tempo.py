@@ -0,0 +1,65 @@
+"""Linha do tempo: registros, resumo e exportação Chrome Trace"""
+
+import json
+
+from conftest import tecla
+
+from macromaker.entrada import BackendMemoria
+from macromaker.execucao import Executor
+from macromaker.linha_tempo import LinhaTempo, exportar_trace
+from macromaker.plano import compilar_macro
+from macromaker.registro import NIVEL_ERRO
+
+
+def executar(plano):
+    linha = LinhaTempo(plano.nome)
+    Executor(plano, backend=BackendMemoria(), nivel_log=NIVEL_ERRO, linha_tempo=linha).executar()
+    return linha
+
+
+def test_registra_cada_operacao_com_tempos_coerentes():
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("a"), tecla("b")]},
+                           repeticoes=2, velocidade_maxima=True)
+    linha = executar(plano)
+
+    assert len(linha.registros) == 4
+    for repeticao, op, prazo, inicio, fim, espera, backend in linha.registros:
+        assert inicio >= prazo
+        assert fim >= inicio
+        assert espera >= 0 and backend >= 0
+    resumo = linha.resumo()
+    assert resumo["operacoes"] == 4
+    assert {etapa["etapa"] for etapa in resumo["mais_lentas"]} == {1, 2}
+
+
+def test_etapa_de_chamada_aparece_como_a_chamada():
+    macros = {"Login": {"nome": "Login", "etapas": [
+        tecla("ctrl + a"),
+        {"tipo": "mouse", "acao": "left_click", "x": 5, "y": 5, "repeticoes": 1},
+        tecla("enter"),
+    ]}}
+    plano = compilar_macro({"nome": "Main", "etapas": [
+        {"tipo": "call", "acao": "Login", "repeticoes": 4},
+        tecla("x"),
+    ]}, velocidade_maxima=True, carregar_macro=macros.get)
+    linha = executar(plano)
+
+    etapas = {etapa["etapa"]: etapa for etapa in linha.resumo()["mais_lentas"]}
+    assert set(etapas) == {1, 2}
+    assert etapas[1]["acao"] == "call Login"
+    assert etapas[1]["execucoes"] == 12
+    assert etapas[2]["acao"] == "x"
+
+
+def test_exporta_trace_com_uma_linha_por_execucao(tmp_path):
+    plano = compilar_macro({"nome": "A", "etapas": [tecla("a")]}, repeticoes=3, velocidade_maxima=True)
+    linhas = [executar(plano), executar(plano), LinhaTempo("never started")]
+    caminho = tmp_path / "trace.json"
+    exportar_trace(linhas, caminho)
+
+    dados = json.loads(caminho.read_text(encoding="utf-8"))
+    passos = [e for e in dados["traceEvents"] if e.get("cat") == "step"]
+    assert len(passos) == 6
+    assert {e["tid"] for e in passos} == {1, 2}
+    assert all(e["ts"] >= 0 for e in passos)
+    assert len(dados["otherData"]["resumos"]) == 2
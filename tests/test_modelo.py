@@ -0,0 +1,97 @@
+"""Modelo observável das etapas em edição"""
+
+import pytest
+from conftest import bloco, fim_bloco, tecla
+
+from macromaker.modelo import ATUALIZACAO, INSERCAO, MOVIMENTO, REDEFINICAO, REMOCAO, ModeloEtapas
+
+
+def etapas(*acoes):
+    return [tecla(acao) for acao in acoes]
+
+
+def observado(modelo):
+    """Lista que recebe (tipo, indice, quantidade, destino, campos) de cada alteração"""
+    alteracoes = []
+    modelo.observar(lambda alteracao: alteracoes.append(tuple(alteracao)))
+    return alteracoes
+
+
+def test_cada_alteracao_notifica_os_observadores():
+    modelo = ModeloEtapas(etapas("a", "b"))
+    alteracoes = observado(modelo)
+    modelo.inserir(1, *etapas("x", "y"))
+    assert modelo.remover(0)["acao"] == "a"
+    modelo.mover(0, 2)
+    modelo.mover(1, 1)      # mesma posição: nada muda
+    modelo.redefinir(etapas("c"))
+
+    assert alteracoes == [(INSERCAO, 1, 2, None, ()), (REMOCAO, 0, 1, None, ()), (MOVIMENTO, 0, 1, 2, ()),
+                          (REDEFINICAO, 0, 1, None, ())]
+    assert [etapa["acao"] for etapa in modelo] == ["c"]
+
+
+def test_atualizar_so_notifica_os_campos_que_mudaram():
+    etapa = tecla("a", tempo="0.5")
+    modelo = ModeloEtapas([etapa])
+    alteracoes = observado(modelo)
+    modelo.atualizar(0, acao="a", tempo="0.5")
+    modelo.atualizar(0, acao="b", tempo="0.5", repeticoes=2)
+    modelo.atualizar(0, tempo=None)     # None remove o campo
+
+    assert alteracoes == [(ATUALIZACAO, 0, 1, None, ("acao", "repeticoes")), (ATUALIZACAO, 0, 1, None, ("tempo",))]
+    assert etapa == {"tipo": "keyboard", "acao": "b", "repeticoes": 2}
+    modelo.atualizar(0, tempo=None)     # já ausente
+    assert len(alteracoes) == 2
+
+
+def test_copias_sao_independentes():
+    modelo = ModeloEtapas(etapas("a", "b", "c"))
+    alteracoes = observado(modelo)
+    modelo.duplicar(1, 2, copias=3)
+
+    assert [etapa["acao"] for etapa in modelo.etapas] == ["a", "b", "c"] + ["b", "c"] * 3
+    assert alteracoes == [(INSERCAO, 3, 6, None, ())]
+    modelo.atualizar(3, acao="z")
+    assert [etapa["acao"] for etapa in modelo.etapas] == ["a", "b", "c", "z", "c", "b", "c", "b", "c"]
+
+
+def aninhados():
+    """a, bloco(2) { b, bloco(3) { c } }, d: etapas 0 a 7"""
+    return ModeloEtapas([tecla("a"), bloco(2), tecla("b"), bloco(3), tecla("c"), fim_bloco(), fim_bloco(),
+                         tecla("d")])
+
+
+def test_profundidade():
+    modelo = aninhados()
+    assert [modelo.profundidade(i) for i in range(len(modelo))] == [0, 0, 1, 1, 2, 1, 0, 0]
+
+    # Mudar o tipo de uma etapa refaz o cálculo; mudar outro campo não
+    modelo.atualizar(3, repeticoes=5)
+    assert modelo.profundidade(4) == 2
+    modelo.atualizar(3, tipo="keyboard")
+    modelo.remover(5)
+    assert [modelo.profundidade(i) for i in range(len(modelo))] == [0, 0, 1, 1, 1, 0, 0]
+
+
+@pytest.mark.parametrize("indice, par", [(1, 6), (6, 1), (3, 5), (5, 3), (0, None), (4, None)])
+def test_par_bloco(indice, par):
+    assert aninhados().par_bloco(indice) == par
+
+
+def test_par_bloco_sem_fechamento():
+    modelo = ModeloEtapas([bloco(2), tecla("a"), fim_bloco(), fim_bloco()])
+    assert modelo.par_bloco(3) is None
+    modelo.remover(3)
+    modelo.remover(2)
+    assert modelo.par_bloco(0) is None
+
+
+@pytest.mark.parametrize("inicio, fim, equilibrado", [
+    (0, 7, True), (1, 6, True), (3, 5, True), (2, 2, True),
+    (1, 5, False),      # abre dois blocos e fecha um
+    (4, 6, False),      # fecha antes de abrir
+    (5, 7, False),
+])
+def test_intervalo_equilibrado(inicio, fim, equilibrado):
+    assert aninhados().intervalo_equilibrado(inicio, fim) is equilibrado
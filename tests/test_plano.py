@@ -0,0 +1,226 @@
+"""Compilação de macros em planos: etapas, blocos, chamadas e erros de validação"""
+
+import pytest
+from conftest import bloco, fim_bloco, tecla
+
+from macromaker.armazenamento import carregar_macros, salvar_macros
+from macromaker.entrada import BackendMemoria
+from macromaker.execucao import Executor
+from macromaker.plano import (AcaoMouse, Bloco, PlanoExecucao, TipoOperacao, compilar_macro, encontrar_ciclo,
+                              operacoes_distintas, percorrer_operacoes)
+from macromaker.registro import NIVEL_ERRO
+
+
+def macro(*etapas, **extras):
+    return {"nome": "M", "etapas": list(etapas), **extras}
+
+
+def test_plano_e_imutavel_e_resolve_as_etapas():
+    plano = compilar_macro(macro(
+        tecla("Ctrl + C"),
+        {"tipo": "mouse", "acao": "duplo_clique_direito", "x": "10", "y": 20, "repeticoes": 1},
+    ), repeticoes=3, tempo_fixo=0.25)
+
+    assert isinstance(plano, PlanoExecucao)
+    assert plano.nome == "M" and plano.repeticoes == 3
+    teclado, mouse = plano.operacoes
+    assert teclado.tipo is TipoOperacao.TECLADO
+    assert teclado.teclas == ("ctrl", "c")
+    assert teclado.espera == 0.25 and teclado.mensagem == "Step 1: Ctrl + C"
+    # Nome antigo da ação ainda aceito
+    assert mouse.acao_mouse is AcaoMouse.DUPLO_CLIQUE_DIREITO
+    assert (mouse.botao, mouse.cliques, mouse.x, mouse.y) == ("right", 2, 10, 20)
+    with pytest.raises(AttributeError):
+        plano.repeticoes = 1
+
+
+def test_repeticoes_da_etapa_usam_a_pausa_curta_e_uma_mensagem():
+    plano = compilar_macro(macro(tecla("a", repeticoes=3)), tempo_fixo=0.5)
+
+    assert [op.espera for op in plano.operacoes] == [0.1, 0.1, 0.5]
+    assert [op.mensagem for op in plano.operacoes] == ["Step 1: a", None, None]
+    assert {op.indice for op in plano.operacoes} == {0}
+
+
+def test_modos_de_tempo():
+    etapas = [tecla("a", tempo="0.7")]
+    assert compilar_macro(macro(*etapas), modo_tempo="personalized").operacoes[0].espera == 0.7
+    aleatorio = compilar_macro(macro(*etapas), modo_tempo="random", tempo_min=2, tempo_max=0.5).operacoes[0]
+    # Limites invertidos são trocados
+    assert (aleatorio.espera, aleatorio.variacao) == (0.5, 1.5)
+    rapido = compilar_macro(macro(*etapas), velocidade_maxima=True)
+    assert rapido.operacoes[0].espera == rapido.operacoes[0].duracao == rapido.pausa_repeticoes == 0
+
+
+@pytest.mark.parametrize("etapa, mensagem", [
+    (tecla(""), "Step 2: key not set"),
+    (tecla("Click to set key"), "Step 2: key not set"),
+    (tecla("ctrl + "), "Step 2: invalid key combination 'ctrl + '"),
+    (tecla("a", repeticoes="x"), "Step 2: invalid repetitions"),
+    ({"tipo": "mouse", "acao": "wave", "repeticoes": 1}, "Step 2: unknown mouse action 'wave'"),
+    ({"tipo": "mouse", "acao": "move", "x": "left", "repeticoes": 1}, "Step 2: invalid coordinates"),
+    ({"tipo": "joystick", "acao": "up"}, "Step 2: unknown step type 'joystick'"),
+])
+def test_etapa_invalida_indica_o_numero_da_etapa(etapa, mensagem):
+    with pytest.raises(ValueError) as erro:
+        compilar_macro(macro(tecla("a"), etapa))
+    assert str(erro.value) == mensagem
+
+
+def test_tempo_invalido_da_etapa():
+    with pytest.raises(ValueError, match=r"^Step 1: invalid time 'soon'$"):
+        compilar_macro(macro(tecla("a", tempo="soon")), modo_tempo="personalized")
+    with pytest.raises(ValueError, match=r"^Step 1: time cannot be negative$"):
+        compilar_macro(macro(tecla("a", tempo="-1")), modo_tempo="personalized")
+
+
+@pytest.mark.parametrize("opcoes, mensagem", [
+    ({"repeticoes": 0}, "Repetitions must be at least 1"),
+    ({"repeticoes": "many"}, "Invalid repetitions or time settings"),
+    ({"tempo_fixo": "x"}, "Invalid repetitions or time settings"),
+    ({"escala_tempo": -1}, "Time scale cannot be negative"),
+])
+def test_parametros_invalidos_da_execucao(opcoes, mensagem):
+    with pytest.raises(ValueError) as erro:
+        compilar_macro(macro(tecla("a")), **opcoes)
+    assert str(erro.value) == mensagem
+
+
+FIM = fim_bloco()
+
+
+def teclas_executadas(plano):
+    return [op.teclas[0] for op in percorrer_operacoes(plano.operacoes)]
+
+
+def test_blocos_aninhados_repetem_sem_copiar_as_etapas():
+    plano = compilar_macro(macro(
+        tecla("a"), bloco(3), tecla("b"), bloco(2), tecla("c"), FIM, FIM, tecla("d"),
+    ), velocidade_maxima=True)
+
+    assert plano.blocos is True
+    assert teclas_executadas(plano) == ["a"] + ["b", "c", "c"] * 3 + ["d"]
+    # Cada etapa aparece uma única vez no plano
+    assert [op.teclas[0] for op in operacoes_distintas(plano.operacoes)] == ["a", "b", "c", "d"]
+    externo = plano.operacoes[1]
+    assert isinstance(externo, Bloco) and externo.repeticoes == 3
+    interno = externo.operacoes[1]
+    assert isinstance(interno, Bloco) and interno.repeticoes == 2 and len(interno.operacoes) == 1
+    # Os números das etapas continuam os da lista gravada
+    assert [op.indice for op in operacoes_distintas(plano.operacoes)] == [0, 2, 4, 7]
+
+
+def test_plano_sem_blocos_e_bloco_vazio():
+    assert compilar_macro(macro(tecla("a"))).blocos is False
+    plano = compilar_macro(macro(tecla("a"), bloco(5), FIM))
+    assert plano.blocos is False and teclas_executadas(plano) == ["a"]
+
+
+def test_executor_percorre_os_blocos():
+    plano = compilar_macro(macro(bloco(2), tecla("a"), bloco(2), tecla("b"), FIM, FIM), velocidade_maxima=True)
+    backend = BackendMemoria()
+    resumo = Executor(plano, backend=backend, nivel_log=NIVEL_ERRO).executar()
+
+    assert [tecla for evento, tecla in backend.eventos if evento == "pressionar"] == ["a", "b", "b"] * 2
+    assert resumo["operacoes"] == 6
+
+
+@pytest.mark.parametrize("etapas, mensagem", [
+    ([bloco(2), tecla("a")], "Step 1: block is not closed"),
+    ([bloco(2), tecla("a"), FIM, bloco(2), tecla("b")], "Step 4: block is not closed"),
+    ([tecla("a"), FIM], "Step 2: end of block without a matching block"),
+    ([bloco(0), tecla("a"), FIM], "Step 1: block repetitions must be at least 1"),
+    ([bloco("x"), tecla("a"), FIM], "Step 1: invalid block repetitions"),
+])
+def test_blocos_invalidos(etapas, mensagem):
+    with pytest.raises(ValueError) as erro:
+        compilar_macro(macro(*etapas))
+    assert str(erro.value) == mensagem
+
+
+def chamada(nome, repeticoes=1, **extras):
+    return {"tipo": "call", "acao": nome, "repeticoes": repeticoes, **extras}
+
+
+def test_chamada_entra_no_plano_ja_compilada():
+    biblioteca = {"Login": {"nome": "Login", "tempo_pressionar": "0.5", "etapas": [tecla("u"), tecla("p")]}}
+    plano = compilar_macro(macro(tecla("a"), chamada("Login", 3), tecla("z")),
+                           tempo_fixo=0.2, carregar_macro=biblioteca.get)
+
+    assert plano.chamados == ("Login",)
+    assert teclas_executadas(plano) == ["a"] + ["u", "p"] * 3 + ["z"]
+    chamadas = [op for op in operacoes_distintas(plano.operacoes) if op.chamada]
+    # Atribuídas à etapa "call" de quem chama, com as pausas herdadas
+    assert [(op.indice, op.chamada) for op in chamadas] == [(1, "Login"), (1, "Login")]
+    assert chamadas[0].mensagem == "Step 2: Login › Step 1: u"
+    assert {(op.duracao, op.espera) for op in chamadas} == {(0.1, 0.2)}
+
+
+def test_chamada_sem_herdar_usa_os_tempos_do_macro_chamado():
+    biblioteca = {"Login": {"nome": "Login", "tempo_pressionar": "0.5", "tempo_fixo": 1.5,
+                            "etapas": [tecla("u")]}}
+    plano = compilar_macro(macro(chamada("Login", herdar_tempos=False)), tempo_fixo=0.2, escala_tempo=0.5,
+                           carregar_macro=biblioteca.get)
+    op, = operacoes_distintas(plano.operacoes)
+    # A escala da execução vale também para o macro chamado
+    assert (op.duracao, op.espera) == (0.25, 0.75)
+
+
+def test_macro_chamado_de_varios_lugares_e_lido_uma_vez():
+    lidos = []
+    biblioteca = {"Comum": {"nome": "Comum", "etapas": [tecla("c")]},
+                  "B": {"nome": "B", "etapas": [chamada("Comum"), tecla("b")]}}
+
+    def carregar(nome):
+        lidos.append(nome)
+        return biblioteca.get(nome)
+
+    plano = compilar_macro(macro(chamada("Comum"), chamada("B"), chamada("Comum", 2)), carregar_macro=carregar)
+    assert teclas_executadas(plano) == ["c", "c", "b", "c", "c"]
+    assert sorted(lidos) == ["B", "Comum"]
+    assert plano.chamados == ("B", "Comum")
+
+
+@pytest.mark.parametrize("biblioteca, mensagem", [
+    ({}, "Step 1: macro 'Login' not found"),
+    ({"Login": {"nome": "Login", "etapas": [tecla("")]}}, "Step 1: in 'Login': Step 1: key not set"),
+    ({"Login": {"nome": "Login", "etapas": [chamada("Senha")]},
+      "Senha": {"nome": "Senha", "etapas": [chamada("Login")]}},
+     "Step 1: in 'Login': Step 1: in 'Senha': Step 1: call cycle Login → Senha → Login"),
+    ({"Login": {"nome": "Login", "etapas": [chamada("M")]}},
+     "Step 1: in 'Login': Step 1: call cycle M → Login → M"),
+])
+def test_chamadas_invalidas(biblioteca, mensagem):
+    with pytest.raises(ValueError) as erro:
+        compilar_macro(macro(chamada("Login")), carregar_macro=biblioteca.get)
+    assert str(erro.value) == mensagem
+
+
+def test_chamada_sem_macro_e_sem_biblioteca():
+    with pytest.raises(ValueError, match="^Step 1: macro to call not set$"):
+        compilar_macro(macro(chamada("")))
+    with pytest.raises(ValueError, match="^Step 1: macro 'Login' not found$"):
+        compilar_macro(macro(chamada("Login")))
+
+
+def test_encontrar_ciclo():
+    biblioteca = {"B": {"nome": "B", "etapas": [chamada("C"), chamada("D")]},
+                  "C": {"nome": "C", "etapas": [tecla("c")]},
+                  "D": {"nome": "D", "etapas": [chamada("B")]}}
+    assert encontrar_ciclo({"nome": "A", "etapas": [chamada("B")]}, biblioteca.get) == ["B", "D", "B"]
+    assert encontrar_ciclo({"nome": "A", "etapas": [chamada("C"), chamada("Nada")]}, biblioteca.get) is None
+    # O próprio macro, ainda não salvo, entra no ciclo
+    biblioteca["C"]["etapas"].append(chamada("A"))
+    assert encontrar_ciclo({"nome": "A", "etapas": [chamada("C")]}, biblioteca.get) == ["A", "C", "A"]
+
+
+def test_biblioteca_sqlite_carrega_so_os_macros_necessarios(tmp_path):
+    caminho = tmp_path / "macros.db"
+    salvar_macros({"Main": {"nome": "Main", "etapas": [chamada("Login")]},
+                   "Login": {"nome": "Login", "etapas": [chamada("Senha")]},
+                   "Senha": {"nome": "Senha", "etapas": [tecla("s")]},
+                   "Outro": {"nome": "Outro", "etapas": [tecla("o")]}}, caminho)
+    macros = carregar_macros(caminho, nomes=["Main"])
+
+    assert set(macros) == {"Main", "Login", "Senha"}
+    assert teclas_executadas(compilar_macro(macros["Main"], carregar_macro=macros.get)) == ["s"]
@@ -0,0 +1,56 @@
+"""Log de execução: limite de linhas, coleta em lotes, arquivo com rotação e nível automático"""
+
+from conftest import plano
+
+from macromaker.registro import NIVEL_ETAPA, NIVEL_RESUMO, RegistroExecucao, resolver_nivel_log
+
+
+def test_limite_descarta_as_linhas_mais_antigas():
+    registro = RegistroExecucao(limite=3)
+    for i in range(5):
+        registro.registrar(f"linha {i}")
+
+    assert registro.coletar() == ["linha 2", "linha 3", "linha 4"]
+
+
+def test_coletar_esvazia_as_pendentes():
+    registro = RegistroExecucao()
+    registro.registrar("a")
+    registro.registrar("b")
+    assert registro.coletar() == ["a", "b"]
+    assert registro.coletar() == []
+    registro.registrar("c")
+    assert registro.coletar() == ["c"]
+
+
+def test_fechar_grava_todas_as_mensagens_no_arquivo(tmp_path):
+    caminho = tmp_path / "execucao.log"
+    registro = RegistroExecucao(limite=2, arquivo=str(caminho))
+    for i in range(100):
+        registro.registrar(f"linha {i}")
+    registro.fechar()
+    registro.fechar()   # segunda chamada não faz nada
+
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    # O arquivo recebe até as linhas que a tela descartou
+    assert [linha.split(" ", 2)[2] for linha in linhas] == [f"linha {i}" for i in range(100)]
+    assert registro.coletar() == ["linha 98", "linha 99"]
+
+
+def test_arquivo_e_rotacionado(tmp_path, monkeypatch):
+    monkeypatch.setattr("macromaker.registro.TAMANHO_ARQUIVO_LOG", 200)
+    caminho = tmp_path / "execucao.log"
+    registro = RegistroExecucao(arquivo=str(caminho))
+    for i in range(50):
+        registro.registrar(f"linha {i:02}")
+    registro.fechar()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "execucao.log", "execucao.log.1", "execucao.log.2", "execucao.log.3"]
+    assert caminho.read_text(encoding="utf-8").splitlines()[-1].endswith("linha 49")
+
+
+def test_nivel_automatico_depende_do_intervalo_das_etapas():
+    assert resolver_nivel_log("auto", plano("A", "a", "b", tempo_fixo=1)) == NIVEL_ETAPA
+    assert resolver_nivel_log("auto", plano("A", "a", "b", velocidade_maxima=True)) == NIVEL_RESUMO
+    assert resolver_nivel_log("summary", plano("A", "a", tempo_fixo=1)) == NIVEL_RESUMO